@@ -1,13 +1,24 @@
 import reflex as rx
+from app import assets, broker, export, instrumentation
 from app.pages.index import index_page
 from app.pages.history import history_page
 from app.pages.goals import goals_page
 from app.pages.manage import manage_page
 from app.pages.login import login_page
+from app.states.sync import deliver_change
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
-    stylesheets=["/tailwind_colors.css"],
+    stylesheets=[
+        "/tailwind_colors.css",
+        "/low_power.css",
+    ],
+    head_components=[
+        rx.el.link(
+            rel="manifest", href="/manifest.webmanifest"
+        ),
+        rx.el.meta(name="theme-color", content="#2c3e50"),
+    ],
 )
 app.add_page(
     index_page, route="/", title="KindCoins Dashboard"
@@ -25,4 +36,9 @@ app.add_page(
 )
 app.add_page(
     login_page, route="/login", title="Login - KindCoins"
-)
\ No newline at end of file
+)
+assets.install(app)
+export.install(app)
+broker.install(app, deliver_change)
+if instrumentation.enabled():
+    instrumentation.install(app)
\ No newline at end of file
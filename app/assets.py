@@ -0,0 +1,220 @@
+"""Content-hashed, precompressed avatar and Lottie files.
+
+`python -m app.assets` minifies the SVG and Lottie JSON files under
+assets/avatars and assets/lottie into BUILD_DIR, naming each after a hash
+of its content and writing smaller .gz (and, with `brotli` installed,
+.br) copies beside it. MANIFEST maps every public path to its hashed one. The backend
+serves the build with immutable cache headers, and `resolve` turns a
+public path into its built URL, or leaves it as is when nothing was built.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+import reflex as rx
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = REPO_ROOT / "assets"
+BUILD_DIR = REPO_ROOT / "build" / "assets"
+MANIFEST = "manifest.json"
+SOURCES = ("avatars", "lottie")
+ENDPOINT = "/_assets"
+IMMUTABLE = "public, max-age=31536000, immutable"
+_HASH_LENGTH = 10
+_MEDIA_TYPES = {
+    ".svg": "image/svg+xml",
+    ".json": "application/json",
+}
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+_manifest: Dict[str, str] | None = None
+
+_SVG_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def minify_svg(text: str) -> str:
+    text = _SVG_COMMENT.sub("", text)
+    text = _BETWEEN_TAGS.sub("><", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def minify_lottie(text: str) -> str:
+    return json.dumps(
+        json.loads(text),
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+MINIFIERS: Dict[str, Callable[[str], str]] = {
+    ".svg": minify_svg,
+    ".json": minify_lottie,
+}
+
+
+def hashed_name(path: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()
+    return (
+        f"{path.stem}.{digest[:_HASH_LENGTH]}{path.suffix}"
+    )
+
+
+def _compressors() -> List[tuple]:
+    compressors = [
+        (
+            ".gz",
+            lambda data: gzip.compress(
+                data, compresslevel=9, mtime=0
+            ),
+        )
+    ]
+    try:
+        import brotli
+    except ImportError:
+        print(
+            "brotli is not installed; writing gzip copies only",
+            file=sys.stderr,
+        )
+    else:
+        compressors.append(
+            (
+                ".br",
+                lambda data: brotli.compress(
+                    data, quality=11
+                ),
+            )
+        )
+    return compressors
+
+
+def build(
+    source: Path = SOURCE_DIR, out: Path = BUILD_DIR
+) -> Dict[str, str]:
+    """Rebuild `out` from `source` and return the manifest it wrote."""
+    shutil.rmtree(out, ignore_errors=True)
+    compressors = _compressors()
+    manifest: Dict[str, str] = {}
+    for folder in SOURCES:
+        for path in sorted((source / folder).rglob("*")):
+            minify = MINIFIERS.get(path.suffix)
+            if minify is None or not path.is_file():
+                continue
+            content = minify(
+                path.read_text(encoding="utf-8")
+            ).encode("utf-8")
+            relative = path.relative_to(source)
+            target = (
+                out
+                / relative.parent
+                / hashed_name(path, content)
+            )
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            for suffix, compress in compressors:
+                compressed = compress(content)
+                # Tiny files can grow; those are served as is.
+                if len(compressed) < len(content):
+                    target.with_name(
+                        target.name + suffix
+                    ).write_bytes(compressed)
+            manifest[f"/{relative.as_posix()}"] = (
+                f"/{target.relative_to(out).as_posix()}"
+            )
+    out.mkdir(parents=True, exist_ok=True)
+    (out / MANIFEST).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+    return manifest
+
+
+def _load_manifest() -> Dict[str, str]:
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(
+                (BUILD_DIR / MANIFEST).read_text(
+                    encoding="utf-8"
+                )
+            )
+        except FileNotFoundError:
+            _manifest = {}
+    return _manifest
+
+
+def resolve(path: str) -> str:
+    """URL to load a public asset path from, hashed when it was built."""
+    built = _load_manifest().get(path)
+    if built is None:
+        return path
+    return (
+        f"{rx.config.get_config().api_url}{ENDPOINT}{built}"
+    )
+
+
+async def _asset_endpoint(request: Request, path: str):
+    root = BUILD_DIR.resolve()
+    file = (root / path).resolve()
+    if (
+        root not in file.parents
+        or file.suffix not in _MEDIA_TYPES
+        or file.name == MANIFEST
+        or not file.is_file()
+    ):
+        return Response(status_code=404)
+    accepted = {
+        token.split(";")[0].strip()
+        for token in request.headers.get(
+            "accept-encoding", ""
+        ).split(",")
+    }
+    headers = {
+        "Cache-Control": IMMUTABLE,
+        "Vary": "Accept-Encoding",
+    }
+    for encoding, suffix in _ENCODINGS:
+        compressed = file.with_name(file.name + suffix)
+        if encoding in accepted and compressed.is_file():
+            headers["Content-Encoding"] = encoding
+            file = compressed
+            break
+    return FileResponse(
+        file,
+        media_type=_MEDIA_TYPES[Path(path).suffix],
+        headers=headers,
+    )
+
+
+def install(app: rx.App):
+    app.api.add_api_route(
+        ENDPOINT + "/{path:path}",
+        _asset_endpoint,
+        methods=["GET"],
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--source", type=Path, default=SOURCE_DIR
+    )
+    parser.add_argument(
+        "--out", type=Path, default=BUILD_DIR
+    )
+    args = parser.parse_args(argv)
+    manifest = build(args.source, args.out)
+    print(f"built {len(manifest)} assets into {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
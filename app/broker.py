@@ -0,0 +1,159 @@
+"""Fan-out of family changes to every connected session.
+
+Handlers publish a FamilyChange with just the records they stored. Every
+backend process listens on the broker and hands each change to the other
+sessions of that family it serves, which then get a push with those
+records only.
+
+LocalBroker keeps everything in the process: enough for one worker and
+for tests. With a redis_url in rxconfig, RedisBroker uses pub/sub so
+sessions on different workers see each other's changes.
+"""
+
+import asyncio
+import json
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Set,
+)
+import reflex as rx
+from reflex.utils import console
+from app.states.types import FamilyChange
+
+# The store holds a single family until accounts exist.
+DEFAULT_FAMILY_ID = "default"
+CHANNEL = "kindcoins:family-changes"
+Deliver = Callable[
+    [rx.App, str, FamilyChange], Awaitable[None]
+]
+
+
+class LocalBroker:
+    """In-process broker; every listener gets every change."""
+
+    def __init__(self):
+        self._listeners: List[asyncio.Queue] = []
+
+    async def publish(self, change: FamilyChange):
+        for queue in self._listeners:
+            queue.put_nowait(change)
+
+    async def listen(self) -> AsyncIterator[FamilyChange]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.remove(queue)
+
+
+class RedisBroker:
+    """Redis pub/sub broker shared by every backend worker."""
+
+    def __init__(self, url: str):
+        import redis.asyncio
+
+        self._redis = redis.asyncio.from_url(url)
+
+    async def publish(self, change: FamilyChange):
+        await self._redis.publish(
+            CHANNEL, json.dumps(change)
+        )
+
+    async def listen(self) -> AsyncIterator[FamilyChange]:
+        async with self._redis.pubsub() as pubsub:
+            await pubsub.subscribe(CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+
+
+_broker: LocalBroker | RedisBroker | None = None
+# Client tokens of the sessions this process serves, per family.
+_sessions: Dict[str, Set[str]] = {}
+
+
+def get_broker() -> LocalBroker | RedisBroker:
+    global _broker
+    if _broker is None:
+        redis_url = rx.config.get_config().redis_url
+        _broker = (
+            RedisBroker(redis_url)
+            if redis_url
+            else LocalBroker()
+        )
+    return _broker
+
+
+def use_broker(broker: LocalBroker | RedisBroker):
+    """Swap the broker, e.g. for a local stand-in in tests."""
+    global _broker
+    _broker = broker
+
+
+def join(family_id: str, client_token: str):
+    _sessions.setdefault(family_id, set()).add(client_token)
+
+
+async def publish(change: FamilyChange):
+    await get_broker().publish(change)
+
+
+async def _deliver_to(
+    app: rx.App,
+    deliver: Deliver,
+    client_token: str,
+    change: FamilyChange,
+):
+    try:
+        await deliver(app, client_token, change)
+    except Exception as error:
+        console.error(
+            f"Could not deliver a family change to {client_token}: {error!r}"
+        )
+
+
+async def _fan_out(
+    app: rx.App, deliver: Deliver, change: FamilyChange
+):
+    """Deliver to every other session at once, so one slow or failing
+    session does not hold up the rest."""
+    sessions = _sessions.get(change["family_id"], set())
+    connected = app.event_namespace.token_to_sid
+    recipients = []
+    for client_token in list(sessions):
+        if client_token == change["origin"]:
+            continue
+        if client_token not in connected:
+            sessions.discard(client_token)
+            continue
+        recipients.append(client_token)
+    await asyncio.gather(
+        *(
+            _deliver_to(app, deliver, client_token, change)
+            for client_token in recipients
+        ),
+        return_exceptions=True,
+    )
+
+
+async def _relay(reflex_app: rx.App, deliver: Deliver):
+    async for change in get_broker().listen():
+        try:
+            await _fan_out(reflex_app, deliver, change)
+        except Exception as error:
+            console.error(
+                f"Could not fan out a family change: {error!r}"
+            )
+
+
+def install(app: rx.App, deliver: Deliver):
+    """Relay published changes to this process's sessions via `deliver`."""
+    app.register_lifespan_task(
+        _relay, reflex_app=app, deliver=deliver
+    )
\ No newline at end of file
@@ -1,10 +1,18 @@
 import reflex as rx
 from app.states.state import (
-    AppState,
     Category,
     Activity,
     Child,
 )
+from app.states.activity_log import ActivityLogState
+from app.components.animation import (
+    activity_log_overlay_display_class,
+    activity_panel_display_class,
+    confirmation_modal_display_class,
+    custom_activity_modal_display_class,
+)
+from app.states.catalog import CatalogState
+from app.states.family import FamilyState
 from app.components.LottiePlayer import lottie_player
 from app.components.activity_logging import (
     category_card_component,
@@ -18,11 +26,13 @@ def updated_confirmation_display_component() -> (
     rx.Component
 ):
     child: Child | None = (
-        AppState.selected_child_for_details
+        FamilyState.selected_child_for_details
+    )
+    coin_burst_lottie = (
+        ActivityLogState.show_coin_burst_lottie_path
     )
-    coin_burst_lottie = AppState.show_coin_burst_lottie_path
     growth_sparkle_lottie = (
-        AppState.show_growth_sparkle_lottie_path
+        ActivityLogState.show_growth_sparkle_lottie_path
     )
     return rx.el.div(
         rx.el.h2(
@@ -44,9 +54,27 @@ def updated_confirmation_display_component() -> (
             ),
         ),
         rx.el.p(
-            AppState.activity_logged_success_message,
+            ActivityLogState.activity_logged_success_message,
             class_name="text-xl text-navy-700 my-4 text-center font-semibold",
         ),
+        rx.match(
+            ActivityLogState.streak_milestone,
+            (
+                "meteor_shower",
+                rx.el.p(
+                    "3 days in a row! Meteor shower! 🌠",
+                    class_name="text-lg text-indigo-600 text-center font-semibold animate-bounce",
+                ),
+            ),
+            (
+                "growth_burst",
+                rx.el.p(
+                    "A whole week! Bonus growth burst! 🍃🍃🍃",
+                    class_name="text-lg text-green-600 text-center font-semibold animate-bounce",
+                ),
+            ),
+            rx.fragment(),
+        ),
         rx.cond(
             child != None,
             rx.el.div(
@@ -77,14 +105,14 @@ def updated_confirmation_display_component() -> (
         rx.el.div(
             rx.el.button(
                 "Add Another Activity",
-                on_click=AppState.add_another_activity,
+                on_click=ActivityLogState.add_another_activity,
                 class_name=interactive_element_class(
                     "bg-mint-500 hover:bg-mint-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md w-full md:w-auto mb-2 md:mb-0 md:mr-2"
                 ),
             ),
             rx.el.button(
                 "Return Home",
-                on_click=AppState.return_to_origin_view,
+                on_click=ActivityLogState.return_to_origin_view,
                 class_name=interactive_element_class(
                     "bg-peach-500 hover:bg-peach-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md w-full md:w-auto"
                 ),
@@ -100,9 +128,12 @@ def activity_log_component() -> rx.Component:
     The main UI for the interactive activity logging flow, designed as an overlay.
     """
     child_selector_ui = rx.cond(
-        (AppState.children.length() > 1)
-        & (AppState.activity_log_step == "category_select")
-        & (AppState.active_child_for_world_view_id == None),
+        (FamilyState.children.length() > 1)
+        & (
+            ActivityLogState.activity_log_step
+            == "category_select"
+        )
+        & ~FamilyState.world_view_open,
         rx.el.div(
             rx.el.h3(
                 "For whom are we logging?",
@@ -110,14 +141,14 @@ def activity_log_component() -> rx.Component:
             ),
             rx.el.select(
                 rx.foreach(
-                    AppState.children_options,
-                    lambda option: rx.el.option(
-                        option["label"],
-                        value=option["value"],
+                    FamilyState.children,
+                    lambda child: rx.el.option(
+                        child["name"],
+                        value=child["id"],
                     ),
                 ),
-                default_value=AppState.current_child_id_for_details,
-                on_change=AppState.set_current_child_id_for_details,
+                default_value=FamilyState.current_child_id_for_details,
+                on_change=FamilyState.set_current_child_id_for_details,
                 class_name="block w-full max-w-xs mx-auto pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm rounded-md shadow-sm",
             ),
             class_name="mb-8 p-4 bg-sky-50 rounded-lg shadow",
@@ -132,7 +163,8 @@ def activity_log_component() -> rx.Component:
         child_selector_ui,
         rx.el.div(
             rx.foreach(
-                AppState.categories, category_card_component
+                CatalogState.categories,
+                category_card_component,
             ),
             class_name="grid grid-cols-2 md:grid-cols-3 gap-4 md:gap-6 justify-items-center px-4 pb-8",
         ),
@@ -141,89 +173,61 @@ def activity_log_component() -> rx.Component:
     activity_selection_panel_content = rx.el.div(
         rx.el.button(
             "← Back to Categories",
-            on_click=AppState.close_activity_panel,
+            on_click=ActivityLogState.close_activity_panel,
             class_name="absolute top-4 left-4 bg-gray-200 hover:bg-gray-300 text-gray-700 font-semibold py-2 px-4 rounded-lg shadow text-sm z-20 kindcoins-transition-fast animate-wobble-on-tap",
         ),
         rx.el.h3(
             rx.cond(
-                AppState.current_log_category,
-                f"{AppState.current_log_category['icon']} {AppState.current_log_category['name']} Activities",
+                ActivityLogState.current_log_category,
+                f"{ActivityLogState.current_log_category['icon']} {ActivityLogState.current_log_category['name']} Activities",
                 "Select an Activity",
             ),
             class_name="text-2xl font-bold text-navy-700 mb-6 pt-16 text-center",
         ),
+        rx.el.label(
+            rx.el.input(
+                type="checkbox",
+                checked=ActivityLogState.log_for_all_children,
+                on_change=ActivityLogState.toggle_log_for_all_children,
+                class_name="mr-2 accent-mint-500",
+            ),
+            "Log for all children",
+            class_name="flex items-center justify-center text-sm text-navy-700 font-medium",
+        ),
         rx.el.div(
             rx.foreach(
-                AppState.activities_for_log_category,
+                ActivityLogState.activities_for_log_category,
                 activity_button_component,
             ),
             rx.el.button(
                 "🎨 Create Your Own Activity",
-                on_click=AppState.start_custom_activity_creation,
+                on_click=ActivityLogState.start_custom_activity_creation,
                 class_name="w-full bg-peach-500 hover:bg-peach-600 text-white font-semibold py-3 px-4 rounded-lg shadow-md mt-4 transition-colors kindcoins-transition-fast animate-wobble-on-tap",
             ),
             class_name="overflow-y-auto p-4 md:p-6 space-y-2",
             style={"scrollbar_width": "thin"},
         ),
-        class_name=rx.cond(
-            AppState.activity_panel_animation_state
-            == "exited",
-            "hidden",
-            f"kindcoins-panel inset-y-0 right-0 w-full md:w-96 h-full overflow-y-auto {AppState.activity_panel_display_class}",
-        ),
+        class_name=f"absolute inset-y-0 right-0 z-30 w-full md:w-96 h-full overflow-y-auto bg-white shadow-2xl {activity_panel_display_class}",
     )
-    confirmation_dialog = rx.el.dialog(
+    confirmation_dialog = rx.el.div(
         updated_confirmation_display_component(),
-        class_name=f"bg-transparent p-0 border-none shadow-none {AppState.confirmation_modal_display_class}",
-        open=(
-            AppState.confirmation_modal_animation_state
-            == "entering"
-        )
-        | (
-            AppState.confirmation_modal_animation_state
-            == "entered"
-        ),
+        role="dialog",
+        class_name=f"absolute inset-0 z-40 flex items-center justify-center bg-black/30 {confirmation_modal_display_class}",
     )
-    custom_activity_dialog = rx.el.dialog(
+    custom_activity_dialog = rx.el.div(
         custom_activity_creator_component(),
-        class_name=f"bg-transparent p-0 border-none shadow-none {AppState.custom_activity_modal_display_class}",
-        open=(
-            AppState.custom_activity_modal_animation_state
-            == "entering"
-        )
-        | (
-            AppState.custom_activity_modal_animation_state
-            == "entered"
-        ),
+        role="dialog",
+        class_name=f"absolute inset-0 z-40 flex items-center justify-center bg-black/30 {custom_activity_modal_display_class}",
     )
-    return rx.cond(
-        AppState.activity_log_overlay_animation_state
-        != "exited",
-        rx.el.div(
-            rx.el.button(
-                "X",
-                on_click=AppState.close_activity_log_overlay,
-                class_name="absolute top-4 right-4 bg-red-500 hover:bg-red-600 text-white rounded-full w-8 h-8 flex items-center justify-center shadow-md z-50 kindcoins-transition-fast animate-wobble-on-tap",
-            ),
-            rx.match(
-                AppState.activity_log_step,
-                ("category_select", category_selection_ui),
-                ("activity_select", category_selection_ui),
-                ("confirmation", category_selection_ui),
-                (
-                    "custom_create_activity",
-                    category_selection_ui,
-                ),
-                rx.el.p(
-                    "Loading activity log...",
-                    class_name="text-center text-gray-500",
-                ),
-            ),
-            activity_selection_panel_content,
-            confirmation_dialog,
-            custom_activity_dialog,
-            class_name=f"kindcoins-bottom-drawer h-[90vh] {AppState.activity_log_overlay_display_class} {AppState.current_activity_log_bg_class} transition-colors duration-500 ease-in-out",
-            on_mount=AppState.start_activity_logging,
+    return rx.el.div(
+        rx.el.button(
+            "X",
+            on_click=ActivityLogState.close_activity_log_overlay,
+            class_name="absolute top-4 right-4 bg-red-500 hover:bg-red-600 text-white rounded-full w-8 h-8 flex items-center justify-center shadow-md z-50 kindcoins-transition-fast animate-wobble-on-tap",
         ),
-        rx.fragment(),
+        category_selection_ui,
+        activity_selection_panel_content,
+        confirmation_dialog,
+        custom_activity_dialog,
+        class_name=f"fixed inset-x-0 bottom-0 z-40 h-[90vh] overflow-hidden rounded-t-3xl shadow-2xl {activity_log_overlay_display_class} {ActivityLogState.current_activity_log_bg_class}",
     )
\ No newline at end of file
@@ -1,6 +1,7 @@
 import reflex as rx
-from app.states.state import Child, AppState
-from app.components.LottiePlayer import lottie_player
+from app.states.state import Child
+from app.states.family import FamilyState
+from app.components.LottiePlayer import avatar_animation
 
 
 def child_dashboard_card_component(
@@ -22,12 +23,11 @@ def child_dashboard_card_component(
     return rx.el.div(
         rx.el.div(
             rx.el.div(
-                lottie_player(
-                    path=child["avatar_lottie_src"],
+                avatar_animation(
+                    child["avatar_lottie_src"],
+                    child["avatar_image_src"],
                     width=avatar_size,
                     height=avatar_size,
-                    loop=True,
-                    autoplay=True,
                 ),
                 class_name=f"w-[{avatar_size}] h-[{avatar_size}] rounded-full flex items-center justify-center overflow-hidden bg-white",
             ),
@@ -51,7 +51,7 @@ def child_dashboard_card_component(
             child["current_streak_status"],
             class_name="text-sm text-peach-700 dark:text-peach-300 text-center font-medium",
         ),
-        on_click=lambda: AppState.open_world_view(
+        on_click=lambda: FamilyState.open_world_view(
             child["id"]
         ),
         class_name="bg-sky-50/70 dark:bg-navy-600/70 backdrop-blur-sm p-4 rounded-2xl shadow-lg w-full max-w-[200px] h-[280px] flex flex-col justify-center items-center cursor-pointer kindcoins-transition-fast transform hover:scale-105 active:scale-95 border border-sky-200 dark:border-navy-500 animate-wobble-on-tap animate-glow-on-hover",
@@ -1,88 +1,148 @@
 import reflex as rx
-import random
+import json
+from typing import Dict, List
+from app.states.state import AppState
+from app.states.settings import SettingsState
 
+# Every scene draws the same number of particles on one canvas.
+PARTICLE_BUDGET = 24
+PARTICLE_MIX: Dict[str, Dict[str, int]] = {
+    "day": {"bubble": 14, "leaf": PARTICLE_BUDGET - 14},
+    "night": {"bubble": 6, "star": PARTICLE_BUDGET - 6},
+}
 
-def floating_element(
-    element_type: str, index: int
-) -> rx.Component:
-    base_style = {
-        "position": "fixed",
-        "bottom": "-60px",
-        "animation_delay": f"{random.uniform(0, 10)}s",
-        "z_index": -10,
+_PARTICLES_CODE = """
+const KINDCOINS_PARTICLE_MIX = %(mix)s;
+
+function spawnParticle(kind, width, height, anywhere) {
+  const particle = { kind, x: Math.random() * width, phase: Math.random() * 2 * Math.PI };
+  if (kind === "star") {
+    particle.y = Math.random() * height * 0.7;
+    particle.size = 1 + Math.random() * 2;
+    particle.twinkle = (2 * Math.PI) / (3 + Math.random() * 3);
+    return particle;
+  }
+  const bubble = kind === "bubble";
+  particle.width = bubble ? 15 + Math.random() * 25 : 15 + Math.random() * 10;
+  particle.height = bubble ? particle.width : 20 + Math.random() * 15;
+  particle.y = anywhere ? Math.random() * height : height + particle.height;
+  particle.rise = height / (bubble ? 8 + Math.random() * 7 : 10 + Math.random() * 8);
+  particle.sway = bubble ? 20 : 20 + Math.random() * 40;
+  particle.spin = ((Math.random() * 2 - 1) * 25 * Math.PI) / 180;
+  return particle;
+}
+
+function drawParticle(context, particle) {
+  if (particle.kind === "star") {
+    context.globalAlpha = 0.4 + 0.6 * Math.abs(Math.sin(particle.phase));
+    context.fillStyle = "rgba(251, 191, 36, 0.8)";
+    context.beginPath();
+    context.arc(particle.x, particle.y, particle.size, 0, 2 * Math.PI);
+    context.fill();
+    return;
+  }
+  const x = particle.x + Math.sin(particle.phase) * particle.sway;
+  context.globalAlpha = 1;
+  context.beginPath();
+  if (particle.kind === "bubble") {
+    context.fillStyle = "rgba(224, 242, 254, 0.4)";
+    context.arc(x, particle.y, particle.width / 2, 0, 2 * Math.PI);
+  } else {
+    context.fillStyle = "rgba(134, 239, 172, 0.5)";
+    context.ellipse(
+      x,
+      particle.y,
+      particle.width / 2,
+      particle.height * 0.4,
+      Math.sin(particle.phase) * particle.spin,
+      0,
+      2 * Math.PI,
+    );
+  }
+  context.fill();
+}
+
+function KindCoinsParticles({ timeOfDay = "day", running = true, ...rest }) {
+  const canvas = useRef(null);
+
+  useEffect(() => {
+    const element = canvas.current;
+    if (!element || !running) return;
+    const context = element.getContext("2d");
+    let width = 0;
+    let height = 0;
+    const resize = () => {
+      const ratio = Math.min(window.devicePixelRatio || 1, 2);
+      width = element.clientWidth;
+      height = element.clientHeight;
+      element.width = width * ratio;
+      element.height = height * ratio;
+      context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    };
+    resize();
+    const particles = [];
+    const mix = KINDCOINS_PARTICLE_MIX[timeOfDay] ?? KINDCOINS_PARTICLE_MIX.day;
+    for (const [kind, count] of Object.entries(mix)) {
+      for (let i = 0; i < count; i++) {
+        particles.push(spawnParticle(kind, width, height, true));
+      }
     }
-    if element_type == "bubble":
-        size = random.randint(15, 40)
-        left_pos = random.randint(0, 95)
-        duration = random.randint(8, 15)
-        return rx.el.div(
-            style={
-                **base_style,
-                "width": f"{size}px",
-                "height": f"{size}px",
-                "left": f"{left_pos}%",
-                "animation_duration": f"{duration}s",
-                "background_color": "rgba(224, 242, 254, 0.4)",
-                "border_radius": "50%",
-                "pointer_events": "none",
-            }
-        )
-    elif element_type == "leaf":
-        size_w = random.randint(15, 25)
-        size_h = random.randint(20, 35)
-        left_pos = random.randint(0, 95)
-        duration = random.randint(10, 18)
-        sway_x = random.randint(-60, 60)
-        sway_rotate = random.randint(-25, 25)
-        return rx.el.div(
-            style={
-                **base_style,
-                "width": f"{size_w}px",
-                "height": f"{size_h}px",
-                "left": f"{left_pos}%",
-                "animation_duration": f"{duration}s",
-                "--sway-x": f"{sway_x}px",
-                "--sway-rotate": f"{sway_rotate}deg",
-                "background_color": "rgba(134, 239, 172, 0.5)",
-                "clip_path": "ellipse(50% 40% at 50% 50%)",
-            }
-        )
-    elif element_type == "star":
-        top_pos = random.randint(5, 70)
-        left_pos = random.randint(5, 95)
-        duration = random.randint(3, 6)
-        size = random.randint(1, 3)
-        return rx.el.div(
-            style={
-                "position": "fixed",
-                "top": f"{top_pos}%",
-                "left": f"{left_pos}%",
-                "width": f"{size}px",
-                "height": f"{size}px",
-                "animation_duration": f"{duration}s",
-                "animation_delay": f"{random.uniform(0, 4)}s",
-                "z_index": -10,
-                "background_color": "rgba(251, 191, 36, 0.8)",
-                "border_radius": "50%",
-            }
-        )
-    return rx.fragment()
+    let last = performance.now();
+    let frame = requestAnimationFrame(function draw(now) {
+      // Long gaps (a hidden tab) resume smoothly instead of jumping.
+      const seconds = Math.min((now - last) / 1000, 0.1);
+      last = now;
+      context.clearRect(0, 0, width, height);
+      for (let i = 0; i < particles.length; i++) {
+        const particle = particles[i];
+        if (particle.kind === "star") {
+          particle.phase += seconds * particle.twinkle;
+        } else {
+          particle.phase += seconds;
+          particle.y -= particle.rise * seconds;
+          if (particle.y < -particle.height) {
+            particles[i] = spawnParticle(particle.kind, width, height, false);
+          }
+        }
+        drawParticle(context, particles[i]);
+      }
+      frame = requestAnimationFrame(draw);
+    });
+    window.addEventListener("resize", resize);
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener("resize", resize);
+      context.clearRect(0, 0, width, height);
+    };
+  }, [timeOfDay, running]);
+
+  return <canvas ref={canvas} aria-hidden="true" {...rest} />;
+}
+""" % {"mix": json.dumps(PARTICLE_MIX)}
+
+
+class ParticleLayer(rx.Component):
+    """Background bubbles, leaves and stars drawn on a single canvas."""
+
+    tag = "KindCoinsParticles"
+
+    time_of_day: rx.Var[str]
+    running: rx.Var[bool]
+
+    def add_imports(self):
+        return {"react": ["useEffect", "useRef"]}
+
+    def add_custom_code(self) -> List[str]:
+        return [_PARTICLES_CODE]
 
 
 def floating_animations_component() -> rx.Component:
     """
-    Creates a variety of floating elements for the background.
-    Animations that were previously in animations.css are now removed.
-    The elements will appear but will be static or rely on future inline animation styles if added.
+    The background particle layer. Particles are placed in the browser at
+    runtime, change with the time of day and stop in low-power mode.
     """
-    num_bubbles = 7
-    num_leaves = 5
-    num_stars = 15
-    elements = []
-    for i in range(num_bubbles):
-        elements.append(floating_element("bubble", i))
-    for i in range(num_leaves):
-        elements.append(floating_element("leaf", i))
-    for i in range(num_stars):
-        elements.append(floating_element("star", i))
-    return rx.fragment(*elements)
\ No newline at end of file
+    return ParticleLayer.create(
+        time_of_day=AppState.time_of_day,
+        running=~SettingsState.low_power,
+        class_name="fixed inset-0 w-full h-full pointer-events-none -z-10",
+    )
\ No newline at end of file
@@ -1,8 +1,144 @@
 import reflex as rx
+from typing import List
+from app.states.settings import SettingsState
+
+# Module-level JS shared by every player on a page. Parsed animations are
+# kept on `window` so they also survive client-side page changes.
+_PLAYER_CODE = """
+const kindcoinsLottieCache =
+  typeof window === "undefined"
+    ? new Map()
+    : (window.__kindcoinsLottieCache ??= new Map());
+
+function loadLottieData(path) {
+  if (!kindcoinsLottieCache.has(path)) {
+    kindcoinsLottieCache.set(
+      path,
+      fetch(path)
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error(`${response.status} loading ${path}`);
+          }
+          return response.json();
+        })
+        .catch((error) => {
+          kindcoinsLottieCache.delete(path);
+          throw error;
+        }),
+    );
+  }
+  return kindcoinsLottieCache.get(path);
+}
+
+const kindcoinsLottieWatchers = new Map();
+let kindcoinsLottieObserver = null;
+
+function watchLottieVisibility(element, onChange) {
+  if (typeof IntersectionObserver === "undefined") {
+    onChange(true);
+    return () => {};
+  }
+  kindcoinsLottieObserver ??= new IntersectionObserver(
+    (entries) => {
+      for (const entry of entries) {
+        kindcoinsLottieWatchers.get(entry.target)?.(entry.isIntersecting);
+      }
+    },
+    { rootMargin: "100px" },
+  );
+  kindcoinsLottieWatchers.set(element, onChange);
+  kindcoinsLottieObserver.observe(element);
+  return () => {
+    kindcoinsLottieWatchers.delete(element);
+    kindcoinsLottieObserver.unobserve(element);
+  };
+}
+
+function KindCoinsLottie({
+  path,
+  speed = 1,
+  loop = true,
+  autoplay = true,
+  renderer = "svg",
+  ...rest
+}) {
+  const container = useRef(null);
+  const [visible, setVisible] = useState(false);
+  const [seen, setSeen] = useState(false);
+  const [player, setPlayer] = useState(null);
+
+  useEffect(
+    () =>
+      watchLottieVisibility(container.current, (isVisible) => {
+        setVisible(isVisible);
+        if (isVisible) setSeen(true);
+      }),
+    [],
+  );
+
+  useEffect(() => {
+    if (!path || !seen) return;
+    let cancelled = false;
+    let instance = null;
+    Promise.all([import("lottie-web"), loadLottieData(path)])
+      .then(([lottie, animationData]) => {
+        if (cancelled || !container.current) return;
+        instance = lottie.default.loadAnimation({
+          container: container.current,
+          renderer,
+          loop,
+          autoplay: false,
+          animationData,
+        });
+        setPlayer(instance);
+      })
+      .catch((error) => console.warn("Lottie:", error));
+    return () => {
+      cancelled = true;
+      instance?.destroy();
+      setPlayer(null);
+    };
+  }, [path, seen, renderer, loop]);
+
+  useEffect(() => player?.setSpeed(speed), [player, speed]);
+
+  useEffect(() => {
+    if (!player) return;
+    if (visible && autoplay) {
+      player.play();
+    } else {
+      player.pause();
+    }
+  }, [player, visible, autoplay]);
+
+  return <div ref={container} {...rest} />;
+}
+"""
+
+
+class LottiePlayer(rx.Component):
+    """A lottie-web player that loads when visible and pauses offscreen."""
+
+    tag = "KindCoinsLottie"
+    lib_dependencies: List[str] = ["lottie-web@5.12.2"]
+
+    path: rx.Var[str | None]
+    speed: rx.Var[float]
+    loop: rx.Var[bool]
+    autoplay: rx.Var[bool]
+    renderer: rx.Var[str]
+
+    def add_imports(self):
+        return {
+            "react": ["useEffect", "useRef", "useState"]
+        }
+
+    def add_custom_code(self) -> List[str]:
+        return [_PLAYER_CODE]
 
 
 def lottie_player(
-    path: str,
+    path: str | None,
     speed: float = 1,
     loop: bool = True,
     autoplay: bool = True,
@@ -12,19 +148,42 @@ def lottie_player(
     class_name: str = "",
 ) -> rx.Component:
     """
-    A placeholder component for Lottie animations.
-    Displays the path of the Lottie file.
+    A Lottie animation from a JSON file under assets/.
+    The file is fetched once per path and shared by every player showing it.
     """
-    return rx.el.div(
-        rx.el.p(f"Lottie Animation: {path}"),
-        style={
-            "width": width,
-            "height": height,
-            "border": "1px dashed #ccc",
-            "display": "flex",
-            "align_items": "center",
-            "justify_content": "center",
-            "text_align": "center",
-        },
+    return LottiePlayer.create(
+        path=path,
+        speed=speed,
+        loop=loop,
+        autoplay=autoplay,
+        renderer=renderer,
+        style={"width": width, "height": height},
         class_name=class_name,
+    )
+
+
+def avatar_animation(
+    lottie_src: str,
+    image_src: str,
+    width: str,
+    height: str,
+    class_name: str = "",
+) -> rx.Component:
+    """A looping avatar, or its static stage SVG in low-power mode."""
+    return rx.cond(
+        SettingsState.low_power,
+        rx.el.img(
+            src=image_src,
+            alt="",
+            style={"width": width, "height": height},
+            class_name=class_name,
+        ),
+        lottie_player(
+            path=lottie_src,
+            width=width,
+            height=height,
+            loop=True,
+            autoplay=True,
+            class_name=class_name,
+        ),
     )
\ No newline at end of file
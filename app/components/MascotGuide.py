@@ -1,5 +1,7 @@
 import reflex as rx
+from app import assets
 from app.states.state import AppState
+from app.states.settings import SettingsState
 from app.components.LottiePlayer import lottie_player
 
 
@@ -9,9 +11,10 @@ def mascot_guide_component() -> rx.Component:
     """
     return rx.el.div(
         lottie_player(
-            path="/lottie/mascot_idle.json",
+            path=assets.resolve("/lottie/mascot_idle.json"),
             width="150px",
             height="150px",
+            autoplay=~SettingsState.low_power,
         ),
         rx.el.div(
             rx.el.p(
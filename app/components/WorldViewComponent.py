@@ -1,6 +1,9 @@
 import reflex as rx
-from app.states.state import AppState, Child
-from app.components.LottiePlayer import lottie_player
+from app.states.state import Child
+from app.states.activity_log import ActivityLogState
+from app.components.animation import world_view_display_class
+from app.states.family import FamilyState
+from app.components.LottiePlayer import avatar_animation
 from app.components.ProgressAvatar import progress_avatar
 
 
@@ -10,14 +13,14 @@ def world_view_component() -> rx.Component:
     Shows animated avatar, coins, progress, and actions.
     """
     active_child: Child | None = (
-        AppState.active_child_for_world_view
+        FamilyState.active_child_for_world_view
     )
     return rx.cond(
-        AppState.active_child_for_world_view_id != None,
+        FamilyState.active_child_for_world_view_id != None,
         rx.el.div(
             rx.el.button(
                 "← Back to Dashboard",
-                on_click=AppState.close_world_view,
+                on_click=FamilyState.close_world_view,
                 class_name="absolute top-4 left-4 bg-white/80 hover:bg-white text-navy-700 font-semibold py-2 px-4 rounded-lg shadow-md z-10 kindcoins-transition-fast animate-wobble-on-tap",
             ),
             rx.cond(
@@ -28,14 +31,15 @@ def world_view_component() -> rx.Component:
                         class_name="text-4xl font-bold text-white mb-6 text-center [text-shadow:_2px_2px_4px_rgb(0_0_0_/_50%)]",
                     ),
                     rx.el.div(
-                        lottie_player(
-                            path=active_child[
+                        avatar_animation(
+                            active_child[
                                 "avatar_lottie_src"
                             ],
+                            active_child[
+                                "avatar_image_src"
+                            ],
                             width="250px",
                             height="250px",
-                            loop=True,
-                            autoplay=True,
                             class_name="mx-auto mb-4",
                         ),
                         class_name="flex flex-col items-center p-6 bg-sky-100/70 backdrop-blur-sm rounded-xl shadow-xl mb-6",
@@ -62,7 +66,7 @@ def world_view_component() -> rx.Component:
                     ),
                     rx.el.button(
                         "Log a Good Deed!",
-                        on_click=AppState.open_activity_log_overlay,
+                        on_click=ActivityLogState.open_activity_log_overlay,
                         class_name="bg-peach-500 hover:bg-peach-600 text-white font-bold py-3 px-8 rounded-xl shadow-lg text-lg animate-wobble-on-tap kindcoins-transition-fast transform hover:scale-105",
                     ),
                     class_name="flex flex-col items-center justify-center text-center w-full max-w-lg",
@@ -72,12 +76,7 @@ def world_view_component() -> rx.Component:
                     class_name="text-white text-xl",
                 ),
             ),
-            class_name=rx.cond(
-                AppState.world_view_animation_state
-                == "exited",
-                "hidden",
-                f"fixed inset-0 bg-gradient-to-br from-sky-400 via-mint-500 to-sky-600 flex flex-col items-center justify-center p-4 z-30 overflow-y-auto {AppState.world_view_display_class}",
-            ),
+            class_name=f"fixed inset-0 bg-gradient-to-br from-sky-400 via-mint-500 to-sky-600 flex flex-col items-center justify-center p-4 z-30 overflow-y-auto {world_view_display_class}",
         ),
         rx.fragment(),
     )
\ No newline at end of file
@@ -1,12 +1,19 @@
 import reflex as rx
 from app.states.state import (
-    AppState,
     Category,
     Activity,
     Child,
 )
+from app.states.activity_log import ActivityLogState
+from app.states.family import FamilyState
 from app.components.LottiePlayer import lottie_player
 
+# Minutes the browser's clock is ahead of UTC, sent with each log and
+# page load so deeds and streaks follow the family's own calendar day.
+BROWSER_TZ_OFFSET = rx.Var(
+    "-new Date().getTimezoneOffset()"
+).to(int)
+
 
 def interactive_element_class(base_class: str = "") -> str:
     return f"{base_class} transform transition-all duration-150 ease-in-out hover:scale-105 active:scale-95 focus:outline-none focus:ring-2 focus:ring-peach-500"
@@ -28,7 +35,7 @@ def category_card_component(
             ),
             class_name="flex flex-col items-center justify-center p-4 md:p-6",
         ),
-        on_click=lambda: AppState.select_log_category(
+        on_click=lambda: ActivityLogState.select_log_category(
             category["id"]
         ),
         class_name=interactive_element_class(
@@ -60,8 +67,8 @@ def activity_button_component(
             ),
             class_name="flex items-center p-3",
         ),
-        on_click=lambda: AppState.select_log_activity(
-            activity["id"]
+        on_click=lambda: ActivityLogState.select_log_activity(
+            activity["id"], BROWSER_TZ_OFFSET
         ),
         class_name=interactive_element_class(
             "w-full bg-sky-50 hover:bg-sky-100 rounded-xl shadow border border-sky-200 mb-3"
@@ -78,7 +85,7 @@ def confirmation_display_component() -> rx.Component:
     Fixing the error here just in case it's compiled.
     """
     child: Child | None = (
-        AppState.selected_child_for_details
+        FamilyState.selected_child_for_details
     )
     return rx.el.div(
         rx.el.h2(
@@ -86,9 +93,10 @@ def confirmation_display_component() -> rx.Component:
             class_name="text-3xl font-bold text-green-600 mb-4 text-center",
         ),
         rx.cond(
-            AppState.show_coin_burst_lottie_path != "",
+            ActivityLogState.show_coin_burst_lottie_path
+            != "",
             lottie_player(
-                path=AppState.show_coin_burst_lottie_path,
+                path=ActivityLogState.show_coin_burst_lottie_path,
                 width="150px",
                 height="150px",
                 loop=False,
@@ -100,7 +108,7 @@ def confirmation_display_component() -> rx.Component:
             ),
         ),
         rx.el.p(
-            AppState.activity_logged_success_message,
+            ActivityLogState.activity_logged_success_message,
             class_name="text-xl text-navy-700 my-4 text-center font-semibold",
         ),
         rx.cond(
@@ -116,10 +124,10 @@ def confirmation_display_component() -> rx.Component:
                     class_name="w-24 h-24 rounded-full mx-auto my-2 border-4 border-mint-400 shadow-lg",
                 ),
                 rx.cond(
-                    AppState.show_growth_sparkle_lottie_path
+                    ActivityLogState.show_growth_sparkle_lottie_path
                     != "",
                     lottie_player(
-                        path=AppState.show_growth_sparkle_lottie_path,
+                        path=ActivityLogState.show_growth_sparkle_lottie_path,
                         width="100px",
                         height="100px",
                         loop=False,
@@ -134,14 +142,14 @@ def confirmation_display_component() -> rx.Component:
         rx.el.div(
             rx.el.button(
                 "Add Another Activity",
-                on_click=AppState.add_another_activity,
+                on_click=ActivityLogState.add_another_activity,
                 class_name=interactive_element_class(
                     "bg-mint-500 hover:bg-mint-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md w-full md:w-auto mb-2 md:mb-0 md:mr-2"
                 ),
             ),
             rx.el.button(
                 "Return to World",
-                on_click=AppState.return_to_origin_view,
+                on_click=ActivityLogState.return_to_origin_view,
                 class_name=interactive_element_class(
                     "bg-peach-500 hover:bg-peach-600 text-white font-semibold py-3 px-6 rounded-lg shadow-md w-full md:w-auto"
                 ),
@@ -167,10 +175,10 @@ def custom_activity_creator_component() -> rx.Component:
             ),
             rx.el.input(
                 id="custom_activity_name",
-                on_change=AppState.set_custom_activity_name_input,
+                on_change=ActivityLogState.set_custom_activity_name_input,
                 placeholder="e.g., Built a LEGO castle",
                 class_name="mt-1 block w-full pl-3 pr-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm",
-                default_value=AppState.custom_activity_name_input,
+                default_value=ActivityLogState.custom_activity_name_input,
             ),
             class_name="mb-4",
         ),
@@ -182,17 +190,17 @@ def custom_activity_creator_component() -> rx.Component:
             ),
             rx.el.input(
                 id="custom_activity_icon",
-                on_change=AppState.set_custom_activity_icon_input,
+                on_change=ActivityLogState.set_custom_activity_icon_input,
                 placeholder="💡",
                 max_length=2,
                 class_name="mt-1 block w-full pl-3 pr-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm",
-                default_value=AppState.custom_activity_icon_input,
+                default_value=ActivityLogState.custom_activity_icon_input,
             ),
             class_name="mb-4",
         ),
         rx.el.div(
             rx.el.label(
-                f"Coins: {AppState.custom_activity_coins_slider_value} ✨",
+                f"Coins: {ActivityLogState.custom_activity_coins_slider_value} ✨",
                 htmlFor="custom_activity_coins",
                 class_name="block text-sm font-medium text-gray-700 mb-1",
             ),
@@ -201,25 +209,27 @@ def custom_activity_creator_component() -> rx.Component:
                 id="custom_activity_coins",
                 min="1",
                 max="50",
-                on_change=AppState.set_custom_activity_coins_slider_value,
+                on_change=ActivityLogState.set_custom_activity_coins_slider_value,
                 class_name="w-full h-2 bg-gray-200 rounded-lg appearance-none cursor-pointer dark:bg-gray-700 accent-mint-500",
-                default_value=AppState.custom_activity_coins_slider_value.to_string(),
+                default_value=ActivityLogState.custom_activity_coins_slider_value.to_string(),
             ),
             class_name="mb-6",
         ),
         rx.el.div(
             rx.el.button(
                 "Save & Log Activity",
-                on_click=AppState.save_custom_activity,
+                on_click=ActivityLogState.save_custom_activity(
+                    BROWSER_TZ_OFFSET
+                ),
                 class_name=interactive_element_class(
                     "bg-green-500 hover:bg-green-600 text-white font-bold py-3 px-6 rounded-lg shadow-md w-full md:w-auto mb-2 md:mb-0 md:mr-2"
                 ),
-                is_disabled=AppState.custom_activity_name_input.strip()
+                is_disabled=ActivityLogState.custom_activity_name_input.strip()
                 == "",
             ),
             rx.el.button(
                 "Cancel",
-                on_click=AppState.cancel_custom_activity_creation,
+                on_click=ActivityLogState.cancel_custom_activity_creation,
                 class_name=interactive_element_class(
                     "bg-gray-300 hover:bg-gray-400 text-gray-800 font-semibold py-3 px-6 rounded-lg shadow w-full md:w-auto"
                 ),
@@ -0,0 +1,69 @@
+"""Enter/exit choreography for the overlays and panels, run in the browser.
+
+The server only flips semantic state (which view is current, which step
+of the logging flow we are on). Every layer stays mounted and derives an
+open or closed class from that state; CSS transitions then play the
+enter and exit in the browser, with no server round trips in between.
+"""
+
+import reflex as rx
+from app.states.state import AppState
+from app.states.family import FamilyState
+from app.states.activity_log import ActivityLogState
+
+LAYER_TRANSITION = "transition-all duration-300 ease-out"
+# Layers that replace another one wait for it to leave first.
+AFTER_EXIT = "delay-300"
+
+
+def layer_class(
+    is_open: rx.Var, open_class: str, closed_class: str
+) -> rx.Var:
+    """Class for a layer that transitions between open and closed."""
+    return rx.cond(
+        is_open,
+        f"{LAYER_TRANSITION} visible {open_class}",
+        f"{LAYER_TRANSITION} invisible pointer-events-none {closed_class}",
+    )
+
+
+world_view_open = FamilyState.world_view_open
+activity_log_overlay_open = (
+    AppState.current_view == "activity_log_overlay"
+)
+activity_panel_open = (
+    ActivityLogState.activity_log_step == "activity_select"
+)
+confirmation_modal_open = (
+    ActivityLogState.activity_log_step == "confirmation"
+)
+custom_activity_modal_open = (
+    ActivityLogState.activity_log_step
+    == "custom_create_activity"
+)
+
+world_view_display_class = layer_class(
+    world_view_open,
+    "opacity-100 scale-100",
+    "opacity-0 scale-95",
+)
+activity_log_overlay_display_class = layer_class(
+    activity_log_overlay_open,
+    "translate-y-0",
+    "translate-y-full",
+)
+activity_panel_display_class = layer_class(
+    activity_panel_open,
+    "translate-x-0",
+    "translate-x-full",
+)
+confirmation_modal_display_class = layer_class(
+    confirmation_modal_open,
+    f"opacity-100 scale-100 {AFTER_EXIT}",
+    "opacity-0 scale-95",
+)
+custom_activity_modal_display_class = layer_class(
+    custom_activity_modal_open,
+    f"opacity-100 scale-100 {AFTER_EXIT}",
+    "opacity-0 scale-95",
+)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import reflex as rx
+from typing import List, Tuple
+from app.states.settings import SettingsState
+
+LOW_POWER_CLASS = "kc-low-power"
+
+# Reports prefers-reduced-motion (and its changes) and, once the page has
+# settled, the frame rate over one second. Also mirrors the mode onto
+# <html> so low_power.css can drop blur, shadows and looping animations.
+_PROBE_CODE = """
+function KindCoinsLowPowerProbe({ lowPower, onDetect }) {
+  useEffect(() => {
+    document.documentElement.classList.toggle("%(class)s", !!lowPower);
+  }, [lowPower]);
+
+  useEffect(() => {
+    const reducedMotion = window.matchMedia("(prefers-reduced-motion: reduce)");
+    const onMotionChange = () => onDetect?.(reducedMotion.matches, 0);
+    reducedMotion.addEventListener("change", onMotionChange);
+    let frame = null;
+    const settle = setTimeout(() => {
+      if (document.hidden) {
+        onMotionChange();
+        return;
+      }
+      let frames = 0;
+      const started = performance.now();
+      const count = (now) => {
+        frames += 1;
+        if (now - started < 1000) {
+          frame = requestAnimationFrame(count);
+        } else {
+          onDetect?.(reducedMotion.matches, (frames * 1000) / (now - started));
+        }
+      };
+      frame = requestAnimationFrame(count);
+    }, 1000);
+    return () => {
+      clearTimeout(settle);
+      if (frame !== null) cancelAnimationFrame(frame);
+      reducedMotion.removeEventListener("change", onMotionChange);
+    };
+  }, []);
+
+  return null;
+}
+""" % {"class": LOW_POWER_CLASS}
+
+
+def _on_detect_spec(
+    reduced_motion: rx.Var[bool], fps: rx.Var[float]
+) -> Tuple[rx.Var[bool], rx.Var[float]]:
+    return reduced_motion, fps
+
+
+class LowPowerProbe(rx.Component):
+    """Detects slow or motion-sensitive devices; renders nothing."""
+
+    tag = "KindCoinsLowPowerProbe"
+
+    low_power: rx.Var[bool]
+    on_detect: rx.EventHandler[_on_detect_spec]
+
+    def add_imports(self):
+        return {"react": ["useEffect"]}
+
+    def add_custom_code(self) -> List[str]:
+        return [_PROBE_CODE]
+
+
+def low_power_probe() -> rx.Component:
+    return LowPowerProbe.create(
+        low_power=SettingsState.low_power,
+        on_detect=SettingsState.report_device,
+    )
\ No newline at end of file
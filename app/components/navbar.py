@@ -1,5 +1,7 @@
 import reflex as rx
 from app.states.state import AppState
+from app.components.low_power import low_power_probe
+from app.components.offline import offline_queue
 import datetime
 
 
@@ -71,6 +73,8 @@ def page_layout(
 ) -> rx.Component:
     return rx.el.div(
         rx.el.title(title),
+        low_power_probe(),
+        offline_queue(),
         navbar(),
         rx.el.main(
             content,
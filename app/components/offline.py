@@ -0,0 +1,210 @@
+import reflex as rx
+from typing import List
+from reflex.components.core.banner import (
+    has_connection_errors,
+)
+from reflex.event import passthrough_event_spec
+from app.states.activity_log import ActivityLogState
+from app.states.catalog import CatalogState
+from app.states.family import FamilyState
+
+# IndexedDB keeps two stores: "deeds", the queue keyed by idempotency key,
+# and "snapshot", the last children and activities seen online so deeds
+# can still be picked after an offline reload.
+_QUEUE_CODE = """
+let kindcoinsOfflineDb = null;
+
+function openOfflineDb() {
+  kindcoinsOfflineDb ??= new Promise((resolve, reject) => {
+    const open = indexedDB.open("kindcoins-offline", 1);
+    open.onupgradeneeded = () => {
+      open.result.createObjectStore("deeds", { keyPath: "key" });
+      open.result.createObjectStore("snapshot");
+    };
+    open.onsuccess = () => resolve(open.result);
+    open.onerror = () => reject(open.error);
+  });
+  return kindcoinsOfflineDb;
+}
+
+function idbRequest(request) {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function idbDone(transaction) {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = transaction.onabort = () => reject(transaction.error);
+  });
+}
+
+async function offlineRead(store, read) {
+  const db = await openOfflineDb();
+  return idbRequest(read(db.transaction(store).objectStore(store)));
+}
+
+async function offlineWrite(store, write) {
+  const db = await openOfflineDb();
+  const transaction = db.transaction(store, "readwrite");
+  write(transaction.objectStore(store));
+  return idbDone(transaction);
+}
+
+// Same ULID layout as app/states/ids.py: the key becomes the history
+// entry id, so it carries the time the deed was logged on the device.
+const CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ";
+
+function idempotencyKey(time) {
+  let key = "";
+  for (let power = 9; power >= 0; power--) {
+    key += CROCKFORD[Math.floor(time / 32 ** power) % 32];
+  }
+  for (const byte of crypto.getRandomValues(new Uint8Array(16))) {
+    key += CROCKFORD[byte % 32];
+  }
+  return key;
+}
+
+function KindCoinsOfflineQueue({ connected, snapshot, ackedKeys, onReplay, ...rest }) {
+  const [online, setOnline] = useState(true);
+  const [catalog, setCatalog] = useState(null);
+  const [childId, setChildId] = useState("");
+  const [queued, setQueued] = useState(0);
+  const live = connected && online;
+
+  const countQueued = () =>
+    offlineRead("deeds", (store) => store.count())
+      .then(setQueued)
+      .catch((error) => console.warn("Offline queue:", error));
+
+  useEffect(() => {
+    navigator.serviceWorker?.register("/sw.js").catch(() => {});
+    const update = () => setOnline(navigator.onLine);
+    update();
+    window.addEventListener("online", update);
+    window.addEventListener("offline", update);
+    countQueued();
+    return () => {
+      window.removeEventListener("online", update);
+      window.removeEventListener("offline", update);
+    };
+  }, []);
+
+  // The snapshot prop is a new object on every render; compare contents.
+  const snapshotJson = JSON.stringify(snapshot ?? null);
+  useEffect(() => {
+    if (live && snapshot?.children?.length) {
+      offlineWrite("snapshot", (store) => store.put(snapshot, "catalog"));
+      setCatalog(snapshot);
+    } else if (!live && !catalog) {
+      offlineRead("snapshot", (store) => store.get("catalog")).then(
+        (saved) => saved && setCatalog(saved),
+      );
+    }
+  }, [live, snapshotJson]);
+
+  // Everything queued goes out as one batch once the backend is back.
+  useEffect(() => {
+    if (!live || !queued) return;
+    offlineRead("deeds", (store) => store.getAll()).then(
+      (deeds) => deeds.length && onReplay?.(deeds),
+    );
+  }, [live, queued]);
+
+  useEffect(() => {
+    if (!ackedKeys?.length) return;
+    offlineWrite("deeds", (store) =>
+      ackedKeys.forEach((key) => store.delete(key)),
+    ).then(countQueued);
+  }, [ackedKeys]);
+
+  if (live) return null;
+  const children = catalog?.children ?? [];
+  const selected = childId || children[0]?.id;
+  const queue = (activity) => {
+    const loggedAt = new Date();
+    return offlineWrite("deeds", (store) =>
+      store.put({
+        key: idempotencyKey(loggedAt.getTime()),
+        child_id: selected,
+        activity_id: activity.id,
+        logged_at: loggedAt.getTime(),
+        tz_offset: -loggedAt.getTimezoneOffset(),
+      }),
+    ).then(countQueued);
+  };
+
+  return (
+    <div role="status" {...rest}>
+      <p className="font-semibold text-navy-700">
+        You're offline. Deeds logged here are saved on this device and
+        added when you're back online.
+      </p>
+      {children.length ? (
+        <select
+          value={selected}
+          onChange={(event) => setChildId(event.target.value)}
+          className="mt-2 w-full rounded-md border-gray-300 p-2 text-sm"
+        >
+          {children.map((child) => (
+            <option key={child.id} value={child.id}>
+              {child.name}
+            </option>
+          ))}
+        </select>
+      ) : null}
+      <div className="mt-2 grid max-h-48 grid-cols-2 gap-2 overflow-y-auto">
+        {(catalog?.activities ?? []).map((activity) => (
+          <button
+            key={activity.id}
+            type="button"
+            disabled={!selected}
+            onClick={() => queue(activity)}
+            className="rounded-lg bg-mint-100 px-2 py-1 text-left text-sm text-navy-700 hover:bg-mint-200"
+          >
+            {activity.icon} {activity.name} +{activity.coins}
+          </button>
+        ))}
+      </div>
+      {queued ? (
+        <p className="mt-2 text-sm text-peach-700">
+          {queued} deeds waiting to be sent
+        </p>
+      ) : null}
+    </div>
+  );
+}
+"""
+
+
+class OfflineQueue(rx.Component):
+    """Queues deeds in IndexedDB while offline and replays them later."""
+
+    tag = "KindCoinsOfflineQueue"
+
+    connected: rx.Var[bool]
+    snapshot: rx.Var[dict]
+    acked_keys: rx.Var[List[str]]
+    on_replay: rx.EventHandler[passthrough_event_spec(list)]
+
+    def add_imports(self):
+        return {"react": ["useEffect", "useState"]}
+
+    def add_custom_code(self) -> List[str]:
+        return [_QUEUE_CODE]
+
+
+def offline_queue() -> rx.Component:
+    return OfflineQueue.create(
+        connected=~has_connection_errors,
+        snapshot={
+            "children": FamilyState.children,
+            "activities": CatalogState.activities,
+        },
+        acked_keys=ActivityLogState.offline_acked_keys,
+        on_replay=ActivityLogState.replay_offline_deeds,
+        class_name="fixed top-4 left-1/2 -translate-x-1/2 z-50 w-[90vw] max-w-md p-4 bg-white rounded-2xl shadow-xl border border-peach-300",
+    )
\ No newline at end of file
@@ -0,0 +1,62 @@
+import reflex as rx
+from app.states.stats import (
+    StatsState,
+    CHART_CATEGORIES,
+)
+
+CATEGORY_COLORS = {
+    "Kindness": "#facc15",
+    "Chores": "#60a5fa",
+    "Learning": "#4ade80",
+    "Health": "#f87171",
+    "Custom": "#c084fc",
+}
+
+
+def coins_by_category_chart(
+    data: rx.Var, height: int = 220
+) -> rx.Component:
+    """Stacked bars of coins per category, one bar per row of `data`."""
+    return rx.recharts.bar_chart(
+        *[
+            rx.recharts.bar(
+                data_key=category,
+                stack_id="coins",
+                fill=CATEGORY_COLORS[category],
+            )
+            for category in CHART_CATEGORIES
+        ],
+        rx.recharts.x_axis(data_key="name"),
+        rx.recharts.y_axis(allow_decimals=False),
+        rx.recharts.graphing_tooltip(),
+        rx.recharts.legend(),
+        data=data,
+        width="100%",
+        height=height,
+    )
+
+
+def family_week_summary() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            f"This week: {StatsState.family_week_total} coins",
+            class_name="text-lg font-bold text-navy-700 mb-2",
+        ),
+        coins_by_category_chart(
+            StatsState.family_week_chart
+        ),
+        class_name="bg-white/70 backdrop-blur-sm rounded-2xl shadow p-4 mx-4 md:mx-8 mb-24",
+    )
+
+
+def child_days_summary() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            f"Last 14 days: {StatsState.child_days_total} coins",
+            class_name="text-lg font-bold text-navy-700 mb-2",
+        ),
+        coins_by_category_chart(
+            StatsState.child_days_chart
+        ),
+        class_name="bg-white rounded-lg shadow p-4 mb-6",
+    )
\ No newline at end of file
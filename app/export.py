@@ -0,0 +1,157 @@
+"""Streaming download of the history ledger.
+
+GET ENDPOINT?format=csv|ndjson with optional child_id, since, until
+(ISO dates in server local time, inclusive) and category filters.
+Timestamps are written as epoch milliseconds with their tz_offset, and
+each row spells out its label's catalog ids and names. Rows are read from the store
+in batches and written to the response as they arrive, so memory stays
+flat however long the ledger is.
+"""
+
+import csv
+import datetime
+import io
+import json
+import re
+from typing import Iterator
+import reflex as rx
+from fastapi import Request
+from fastapi.responses import (
+    JSONResponse,
+    StreamingResponse,
+)
+from app.states import labels, store, streaks
+from app.states.types import HistoryEntry
+
+ENDPOINT = "/_export/history"
+FIELDS = [
+    "id",
+    "child_id",
+    *labels.FIELDS,
+    "coins_earned",
+    "timestamp",
+    "tz_offset",
+]
+_ROWS_PER_CHUNK = 500
+_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _with_labels(
+    entries: Iterator[HistoryEntry],
+) -> Iterator[dict]:
+    """Rows with the label id swapped for the label's fields."""
+    for entry in entries:
+        label = labels.get(entry["label_id"])
+        yield {
+            field: (
+                entry[field]
+                if field in entry
+                else label[field]
+            )
+            for field in FIELDS
+        }
+
+
+def _csv_chunks(
+    entries: Iterator[dict],
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    for count, entry in enumerate(entries, start=1):
+        writer.writerow(entry)
+        if count % _ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(
+    entries: Iterator[dict],
+) -> Iterator[str]:
+    lines = []
+    for entry in entries:
+        lines.append(json.dumps(entry, ensure_ascii=False))
+        if len(lines) == _ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _day_start(
+    value: str | None, days_after: int = 0
+) -> int | None:
+    """Epoch ms of local midnight on an ISO date, `days_after` later."""
+    if not value:
+        return None
+    day = datetime.date.fromisoformat(
+        value
+    ) + datetime.timedelta(days=days_after)
+    return streaks.epoch_ms(
+        datetime.datetime.combine(
+            day, datetime.time()
+        ).astimezone()
+    )
+
+
+async def _export_endpoint(request: Request):
+    params = request.query_params
+    export_format = params.get("format", "csv")
+    if export_format not in _MEDIA_TYPES:
+        return JSONResponse(
+            {"detail": "format must be csv or ndjson"},
+            status_code=400,
+        )
+    try:
+        since = _day_start(params.get("since"))
+        until = _day_start(params.get("until"), 1)
+    except ValueError:
+        return JSONResponse(
+            {"detail": "since/until must be YYYY-MM-DD"},
+            status_code=400,
+        )
+    child_id = params.get("child_id") or None
+    entries = _with_labels(
+        store.iter_history(
+            child_id=child_id,
+            since=since,
+            until=until,
+            category_name=params.get("category") or None,
+        )
+    )
+    chunks = (
+        _csv_chunks(entries)
+        if export_format == "csv"
+        else _ndjson_chunks(entries)
+    )
+    label = (
+        re.sub(r"[^A-Za-z0-9_-]", "", child_id or "")
+        or "family"
+    )
+    filename = f"kindcoins-history-{label}.{export_format}"
+    return StreamingResponse(
+        chunks,
+        media_type=_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        },
+    )
+
+
+def export_url(export_format: str, child_id=None) -> str:
+    """Backend URL of the export; `child_id` may be a Var."""
+    url = f"{rx.config.get_config().api_url}{ENDPOINT}?format={export_format}"
+    if child_id is None:
+        return url
+    return f"{url}&child_id={child_id}"
+
+
+def install(app: rx.App):
+    app.api.add_api_route(
+        ENDPOINT, _export_endpoint, methods=["GET"]
+    )
\ No newline at end of file
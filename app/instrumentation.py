@@ -0,0 +1,248 @@
+"""Opt-in cost instrumentation for state event handlers.
+
+Enabled with KINDCOINS_INSTRUMENT=1. Every handled event records its wall
+time, how long it held the state lock, how many computed vars were
+recomputed and how many delta bytes went to the client. Each event logs one
+line and the aggregated histograms are served on loopback at ENDPOINT.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import os
+import time
+from typing import Dict, List
+import reflex as rx
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import StateUpdate
+from reflex.utils import console
+from reflex.utils.format import json_dumps
+
+ENV_FLAG = "KINDCOINS_INSTRUMENT"
+ENDPOINT = "/_instrumentation"
+MS_BOUNDS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+BYTE_BOUNDS = [128, 256, 512, 1024, 2048, 4096, 8192, 32768]
+COUNT_BOUNDS = [0, 1, 2, 4, 8, 16]
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_FLAG, "") not in ("", "0")
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket i counts values <= bounds[i]."""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[
+            bisect.bisect_left(self.bounds, value)
+        ] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def _quantile(self, fraction: float) -> float:
+        rank = fraction * sum(self.counts)
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if position < len(self.bounds):
+                    return self.bounds[position]
+                return self.max
+        return 0.0
+
+    def summary(self) -> dict:
+        count = sum(self.counts)
+        labels = [f"<={bound}" for bound in self.bounds]
+        labels.append(f">{self.bounds[-1]}")
+        return {
+            "count": count,
+            "mean": (
+                round(self.total / count, 3)
+                if count
+                else 0.0
+            ),
+            "p50": self._quantile(0.5),
+            "p95": self._quantile(0.95),
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class EventStats:
+    def __init__(self):
+        self.wall_ms = Histogram(MS_BOUNDS)
+        self.lock_ms = Histogram(MS_BOUNDS)
+        self.computed_vars = Histogram(COUNT_BOUNDS)
+        self.delta_bytes = Histogram(BYTE_BOUNDS)
+
+    def summary(self) -> dict:
+        return {
+            "wall_ms": self.wall_ms.summary(),
+            "lock_ms": self.lock_ms.summary(),
+            "computed_vars": self.computed_vars.summary(),
+            "delta_bytes": self.delta_bytes.summary(),
+        }
+
+
+class _Sample:
+    def __init__(self, label: str, background: bool):
+        self.label = label
+        self.background = background
+        self.started = time.perf_counter()
+        self.lock_seconds = 0.0
+        self.computed_vars = 0
+        self.delta_bytes = 0
+
+    def add_delta(self, delta: dict):
+        if not delta:
+            return
+        self.delta_bytes += len(json_dumps(delta))
+        for state_name, fields in delta.items():
+            computed = rx.State.get_class_substate(
+                state_name
+            ).computed_vars
+            self.computed_vars += sum(
+                1 for field in fields if field in computed
+            )
+
+
+_stats: Dict[str, EventStats] = {}
+_current_sample: contextvars.ContextVar[_Sample | None] = (
+    contextvars.ContextVar(
+        "kindcoins_event_sample", default=None
+    )
+)
+
+
+def snapshot() -> Dict[str, dict]:
+    return {
+        label: stats.summary()
+        for label, stats in sorted(_stats.items())
+    }
+
+
+def reset():
+    _stats.clear()
+
+
+def _finish(sample: _Sample):
+    wall_seconds = time.perf_counter() - sample.started
+    # Foreground handlers run entirely under the state lock; background
+    # handlers only hold it inside `async with self`.
+    lock_seconds = (
+        sample.lock_seconds
+        if sample.background
+        else wall_seconds
+    )
+    stats = _stats.setdefault(sample.label, EventStats())
+    stats.wall_ms.observe(wall_seconds * 1000)
+    stats.lock_ms.observe(lock_seconds * 1000)
+    stats.computed_vars.observe(sample.computed_vars)
+    stats.delta_bytes.observe(sample.delta_bytes)
+    console.info(
+        f"event-cost {sample.label} "
+        f"wall={wall_seconds * 1000:.1f}ms "
+        f"lock={lock_seconds * 1000:.1f}ms "
+        f"computed_vars={sample.computed_vars} "
+        f"delta_bytes={sample.delta_bytes}"
+    )
+
+
+class InstrumentationMiddleware(Middleware):
+    """Times each event from preprocess to its final update."""
+
+    def __init__(self):
+        self._pending: Dict[int, _Sample] = {}
+
+    async def preprocess(
+        self, app: rx.App, state: rx.State, event: Event
+    ) -> StateUpdate | None:
+        path, _, handler_name = event.name.rpartition(".")
+        state_cls = rx.State.get_class_substate(path)
+        handler = state_cls.event_handlers.get(handler_name)
+        if handler is None:
+            return None
+        sample = _Sample(
+            f"{state_cls.__name__}.{handler_name}",
+            handler.is_background,
+        )
+        self._pending[id(event)] = sample
+        # Background tasks copy this context, so their `async with self`
+        # blocks are attributed to the event that started them.
+        _current_sample.set(sample)
+        return None
+
+    async def postprocess(
+        self,
+        app: rx.App,
+        state: rx.State,
+        event: Event,
+        update: StateUpdate,
+    ) -> StateUpdate:
+        sample = self._pending.get(id(event))
+        if sample is None:
+            return update
+        sample.add_delta(update.delta)
+        if update.final:
+            del self._pending[id(event)]
+            _finish(sample)
+        return update
+
+
+def _instrument_modify_state(app: rx.App):
+    modify_state = app.modify_state
+
+    @contextlib.asynccontextmanager
+    async def timed_modify_state(token: str):
+        sample = _current_sample.get()
+        if sample is None:
+            async with modify_state(token) as state:
+                yield state
+            return
+        async with modify_state(token) as state:
+            acquired = time.perf_counter()
+            yield state
+            sample.add_delta(
+                await state._get_resolved_delta()
+            )
+        sample.lock_seconds += (
+            time.perf_counter() - acquired
+        )
+
+    app.modify_state = timed_modify_state
+
+
+async def _instrumentation_endpoint(
+    request: Request,
+) -> JSONResponse:
+    if (
+        request.client is None
+        or request.client.host not in _LOOPBACK_HOSTS
+    ):
+        return JSONResponse(
+            {"detail": "Not Found"}, status_code=404
+        )
+    if request.method == "DELETE":
+        reset()
+    return JSONResponse(snapshot())
+
+
+def install(app: rx.App):
+    """Attach the middleware, lock timer and endpoint to the app."""
+    app.add_middleware(InstrumentationMiddleware())
+    _instrument_modify_state(app)
+    app.api.add_api_route(
+        ENDPOINT,
+        _instrumentation_endpoint,
+        methods=["GET", "DELETE"],
+    )
\ No newline at end of file
@@ -1,12 +1,19 @@
 import reflex as rx
-from app.states.state import AppState, Goal
+from app.states.state import Goal
+from app.states.family import FamilyState
+from app.states.settings import SettingsState
+from app.components.activity_logging import (
+    BROWSER_TZ_OFFSET,
+)
 from app.components.navbar import page_layout
 
 
 def goal_card(goal: Goal) -> rx.Component:
     child_coin_balance = rx.cond(
-        AppState.selected_child_for_details,
-        AppState.selected_child_for_details["coin_balance"],
+        FamilyState.selected_child_for_details,
+        FamilyState.selected_child_for_details[
+            "coin_balance"
+        ],
         0,
     )
     progress_percentage = rx.cond(
@@ -24,7 +31,7 @@ def goal_card(goal: Goal) -> rx.Component:
             class_name="text-xl font-semibold text-navy-700 mb-2 truncate",
         ),
         rx.el.p(
-            f"Target: {AppState.current_currency_symbol}{goal['target_coins']} coins",
+            f"Target: {SettingsState.current_currency_symbol}{goal['target_coins']} coins",
             class_name="text-sm text-gray-600",
         ),
         rx.cond(
@@ -74,7 +81,7 @@ def goal_card(goal: Goal) -> rx.Component:
             ),
             rx.el.button(
                 "Mark as Complete",
-                on_click=lambda: AppState.complete_goal(
+                on_click=lambda: FamilyState.complete_goal(
                     goal["id"]
                 ),
                 class_name="mt-4 w-full bg-amber-500 hover:bg-amber-600 text-white font-semibold py-2 px-4 rounded-lg shadow transition-colors",
@@ -100,8 +107,8 @@ def goals_page() -> rx.Component:
             ),
             rx.el.input(
                 type="text",
-                default_value=AppState.form_goal_description,
-                key=AppState.form_goal_description,
+                default_value=FamilyState.form_goal_description,
+                key=FamilyState.form_goal_description,
                 id="goal_desc",
                 name="goal_desc",
                 placeholder="e.g., Save for a new LEGO set",
@@ -118,8 +125,8 @@ def goals_page() -> rx.Component:
             ),
             rx.el.input(
                 type="number",
-                default_value=AppState.form_goal_target_coins.to_string(),
-                key=AppState.form_goal_target_coins.to_string(),
+                default_value=FamilyState.form_goal_target_coins.to_string(),
+                key=FamilyState.form_goal_target_coins.to_string(),
                 id="goal_coins",
                 name="goal_coins",
                 placeholder="100",
@@ -139,8 +146,8 @@ def goals_page() -> rx.Component:
                 type="text",
                 id="goal_reward",
                 name="reward_note",
-                default_value=AppState.form_goal_reward_note,
-                key=AppState.form_goal_reward_note,
+                default_value=FamilyState.form_goal_reward_note,
+                key=FamilyState.form_goal_reward_note,
                 placeholder="e.g., A trip to the ice cream shop!",
                 class_name="mt-1 block w-full pl-3 pr-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm",
             ),
@@ -151,7 +158,7 @@ def goals_page() -> rx.Component:
             type="submit",
             class_name="w-full bg-mint-500 hover:bg-mint-600 text-white font-bold py-3 px-4 rounded-lg shadow-md transition-colors",
         ),
-        on_submit=AppState.handle_add_goal_form_submit,
+        on_submit=FamilyState.handle_add_goal_form_submit,
         reset_on_submit=True,
         class_name="p-6 bg-white rounded-xl shadow-xl mb-8",
     )
@@ -168,39 +175,39 @@ def goals_page() -> rx.Component:
             ),
             rx.el.select(
                 rx.foreach(
-                    AppState.children_options,
-                    lambda option: rx.el.option(
-                        option["label"],
-                        value=option["value"],
+                    FamilyState.children,
+                    lambda child: rx.el.option(
+                        child["name"],
+                        value=child["id"],
                     ),
                 ),
-                default_value=AppState.current_child_id_for_details,
-                on_change=AppState.set_current_child_id_for_details,
+                default_value=FamilyState.current_child_id_for_details,
+                on_change=FamilyState.set_current_child_id_for_details,
                 id="child_goal_select",
                 class_name="mt-1 block w-full md:w-1/3 pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm rounded-md shadow-sm",
             ),
             class_name="mb-8",
         ),
         rx.cond(
-            AppState.selected_child_for_details,
+            FamilyState.selected_child_for_details,
             rx.el.div(
                 add_goal_form,
                 rx.el.h3(
-                    f"Goals for {AppState.selected_child_for_details['name']}",
+                    f"Goals for {FamilyState.selected_child_for_details['name']}",
                     class_name="text-2xl font-semibold text-navy-700 mb-4 mt-8",
                 ),
                 rx.cond(
-                    AppState.goals_for_selected_child.length()
+                    FamilyState.goals_for_selected_child.length()
                     > 0,
                     rx.el.div(
                         rx.foreach(
-                            AppState.goals_for_selected_child,
+                            FamilyState.goals_for_selected_child,
                             goal_card,
                         ),
                         class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6",
                     ),
                     rx.el.p(
-                        f"No goals set for {AppState.selected_child_for_details['name']} yet. Add one above!",
+                        f"No goals set for {FamilyState.selected_child_for_details['name']} yet. Add one above!",
                         class_name="text-center text-gray-500 py-8 text-lg",
                     ),
                 ),
@@ -210,7 +217,9 @@ def goals_page() -> rx.Component:
                 class_name="text-center text-gray-500 py-8 text-lg",
             ),
         ),
-        on_mount=AppState.load_initial_data,
+        on_mount=FamilyState.load_initial_data(
+            BROWSER_TZ_OFFSET
+        ),
         class_name="max-w-5xl mx-auto",
     )
     return page_layout(content, title="Goals - KindCoins")
\ No newline at end of file
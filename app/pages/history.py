@@ -1,22 +1,34 @@
 import reflex as rx
-from app.states.state import AppState, HistoryEntry
+from app.states.state import HistoryEntry
+from app.states.family import FamilyState
+from app.states.stats import StatsState
+from app.components.activity_logging import (
+    BROWSER_TZ_OFFSET,
+)
 from app.components.navbar import page_layout
+from app.export import export_url
+from app.components.stats_charts import (
+    child_days_summary,
+)
 
 
 def history_entry_card(entry: HistoryEntry) -> rx.Component:
+    label = FamilyState.history_labels[
+        entry["label_id"].to(str)
+    ]
     return rx.el.div(
         rx.el.div(
             rx.el.span(
-                entry["category_icon"],
+                label["category_icon"],
                 class_name="text-2xl mr-3",
             ),
             rx.el.div(
                 rx.el.p(
-                    entry["activity_name"],
+                    label["activity_name"],
                     class_name="font-semibold text-navy-700",
                 ),
                 rx.el.p(
-                    f"Category: {entry['category_name']}",
+                    f"Category: {label['category_name']}",
                     class_name="text-sm text-gray-600",
                 ),
             ),
@@ -28,23 +40,44 @@ def history_entry_card(entry: HistoryEntry) -> rx.Component:
                 class_name="font-bold text-amber-500 text-lg",
             ),
             rx.el.p(
-                rx.el.span(
-                    entry["timestamp"].split("T")[0]
-                ),
-                " ",
-                rx.el.span(
-                    entry["timestamp"]
-                    .split("T")[1]
-                    .split(".")[0]
+                # Epoch ms, shown in the viewer's time zone.
+                rx.moment(
+                    entry["timestamp"],
+                    format="YYYY-MM-DD HH:mm:ss",
+                    interval=0,
                 ),
                 class_name="text-xs text-gray-500",
             ),
             class_name="text-right",
         ),
+        style={
+            "content_visibility": "auto",
+            "contain_intrinsic_size": "auto 88px",
+        },
         class_name="bg-sky-50 p-4 rounded-lg shadow flex justify-between items-center hover:shadow-md transition-shadow",
     )
 
 
+def history_pager() -> rx.Component:
+    """Cursor controls for moving the history window one page at a time."""
+    button_class = "bg-white hover:bg-sky-100 text-navy-700 font-semibold py-2 px-4 rounded-lg shadow disabled:opacity-40 disabled:cursor-not-allowed transition-colors"
+    return rx.el.div(
+        rx.el.button(
+            "← Newer",
+            on_click=FamilyState.load_newer_history,
+            disabled=~FamilyState.history_has_newer,
+            class_name=button_class,
+        ),
+        rx.el.button(
+            "Older →",
+            on_click=FamilyState.load_older_history,
+            disabled=~FamilyState.history_has_older,
+            class_name=button_class,
+        ),
+        class_name="flex justify-between mt-6",
+    )
+
+
 def history_page() -> rx.Component:
     """Page for viewing activity history."""
     content = rx.el.div(
@@ -60,39 +93,71 @@ def history_page() -> rx.Component:
             ),
             rx.el.select(
                 rx.foreach(
-                    AppState.children_options,
-                    lambda option: rx.el.option(
-                        option["label"],
-                        value=option["value"],
+                    FamilyState.children,
+                    lambda child: rx.el.option(
+                        child["name"],
+                        value=child["id"],
                     ),
                 ),
-                default_value=AppState.current_child_id_for_details,
-                on_change=AppState.set_current_child_id_for_details,
+                default_value=FamilyState.current_child_id_for_details,
+                on_change=[
+                    FamilyState.set_current_child_id_for_details,
+                    StatsState.load_child_stats,
+                ],
                 id="child_history_select",
                 class_name="mt-1 block w-full md:w-1/3 pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm rounded-md shadow-sm",
             ),
+            rx.cond(
+                FamilyState.current_child_id_for_details,
+                rx.el.p(
+                    "Download: ",
+                    rx.el.a(
+                        "CSV",
+                        href=export_url(
+                            "csv",
+                            FamilyState.current_child_id_for_details,
+                        ),
+                        class_name="text-mint-600 hover:underline font-medium",
+                    ),
+                    " · ",
+                    rx.el.a(
+                        "NDJSON",
+                        href=export_url(
+                            "ndjson",
+                            FamilyState.current_child_id_for_details,
+                        ),
+                        class_name="text-mint-600 hover:underline font-medium",
+                    ),
+                    class_name="mt-2 text-sm text-gray-600",
+                ),
+                rx.fragment(),
+            ),
             class_name="mb-6",
         ),
         rx.cond(
-            AppState.isLoading,
+            FamilyState.isLoading,
             rx.el.p(
                 "Loading history...",
                 class_name="text-gray-500",
             ),
             rx.cond(
-                AppState.history_for_selected_child.length()
+                FamilyState.history_for_selected_child.length()
                 > 0,
                 rx.el.div(
-                    rx.foreach(
-                        AppState.history_for_selected_child,
-                        history_entry_card,
+                    child_days_summary(),
+                    rx.el.div(
+                        rx.foreach(
+                            FamilyState.history_for_selected_child,
+                            history_entry_card,
+                        ),
+                        class_name="space-y-4",
                     ),
-                    class_name="space-y-4",
+                    history_pager(),
                 ),
                 rx.el.p(
                     rx.cond(
-                        AppState.selected_child_for_details,
-                        f"No history found for {AppState.selected_child_for_details['name']}.",
+                        FamilyState.selected_child_for_details,
+                        f"No history found for {FamilyState.selected_child_for_details['name']}.",
                         "Select a child to view their history.",
                     ),
                     class_name="text-center text-gray-500 py-8 text-lg",
@@ -100,7 +165,12 @@ def history_page() -> rx.Component:
             ),
         ),
         class_name="max-w-2xl mx-auto",
-        on_mount=AppState.load_initial_data,
+        on_mount=[
+            FamilyState.load_initial_data(
+                BROWSER_TZ_OFFSET
+            ),
+            StatsState.load_stats(BROWSER_TZ_OFFSET),
+        ],
     )
     return page_layout(
         content, title="Activity History - KindCoins"
@@ -1,5 +1,7 @@
 import reflex as rx
 from app.states.state import AppState
+from app.states.activity_log import ActivityLogState
+from app.states.family import FamilyState
 from app.components.ChildCard import (
     child_dashboard_card_component,
 )
@@ -15,18 +17,27 @@ from app.components.ActivityLogComponent import (
 from app.components.MascotGuide import (
     mascot_guide_component,
 )
+from app.components.activity_logging import (
+    BROWSER_TZ_OFFSET,
+)
+from app.components.low_power import low_power_probe
+from app.components.offline import offline_queue
+from app.components.stats_charts import (
+    family_week_summary,
+)
+from app.states.stats import StatsState
 
 
 def index_page() -> rx.Component:
     """The main dashboard page for KindCoins - ultra-minimal and child-friendly."""
     page_container_class = rx.cond(
         AppState.time_of_day == "day",
-        "bg-gradient-to-br from-sky-300 via-sky-100 to-peach-100 min-h-screen transition-colors duration-1000 overflow-hidden relative",
-        "bg-gradient-to-br from-navy-700 via-navy-900 to-purple-900 min-h-screen transition-colors duration-1000 overflow-hidden relative",
+        "bg-gradient-to-br from-sky-300 via-sky-100 to-peach-100 min-h-screen transition-colors duration-1000 overflow-hidden relative isolate",
+        "bg-gradient-to-br from-navy-700 via-navy-900 to-purple-900 min-h-screen transition-colors duration-1000 overflow-hidden relative isolate",
     )
     dashboard_content = rx.el.div(
         rx.cond(
-            AppState.isLoading,
+            FamilyState.isLoading,
             rx.el.div(
                 rx.el.p(
                     "Loading dashboard...",
@@ -40,13 +51,13 @@ def index_page() -> rx.Component:
             rx.el.div(
                 rx.el.div(
                     rx.foreach(
-                        AppState.children,
+                        FamilyState.children,
                         child_dashboard_card_component,
                     ),
                     class_name="grid grid-cols-2 sm:grid-cols-3 md:grid-cols-4 lg:grid-cols-5 gap-4 md:gap-6 p-4 md:p-8 justify-items-center items-start pt-10",
                 ),
                 rx.cond(
-                    AppState.children.length() == 0,
+                    FamilyState.children.length() == 0,
                     rx.el.div(
                         rx.el.p(
                             "No children added yet. Go to 'Manage' to add a child.",
@@ -59,7 +70,7 @@ def index_page() -> rx.Component:
                         ),
                         class_name="text-center p-8 flex flex-col items-center justify-center h-full",
                     ),
-                    rx.fragment(),
+                    family_week_summary(),
                 ),
                 class_name="w-full container mx-auto px-2 py-2",
             ),
@@ -68,13 +79,15 @@ def index_page() -> rx.Component:
             rx.el.span(
                 "+", class_name="text-3xl text-white"
             ),
-            on_click=AppState.open_activity_log_overlay,
+            on_click=ActivityLogState.open_activity_log_overlay,
             class_name="fixed bottom-6 right-6 bg-peach-500 hover:bg-peach-600 rounded-full w-16 h-16 flex items-center justify-center shadow-xl z-20 transition-transform hover:scale-110 kindcoins-transition-fast animate-wobble-on-tap",
         ),
         class_name="flex-grow w-full overflow-y-auto",
     )
     return rx.el.div(
         rx.el.title("KindCoins Dashboard"),
+        low_power_probe(),
+        offline_queue(),
         floating_animations_component(),
         rx.cond(
             AppState.current_view == "dashboard",
@@ -86,7 +99,10 @@ def index_page() -> rx.Component:
         mascot_guide_component(),
         class_name=page_container_class,
         on_mount=[
-            AppState.load_initial_data,
+            FamilyState.load_initial_data(
+                BROWSER_TZ_OFFSET
+            ),
             AppState.update_time_of_day,
+            StatsState.load_stats(BROWSER_TZ_OFFSET),
         ],
     )
\ No newline at end of file
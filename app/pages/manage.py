@@ -1,10 +1,18 @@
 import reflex as rx
 from app.states.state import (
-    AppState,
     AVATAR_TYPES,
     CURRENCY_SYMBOLS,
 )
+from app.states.family import FamilyState
+from app.states.settings import SettingsState
+from app.states.history_import import (
+    HistoryImportState,
+)
+from app.components.activity_logging import (
+    BROWSER_TZ_OFFSET,
+)
 from app.components.navbar import page_layout
+from app.export import export_url
 
 
 def manage_page() -> rx.Component:
@@ -35,8 +43,8 @@ def manage_page() -> rx.Component:
                 type="text",
                 id="child_name",
                 name="child_name",
-                default_value=AppState.form_child_name,
-                key=f"child_name_input_{AppState.form_child_name}",
+                default_value=FamilyState.form_child_name,
+                key=f"child_name_input_{FamilyState.form_child_name}",
                 placeholder="e.g., Alex",
                 class_name="mt-1 block w-full pl-3 pr-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm",
                 required=True,
@@ -69,7 +77,7 @@ def manage_page() -> rx.Component:
             type="submit",
             class_name="w-full bg-mint-500 hover:bg-mint-600 text-white font-semibold py-2 px-4 rounded-lg shadow-md transition-colors",
         ),
-        on_submit=AppState.handle_add_child_form_submit,
+        on_submit=FamilyState.handle_add_child_form_submit,
         reset_on_submit=True,
         class_name="p-4 bg-sky-50 rounded-lg shadow space-y-3",
     )
@@ -79,17 +87,17 @@ def manage_page() -> rx.Component:
             class_name="text-xl font-semibold text-navy-700 mb-3",
         ),
         rx.cond(
-            AppState.children.length() > 0,
+            FamilyState.children.length() > 0,
             rx.el.ul(
                 rx.foreach(
-                    AppState.children,
+                    FamilyState.children,
                     lambda child: rx.el.li(
                         rx.el.span(
                             child["name"],
                             class_name="font-medium",
                         ),
                         rx.el.span(
-                            f"({child['avatar_type'].capitalize()}, Balance: {AppState.current_currency_symbol}{child['coin_balance']})"
+                            f"({child['avatar_type'].capitalize()}, Balance: {SettingsState.current_currency_symbol}{child['coin_balance']})"
                         ),
                         class_name="flex justify-between items-center p-2 border-b border-gray-200",
                     ),
@@ -101,6 +109,81 @@ def manage_page() -> rx.Component:
                 class_name="text-gray-500",
             ),
         ),
+        rx.el.p(
+            "Export family history: ",
+            rx.el.a(
+                "CSV",
+                href=export_url("csv"),
+                class_name="text-mint-600 hover:underline font-medium",
+            ),
+            " · ",
+            rx.el.a(
+                "NDJSON",
+                href=export_url("ndjson"),
+                class_name="text-mint-600 hover:underline font-medium",
+            ),
+            class_name="mt-3 text-sm text-gray-600",
+        ),
+        class_name="mb-6",
+    )
+    history_import = rx.el.div(
+        rx.el.h3(
+            "Import History",
+            class_name="text-xl font-semibold text-navy-700 mb-3",
+        ),
+        rx.el.p(
+            "CSV or JSONL rows with child_id, timestamp (ISO or epoch milliseconds) and either activity_id or activity_name, category_name and coins_earned.",
+            class_name="text-sm text-gray-600 mb-3",
+        ),
+        rx.upload(
+            rx.el.button(
+                "Choose File",
+                type="button",
+                class_name="bg-white hover:bg-sky-100 text-navy-700 font-semibold py-2 px-4 rounded-lg shadow transition-colors",
+            ),
+            rx.el.p(
+                rx.selected_files("history_import"),
+                class_name="text-sm text-gray-500 mt-2",
+            ),
+            id="history_import",
+            accept={
+                "text/csv": [".csv"],
+                "application/x-ndjson": [
+                    ".jsonl",
+                    ".ndjson",
+                ],
+            },
+            max_files=1,
+            class_name="p-4 border-2 border-dashed border-sky-200 rounded-lg",
+        ),
+        rx.el.button(
+            "Import",
+            on_click=HistoryImportState.handle_history_import(
+                rx.upload_files(upload_id="history_import")
+            ),
+            disabled=HistoryImportState.importing,
+            class_name="mt-3 bg-mint-500 hover:bg-mint-600 text-white font-semibold py-2 px-4 rounded-lg shadow-md transition-colors disabled:opacity-50",
+        ),
+        rx.cond(
+            HistoryImportState.import_summary != "",
+            rx.el.div(
+                rx.el.p(
+                    HistoryImportState.import_summary,
+                    class_name="font-medium text-navy-700",
+                ),
+                rx.el.ul(
+                    rx.foreach(
+                        HistoryImportState.import_errors,
+                        lambda error: rx.el.li(
+                            f"Line {error['line']}: {error['message']}",
+                            class_name="text-sm text-red-600",
+                        ),
+                    ),
+                ),
+                class_name="mt-3 p-3 bg-sky-50 rounded-lg",
+            ),
+            rx.fragment(),
+        ),
         class_name="mb-6",
     )
     app_settings = rx.el.div(
@@ -122,10 +205,34 @@ def manage_page() -> rx.Component:
                     ),
                 ),
                 id="currency_select",
-                value=AppState.selected_currency,
-                on_change=AppState.change_currency,
+                value=SettingsState.selected_currency,
+                on_change=SettingsState.change_currency,
+                class_name="mt-1 block w-full pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm rounded-md shadow-sm",
+            ),
+            class_name="mb-4 p-4 bg-sky-50 rounded-lg shadow",
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Low-power mode:",
+                htmlFor="low_power_select",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.select(
+                rx.el.option(
+                    "Automatic (slow or reduced-motion devices)",
+                    value="auto",
+                ),
+                rx.el.option("Always on", value="on"),
+                rx.el.option("Off", value="off"),
+                id="low_power_select",
+                value=SettingsState.low_power_mode,
+                on_change=SettingsState.change_low_power_mode,
                 class_name="mt-1 block w-full pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-mint-500 focus:border-mint-500 sm:text-sm rounded-md shadow-sm",
             ),
+            rx.el.p(
+                "Shows still avatars and skips blur, glow and floating effects to save battery.",
+                class_name="mt-1 text-xs text-gray-500",
+            ),
             class_name="mb-4 p-4 bg-sky-50 rounded-lg shadow",
         ),
         rx.el.p(
@@ -164,12 +271,15 @@ def manage_page() -> rx.Component:
         rx.el.div(
             add_child_form,
             children_management,
+            history_import,
             app_settings,
             categories_management,
             activities_management,
             class_name="space-y-8",
         ),
-        on_mount=AppState.load_initial_data,
+        on_mount=FamilyState.load_initial_data(
+            BROWSER_TZ_OFFSET
+        ),
         class_name="max-w-3xl mx-auto",
     )
     return page_layout(content, title="Manage - KindCoins")
\ No newline at end of file
@@ -0,0 +1,788 @@
+import reflex as rx
+from typing import Dict, List, Set, Tuple
+import asyncio
+import datetime
+from app.states.state import (
+    AppState,
+    ACTIVITY_LOG_STEP,
+    Category,
+    Activity,
+    Child,
+    HistoryEntry,
+    Streak,
+)
+from app.states.catalog import CatalogState
+from app.states.family import FamilyState, award_coins
+from app.states.stats import StatsState
+from app import assets
+from app.states import ids, labels, store, streaks
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 64
+
+
+def _deed_key(deed) -> str:
+    """Idempotency key a queued deed came with, or "" if it has none."""
+    if isinstance(deed, dict) and isinstance(
+        deed.get("key"), str
+    ):
+        return deed["key"]
+    return ""
+
+
+def _well_formed(deed) -> bool:
+    """Whether a queued deed has the fields a device sends, as text."""
+    return isinstance(deed, dict) and all(
+        isinstance(deed.get(field), str)
+        for field in ("key", "child_id", "activity_id")
+    )
+
+
+def _replayed_time(
+    deed: dict, now: int
+) -> Tuple[int, int] | None:
+    """(timestamp, tz_offset) a queued deed was logged at, never later
+    than now."""
+    logged_at = deed.get("logged_at")
+    if isinstance(logged_at, str):
+        # Queued before devices sent epoch milliseconds.
+        try:
+            moment = datetime.datetime.fromisoformat(
+                logged_at
+            )
+        except ValueError:
+            return None
+        if moment.tzinfo is None:
+            return None
+        logged_at = streaks.epoch_ms(moment)
+    if (
+        not isinstance(logged_at, int)
+        or isinstance(logged_at, bool)
+        or logged_at < 0
+    ):
+        return None
+    timestamp = min(logged_at, now)
+    tz_offset = deed.get("tz_offset")
+    if tz_offset is None:
+        # Queued before devices sent their offset.
+        return timestamp, streaks.local_offset(timestamp)
+    if not streaks.valid_offset(tz_offset):
+        return None
+    return timestamp, tz_offset
+
+
+# (child_id, activity, category, coins) of a deed about to be written.
+Deed = Tuple[str, Activity, Category, int]
+Stored = Tuple[
+    Dict[str, Child], Dict[str, Streak], List[HistoryEntry]
+]
+
+
+def _store_deeds(
+    deeds: List[Deed],
+    replayed: List[Tuple[str, int, int]] | None = None,
+    tz_offset: int | None = None,
+) -> Tuple[Stored, bool, str | None]:
+    """Write deeds in one go; blocking, so run it in a worker thread.
+
+    Children, streaks, history and rollups are written in a single
+    store.update_children transaction, on top of whatever other
+    sessions stored, and each child is updated once. `replayed` holds
+    the (entry id, timestamp, tz_offset) of each deed when it was
+    logged earlier, on a device that was offline. Live deeds are dated
+    in the browser's `tz_offset`, or the server's if none was sent.
+    Returns what was stored, whether any child grew a stage and the
+    biggest streak milestone reached.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    logged_at = streaks.epoch_ms(now)
+    if not streaks.valid_offset(tz_offset):
+        tz_offset = streaks.local_offset(logged_at)
+    today = streaks.local_day(logged_at, tz_offset)
+    grew = False
+    milestones = set()
+    label_ids = [
+        labels.intern(
+            activity["id"],
+            category["id"],
+            activity["name"],
+            category["name"],
+            category["icon"],
+        )
+        for _, activity, category, _ in deeds
+    ]
+
+    def change(
+        children: Dict[str, Child],
+        child_streaks: Dict[str, Streak],
+    ) -> List[HistoryEntry]:
+        nonlocal grew
+        # Runs again from scratch if a child changed meanwhile.
+        grew = False
+        milestones.clear()
+        entries: List[HistoryEntry] = []
+        for position, (
+            child_id,
+            _,
+            _,
+            coins,
+        ) in enumerate(deeds):
+            entry_id, timestamp, entry_offset = (
+                replayed[position]
+                if replayed
+                else (
+                    ids.new_id(logged_at),
+                    logged_at,
+                    tz_offset,
+                )
+            )
+            streak = child_streaks.setdefault(
+                child_id, streaks.new_streak(child_id)
+            )
+            grew = (
+                award_coins(children[child_id], coins)
+                or grew
+            )
+            milestones.add(
+                streaks.advance(
+                    streak,
+                    streaks.local_day(
+                        timestamp, entry_offset
+                    ),
+                )
+            )
+            entries.append(
+                HistoryEntry(
+                    id=entry_id,
+                    child_id=child_id,
+                    label_id=label_ids[position],
+                    coins_earned=coins,
+                    timestamp=timestamp,
+                    tz_offset=entry_offset,
+                )
+            )
+        for child_id, child in children.items():
+            child["current_streak_status"] = streaks.status(
+                child_streaks[child_id],
+                today,
+                child["current_streak_status"],
+            )
+        return entries
+
+    stored = store.update_children(
+        [deed[0] for deed in deeds], change
+    )
+    for milestone in (
+        streaks.GROWTH_BURST,
+        streaks.METEOR_SHOWER,
+    ):
+        if milestone in milestones:
+            return stored, grew, milestone
+    return stored, grew, None
+
+
+def _resolve_replay(
+    deeds: List[dict], keys: List[str]
+) -> Tuple[
+    List[Deed], List[Tuple[str, int, int]], int, Set[str]
+]:
+    """The queued deeds still to write and when each was logged, how
+    many were rejected for good, and the keys of those to try again.
+
+    Children and the catalog come from the store, not the session, so
+    a replay before the dashboard loaded resolves like any other.
+    """
+    store.init_store()
+    child_ids = {
+        child["id"] for child in store.load_children()
+    }
+    activities = {
+        activity["id"]: activity
+        for activity in store.load_activities()
+    }
+    categories = {
+        category["id"]: category
+        for category in store.load_categories()
+    }
+    now = streaks.epoch_ms(
+        datetime.datetime.now(datetime.timezone.utc)
+    )
+    done = store.existing_history_ids(
+        key for key in keys if key
+    )
+    resolved = []
+    replayed: List[Tuple[str, int, int]] = []
+    rejected = 0
+    waiting: Set[str] = set()
+    for key, deed, logged_at in sorted(
+        (
+            (
+                key,
+                deed,
+                (
+                    _replayed_time(deed, now)
+                    if _well_formed(deed)
+                    else None
+                ),
+            )
+            for key, deed in zip(keys, deeds)
+        ),
+        key=lambda item: item[2] or (0, 0),
+    ):
+        if key in done:
+            continue
+        if (
+            logged_at is None
+            or not key
+            or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH
+        ):
+            # Malformed, or not sent by this app's queue.
+            rejected += 1
+            continue
+        activity = activities.get(deed["activity_id"])
+        category = activity and categories.get(
+            activity["category_id"]
+        )
+        if (
+            deed["child_id"] not in child_ids
+            or not category
+        ):
+            # Stays queued on the device until the store knows them.
+            waiting.add(key)
+            continue
+        done.add(key)
+        # Coins come from the catalog, not from the device.
+        resolved.append(
+            (
+                deed["child_id"],
+                activity,
+                category,
+                activity["coins"],
+            )
+        )
+        replayed.append((key, *logged_at))
+    return resolved, replayed, rejected, waiting
+
+
+class ActivityLogState(AppState):
+    activity_log_step: ACTIVITY_LOG_STEP = "category_select"
+    current_activity_log_bg_class: str = "bg-sky-100"
+    activity_logged_success_message: str = ""
+    custom_activity_name_input: str = ""
+    custom_activity_icon_input: str = "✨"
+    custom_activity_coins_slider_value: int = 5
+    show_coin_burst_lottie_path: str | None = None
+    show_growth_sparkle_lottie_path: str | None = None
+    streak_milestone: str | None = None
+    log_for_all_children: bool = False
+    offline_acked_keys: List[str] = []
+    _selected_log_category_id: str | None = None
+    _selected_log_activity_id: str | None = None
+    _confirmed_activity_details: Activity | None = None
+    _confirmed_category_details: Category | None = None
+    _confirmed_coins_earned: int = 0
+
+    @rx.var
+    async def current_log_category(
+        self,
+    ) -> Category | None:
+        catalog = await self.get_state(CatalogState)
+        return catalog._category_by_id(
+            self._selected_log_category_id
+        )
+
+    @rx.var
+    async def activities_for_log_category(
+        self,
+    ) -> List[Activity]:
+        if not self._selected_log_category_id:
+            return []
+        catalog = await self.get_state(CatalogState)
+        return [
+            act
+            for act in catalog.activities
+            if act["category_id"]
+            == self._selected_log_category_id
+        ]
+
+    def _reset_activity_log_state(self):
+        self.activity_log_step = "category_select"
+        self._selected_log_category_id = None
+        self._selected_log_activity_id = None
+        self.current_activity_log_bg_class = "bg-sky-100"
+        # Unmount the players so the next log plays them from the start.
+        self.show_coin_burst_lottie_path = None
+        self.show_growth_sparkle_lottie_path = None
+
+    async def _return_to_origin(self) -> FamilyState:
+        self._reset_activity_log_state()
+        family = await self.get_state(FamilyState)
+        self.current_view = (
+            "world_view"
+            if family.world_view_open
+            else "dashboard"
+        )
+        return family
+
+    @rx.event
+    async def open_activity_log_overlay(self):
+        family = await self.get_state(FamilyState)
+        child_id_context = (
+            family.active_child_for_world_view_id
+            if family.world_view_open
+            else None
+        ) or family.current_child_id_for_details
+        if not child_id_context and family.children:
+            child_id_context = family.children[0]["id"]
+        if not child_id_context:
+            self.mascot_message = "Please select a child from the dashboard first!"
+            return
+        family._select_child(child_id_context)
+        self._reset_activity_log_state()
+        self.current_view = "activity_log_overlay"
+        self.mascot_message = "Let's log something awesome!"
+
+    @rx.event
+    async def close_activity_log_overlay(self):
+        await self._return_to_origin()
+
+    async def _merge_logged(
+        self, stored: Stored
+    ) -> FamilyState:
+        """Show stored deeds in this session and send them to the
+        family's other sessions."""
+        children, child_streaks, entries = stored
+        family = await self.get_state(FamilyState)
+        for child_id, child in children.items():
+            position = family._child_index.get(child_id)
+            # The lock was let go while writing, so a newer copy from
+            # another session may have arrived meanwhile.
+            if (
+                position is not None
+                and child["version"]
+                >= family.children[position]["version"]
+            ):
+                family.children[position] = child
+            family._streaks[child_id] = child_streaks[
+                child_id
+            ]
+        stats = await self.get_state(StatsState)
+        for entry in entries:
+            family._remember_history_entry(entry)
+            await stats._record(entry)
+        await family._publish(
+            children=list(children.values()),
+            child_streaks=list(child_streaks.values()),
+            history=entries,
+        )
+        return family
+
+    def _celebrate(self, grew: bool):
+        self.show_coin_burst_lottie_path = assets.resolve(
+            "/lottie/coin_burst.json"
+        )
+        self.show_growth_sparkle_lottie_path = (
+            assets.resolve("/lottie/growth_sparkle.json")
+            if grew
+            or self.streak_milestone == streaks.GROWTH_BURST
+            else None
+        )
+
+    async def _resolve_one(
+        self,
+        child_id: str,
+        activity_id: str,
+        coins_override: int | None,
+    ) -> List[Deed] | None:
+        catalog = await self.get_state(CatalogState)
+        family = await self.get_state(FamilyState)
+        activity_details = catalog._activity_by_id(
+            activity_id
+        )
+        category_details = None
+        if activity_details:
+            category_details = catalog._category_by_id(
+                activity_details["category_id"]
+            )
+        if family._child_by_id(child_id) is None:
+            self.activity_logged_success_message = (
+                "Error: Child not found."
+            )
+            return None
+        if not activity_details:
+            self.activity_logged_success_message = (
+                "Error: Activity not found."
+            )
+            return None
+        if not category_details:
+            self.activity_logged_success_message = (
+                "Error: Category not found."
+            )
+            return None
+        self._confirmed_activity_details = activity_details
+        self._confirmed_category_details = category_details
+        coins_earned = (
+            coins_override
+            if coins_override is not None
+            else activity_details["coins"]
+        )
+        self._confirmed_coins_earned = coins_earned
+        return [
+            (
+                child_id,
+                activity_details,
+                category_details,
+                coins_earned,
+            )
+        ]
+
+    async def _finish_one(
+        self,
+        deed: Deed,
+        logged: Tuple[Stored, bool, str | None],
+    ):
+        stored, grew, self.streak_milestone = logged
+        family = await self._merge_logged(stored)
+        self._celebrate(grew)
+        child_id, _, _, coins_earned = deed
+        child = stored[0][child_id]
+        self.activity_logged_success_message = (
+            f"New Leaf! +{coins_earned} Coins 🍃"
+        )
+        self.mascot_message = f"Super! {child['name']} earned {coins_earned} coins!"
+        if self.streak_milestone is not None:
+            self.mascot_message = f"{child['name']} is on a {family._streaks[child_id]['days']}-day streak! Keep shining!"
+
+    async def _resolve_batch(
+        self, deeds: List[Tuple[str, str, int | None]]
+    ) -> List[Deed] | None:
+        catalog = await self.get_state(CatalogState)
+        family = await self.get_state(FamilyState)
+        resolved = []
+        for child_id, activity_id, coins_override in deeds:
+            activity = catalog._activity_by_id(activity_id)
+            category = activity and catalog._category_by_id(
+                activity["category_id"]
+            )
+            if (
+                family._child_by_id(child_id) is None
+                or not category
+            ):
+                self.activity_logged_success_message = f"Error: cannot log {activity_id} for {child_id}; nothing was logged."
+                return None
+            resolved.append(
+                (
+                    child_id,
+                    activity,
+                    category,
+                    (
+                        coins_override
+                        if coins_override is not None
+                        else activity["coins"]
+                    ),
+                )
+            )
+        return resolved
+
+    async def _finish_batch(
+        self,
+        resolved: List[Deed],
+        logged: Tuple[Stored, bool, str | None],
+    ):
+        stored, grew, self.streak_milestone = logged
+        await self._merge_logged(stored)
+        self._celebrate(grew)
+        total_coins = sum(deed[3] for deed in resolved)
+        self.activity_logged_success_message = f"New Leaves! +{total_coins} Coins for {len(resolved)} deeds 🍃"
+        self.mascot_message = (
+            f"Wow! {len(resolved)} kind deeds at once!"
+        )
+
+    @rx.event(background=True)
+    async def perform_activity_logging(
+        self,
+        child_id: str,
+        activity_id: str,
+        coins_override: int | None = None,
+        tz_offset: int | None = None,
+    ):
+        # The state lock is only held to resolve and to merge, so the
+        # session's other events run while the deed is written.
+        async with self:
+            deeds = await self._resolve_one(
+                child_id, activity_id, coins_override
+            )
+            tz_offset = self._client_offset(tz_offset)
+        if not deeds:
+            return
+        logged = await asyncio.to_thread(
+            _store_deeds, deeds, tz_offset=tz_offset
+        )
+        async with self:
+            await self._finish_one(deeds[0], logged)
+
+    @rx.event(background=True)
+    async def perform_batch_activity_logging(
+        self,
+        deeds: List[Tuple[str, str, int | None]],
+        tz_offset: int | None = None,
+    ):
+        """Log (child_id, activity_id, coins_override) deeds all at once.
+
+        Everything is checked before anything is written, so either every
+        deed is logged or none is, in one transaction and one delta.
+        """
+        if not deeds:
+            return
+        async with self:
+            resolved = await self._resolve_batch(deeds)
+            tz_offset = self._client_offset(tz_offset)
+        if not resolved:
+            return
+        logged = await asyncio.to_thread(
+            _store_deeds, resolved, tz_offset=tz_offset
+        )
+        async with self:
+            await self._finish_batch(resolved, logged)
+
+    @rx.event(background=True)
+    async def replay_offline_deeds(self, deeds: List[dict]):
+        """Log deeds a device queued while it was offline, in one batch.
+
+        Each deed carries the idempotency key it was queued under, which
+        becomes its history entry id, so replaying a batch again (say, the
+        ack was lost) never counts a deed twice.
+        """
+        if not deeds:
+            return
+        keys = [_deed_key(deed) for deed in deeds]
+        resolved, replayed, rejected, waiting = (
+            await asyncio.to_thread(
+                _resolve_replay, deeds, keys
+            )
+        )
+        logged = None
+        if resolved:
+            # Streak badges go by the newest deed's own offset.
+            logged = await asyncio.to_thread(
+                _store_deeds,
+                resolved,
+                replayed,
+                replayed[-1][2],
+            )
+        async with self:
+            messages = []
+            if logged:
+                await self._merge_logged(logged[0])
+                messages.append(
+                    f"Welcome back! {len(resolved)} saved deeds were added."
+                )
+            if rejected:
+                messages.append(
+                    f"{rejected} saved deeds could not be added."
+                )
+            if waiting:
+                messages.append(
+                    f"{len(waiting)} saved deeds will be tried again later."
+                )
+            if messages:
+                self.mascot_message = " ".join(messages)
+            # Stored, duplicate and rejected keys are settled; the rest
+            # stay queued for the next replay.
+            self.offline_acked_keys = list(
+                dict.fromkeys(
+                    key
+                    for key in keys
+                    if key and key not in waiting
+                )
+            )
+
+    @rx.event
+    def toggle_log_for_all_children(self):
+        self.log_for_all_children = (
+            not self.log_for_all_children
+        )
+
+    @rx.event
+    async def select_log_category(self, category_id: str):
+        catalog = await self.get_state(CatalogState)
+        selected_cat = catalog._category_by_id(category_id)
+        self._selected_log_category_id = category_id
+        if selected_cat:
+            self.current_activity_log_bg_class = (
+                selected_cat["background_class"]
+            )
+            self.mascot_message = f"Great choice! What kind of {selected_cat['name']} deed?"
+        self.activity_log_step = "activity_select"
+
+    async def _select_activity(
+        self, activity_id: str
+    ) -> List[Deed] | None:
+        """Check the selection and resolve the deeds it logs."""
+        catalog = await self.get_state(CatalogState)
+        family = await self.get_state(FamilyState)
+        child_id = family.current_child_id_for_details
+        current_activity = catalog._activity_by_id(
+            activity_id
+        )
+        if not child_id or not activity_id:
+            self.mascot_message = (
+                "Hmm, child or activity is missing."
+            )
+            self.activity_log_step = "category_select"
+            return None
+        if not current_activity:
+            self.mascot_message = "Oh no, something went wrong selecting the activity."
+            self.activity_log_step = "activity_select"
+            return None
+        self._selected_log_activity_id = activity_id
+        if self.log_for_all_children:
+            deeds = await self._resolve_batch(
+                [
+                    (
+                        child["id"],
+                        activity_id,
+                        current_activity["coins"],
+                    )
+                    for child in family.children
+                ]
+            )
+        else:
+            deeds = await self._resolve_one(
+                child_id,
+                activity_id,
+                current_activity["coins"],
+            )
+        if not deeds:
+            self.mascot_message = (
+                self.activity_logged_success_message
+            )
+            self.activity_log_step = "activity_select"
+        return deeds
+
+    async def _log_selected(
+        self,
+        deeds: List[Deed],
+        batch: bool,
+        tz_offset: int | None,
+    ):
+        logged = await asyncio.to_thread(
+            _store_deeds, deeds, tz_offset=tz_offset
+        )
+        async with self:
+            if batch:
+                await self._finish_batch(deeds, logged)
+            else:
+                await self._finish_one(deeds[0], logged)
+            self.activity_log_step = "confirmation"
+
+    @rx.event(background=True)
+    async def select_log_activity(
+        self, activity_id: str, tz_offset: int | None = None
+    ):
+        """Log the activity; `tz_offset` is the browser's, in minutes."""
+        async with self:
+            deeds = await self._select_activity(activity_id)
+            batch = self.log_for_all_children
+            tz_offset = self._client_offset(tz_offset)
+        if deeds:
+            await self._log_selected(
+                deeds, batch, tz_offset
+            )
+
+    @rx.event
+    def close_activity_panel(self):
+        # The category stays selected so the panel leaves with its list.
+        self.activity_log_step = "category_select"
+        self.current_activity_log_bg_class = "bg-sky-100"
+        self.mascot_message = (
+            "Changed your mind? Pick a category!"
+        )
+
+    @rx.event
+    def add_another_activity(self):
+        self._reset_activity_log_state()
+        self.mascot_message = (
+            "Awesome! Let's log another great deed!"
+        )
+
+    @rx.event
+    async def return_to_origin_view(self):
+        family = await self._return_to_origin()
+        if family.world_view_open:
+            active_child = (
+                family.active_child_for_world_view
+            )
+            if active_child:
+                self.mascot_message = f"Back to {active_child['name']}'s world!"
+            else:
+                self.mascot_message = (
+                    "Back to the world view!"
+                )
+        else:
+            self.mascot_message = (
+                "Great job today! See your world grow!"
+            )
+
+    @rx.event
+    def start_custom_activity_creation(self):
+        if not self._selected_log_category_id:
+            self.mascot_message = "First, pick a category for your new activity!"
+            return rx.toast.error(
+                "Please select a category first."
+            )
+        self.activity_log_step = "custom_create_activity"
+        self.custom_activity_name_input = ""
+        self.custom_activity_icon_input = "💡"
+        self.custom_activity_coins_slider_value = 5
+        self.mascot_message = (
+            "Let's create a brand new activity!"
+        )
+
+    @rx.event(background=True)
+    async def save_custom_activity(
+        self, tz_offset: int | None = None
+    ):
+        async with self:
+            if not self.custom_activity_name_input.strip():
+                return rx.window_alert(
+                    "Activity name cannot be empty."
+                )
+            if not self._selected_log_category_id:
+                self.activity_log_step = "category_select"
+                return rx.window_alert(
+                    "Category not selected."
+                )
+            new_activity = Activity(
+                id=ids.new_id(),
+                name=self.custom_activity_name_input.strip(),
+                category_id=self._selected_log_category_id,
+                icon=self.custom_activity_icon_input
+                or "✨",
+                coins=self.custom_activity_coins_slider_value,
+                parent_configurable=True,
+            )
+            catalog = await self.get_state(CatalogState)
+            catalog._add_activity(new_activity)
+            deeds = await self._select_activity(
+                new_activity["id"]
+            )
+            batch = self.log_for_all_children
+            tz_offset = self._client_offset(tz_offset)
+        if deeds:
+            await self._log_selected(
+                deeds, batch, tz_offset
+            )
+        return rx.toast.success(
+            f"'{new_activity['name']}' added!"
+        )
+
+    @rx.event
+    def cancel_custom_activity_creation(self):
+        self.activity_log_step = (
+            "activity_select"
+            if self._selected_log_category_id
+            else "category_select"
+        )
+        self.mascot_message = (
+            "Okay, let's pick an existing activity then."
+        )
\ No newline at end of file
@@ -0,0 +1,55 @@
+import reflex as rx
+from typing import List, Dict
+from app.states import store
+from app.states.state import (
+    AppState,
+    Category,
+    Activity,
+    index_by_id,
+)
+
+
+class CatalogState(AppState):
+    categories: List[Category] = []
+    activities: List[Activity] = []
+    _category_index: Dict[str, int] = {}
+    _activity_index: Dict[str, int] = {}
+
+    def _category_by_id(
+        self, category_id: str | None
+    ) -> Category | None:
+        position = self._category_index.get(
+            category_id or ""
+        )
+        if position is None:
+            return None
+        return self.categories[position]
+
+    def _activity_by_id(
+        self, activity_id: str | None
+    ) -> Activity | None:
+        position = self._activity_index.get(
+            activity_id or ""
+        )
+        if position is None:
+            return None
+        return self.activities[position]
+
+    def _load_catalog(self):
+        if not self.categories:
+            self.categories = store.load_categories()
+            self._category_index = index_by_id(
+                self.categories
+            )
+        if not self.activities:
+            self.activities = store.load_activities()
+            self._activity_index = index_by_id(
+                self.activities
+            )
+
+    def _add_activity(self, activity: Activity):
+        store.save_activity(activity)
+        self._activity_index[activity["id"]] = len(
+            self.activities
+        )
+        self.activities.append(activity)
\ No newline at end of file
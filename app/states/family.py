@@ -0,0 +1,528 @@
+import reflex as rx
+from typing import List, Dict, Tuple, cast
+import bisect
+from app import assets, broker
+from app.states import ids, labels, store, streaks
+from app.states.state import (
+    AppState,
+    AVATAR_TYPES,
+    Child,
+    FamilyChange,
+    Goal,
+    HistoryEntry,
+    HistoryLabel,
+    Streak,
+    index_by_id,
+)
+from app.states.catalog import CatalogState
+
+HISTORY_PAGE_SIZE = 25
+
+
+def _insert_in_time_order(
+    partition: List[HistoryEntry], entry: HistoryEntry
+) -> bool:
+    """Keep a child's partition oldest-first and capped at one page.
+
+    Returns whether the oldest entry was pushed out of the window.
+    """
+    if (
+        not partition
+        or partition[-1]["timestamp"] <= entry["timestamp"]
+    ):
+        partition.append(entry)
+    else:
+        bisect.insort(
+            partition,
+            entry,
+            key=lambda item: item["timestamp"],
+        )
+    if len(partition) > HISTORY_PAGE_SIZE:
+        del partition[0]
+        return True
+    return False
+
+
+def avatar_srcs(
+    avatar_type: str, growth_stage: int
+) -> Tuple[str, str]:
+    """Image and Lottie URLs for an avatar stage, via the asset manifest."""
+    avatar_type = avatar_type.lower()
+    stage = growth_stage + 1
+    return (
+        assets.resolve(
+            f"/avatars/{avatar_type}/{avatar_type}_stage_{stage}.svg"
+        ),
+        assets.resolve(
+            f"/lottie/avatars/{avatar_type}/stage_{stage}.json"
+        ),
+    )
+
+
+def award_coins(child: Child, coins: int) -> bool:
+    """Add coins to a child dict in place; True if it grew a stage."""
+    child["coin_balance"] += coins
+    child["current_goal_progress_percentage"] = (
+        child["coin_balance"] % 100
+    )
+    new_growth_stage = min(7, child["coin_balance"] // 100)
+    if new_growth_stage <= child["growth_stage"]:
+        return False
+    child["growth_stage"] = new_growth_stage
+    (
+        child["avatar_image_src"],
+        child["avatar_lottie_src"],
+    ) = avatar_srcs(child["avatar_type"], new_growth_stage)
+    return True
+
+
+class FamilyState(AppState):
+    children: List[Child] = []
+    isLoading: bool = True
+    current_child_id_for_details: str | None = None
+    active_child_for_world_view_id: str | None = None
+    world_view_open: bool = False
+    form_child_name: str = ""
+    form_goal_description: str = ""
+    form_goal_target_coins: int = 100
+    form_goal_reward_note: str = ""
+    history_has_older: bool = False
+    history_has_newer: bool = False
+    _child_index: Dict[str, int] = {}
+    _goals: List[Goal] = []
+    _goal_index: Dict[str, int] = {}
+    _history_partitions: Dict[str, List[HistoryEntry]] = {}
+    _streaks: Dict[str, Streak] = {}
+
+    def _child_by_id(
+        self, child_id: str | None
+    ) -> Child | None:
+        position = self._child_index.get(child_id or "")
+        if position is None:
+            return None
+        return self.children[position]
+
+    @rx.var
+    def active_child_for_world_view(self) -> Child | None:
+        return self._child_by_id(
+            self.active_child_for_world_view_id
+        )
+
+    @rx.var
+    def selected_child_for_details(self) -> Child | None:
+        if self.current_child_id_for_details:
+            return self._child_by_id(
+                self.current_child_id_for_details
+            )
+        return self.active_child_for_world_view
+
+    @rx.var
+    def goals_for_selected_child(self) -> List[Goal]:
+        return self._goals
+
+    @rx.var
+    def history_for_selected_child(
+        self,
+    ) -> List[HistoryEntry]:
+        partition = self._history_partitions.get(
+            self.current_child_id_for_details or "", []
+        )
+        return partition[::-1]
+
+    @rx.var
+    def history_labels(self) -> Dict[str, HistoryLabel]:
+        """Labels of the loaded page's rows, by label id as a string.
+
+        Only the page's labels, so each delta with the page carries them
+        and nothing else.
+        """
+        partition = self._history_partitions.get(
+            self.current_child_id_for_details or "", []
+        )
+        return {
+            str(entry["label_id"]): labels.get(
+                entry["label_id"]
+            )
+            for entry in partition
+        }
+
+    def _load_selected_child_data(self):
+        child_id = self.current_child_id_for_details
+        if not child_id:
+            self._goals = []
+            self._goal_index = {}
+            return
+        self._goals = store.load_goals(child_id)
+        self._goal_index = index_by_id(self._goals)
+        self._load_history_window(child_id)
+
+    def _load_history_window(
+        self,
+        child_id: str,
+        older_than: store.HistoryCursor | None = None,
+        newer_than: store.HistoryCursor | None = None,
+    ):
+        # One extra row tells us whether another page exists past the window.
+        page = store.load_history(
+            child_id,
+            HISTORY_PAGE_SIZE + 1,
+            older_than=older_than,
+            newer_than=newer_than,
+        )
+        if newer_than is not None:
+            self.history_has_newer = (
+                len(page) > HISTORY_PAGE_SIZE
+            )
+            self.history_has_older = True
+            page = page[-HISTORY_PAGE_SIZE:]
+        else:
+            self.history_has_newer = older_than is not None
+            self.history_has_older = (
+                len(page) > HISTORY_PAGE_SIZE
+            )
+            page = page[:HISTORY_PAGE_SIZE]
+        self._history_partitions[child_id] = page[::-1]
+
+    def _remember_history_entry(self, entry: HistoryEntry):
+        """Show a stored entry in its child's loaded window, if any."""
+        partition = self._history_partitions.get(
+            entry["child_id"]
+        )
+        is_selected_child = (
+            entry["child_id"]
+            == self.current_child_id_for_details
+        )
+        viewing_older_page = (
+            is_selected_child and self.history_has_newer
+        )
+        if (
+            partition is not None
+            and not viewing_older_page
+            and _insert_in_time_order(partition, entry)
+            and is_selected_child
+        ):
+            self.history_has_older = True
+
+    def _load_streaks(self, children: List[Child]):
+        self._streaks = store.load_streaks()
+        today = self._client_today()
+        for child in children:
+            streak = self._streaks.get(child["id"])
+            if streak is None:
+                # First load since streaks were stored: seed from the ledger.
+                streak = streaks.from_history(
+                    child["id"],
+                    store.iter_history_times(child["id"]),
+                )
+                store.save_streak(streak)
+                self._streaks[child["id"]] = streak
+            child["current_streak_status"] = streaks.status(
+                streak,
+                today,
+                child["current_streak_status"],
+            )
+
+    async def _publish(
+        self,
+        children: List[Child] | None = None,
+        child_streaks: List[Streak] | None = None,
+        goals: List[Goal] | None = None,
+        history: List[HistoryEntry] | None = None,
+        history_changed: List[str] | None = None,
+    ):
+        """Send stored records to the family's other sessions."""
+        await broker.publish(
+            FamilyChange(
+                family_id=broker.DEFAULT_FAMILY_ID,
+                origin=self.router.session.client_token,
+                children=children or [],
+                streaks=child_streaks or [],
+                goals=goals or [],
+                history=history or [],
+                history_changed=history_changed or [],
+            )
+        )
+
+    def _apply_change(self, change: FamilyChange):
+        """Take in records another session of the family stored."""
+        for child in change["children"]:
+            position = self._child_index.get(child["id"])
+            if position is None:
+                self._child_index[child["id"]] = len(
+                    self.children
+                )
+                self.children.append(child.copy())
+            elif (
+                # Changes can arrive out of order; keep the newest.
+                child["version"]
+                >= self.children[position]["version"]
+            ):
+                self.children[position] = child.copy()
+        for streak in change["streaks"]:
+            self._streaks[streak["child_id"]] = (
+                streak.copy()
+            )
+        for goal in change["goals"]:
+            position = self._goal_index.get(goal["id"])
+            if position is not None:
+                self._goals[position] = goal.copy()
+            elif (
+                goal["child_id"]
+                == self.current_child_id_for_details
+            ):
+                self._goal_index[goal["id"]] = len(
+                    self._goals
+                )
+                self._goals.append(goal.copy())
+        for entry in change["history"]:
+            self._remember_history_entry(entry.copy())
+        child_id = self.current_child_id_for_details
+        if child_id in change["history_changed"]:
+            self._load_history_window(child_id)
+
+    def _select_child(self, child_id: str | None):
+        if child_id != self.current_child_id_for_details:
+            self.current_child_id_for_details = child_id
+            self._load_selected_child_data()
+
+    @rx.event
+    def load_older_history(self):
+        child_id = self.current_child_id_for_details
+        partition = self._history_partitions.get(
+            child_id or ""
+        )
+        if not child_id or not partition:
+            return
+        oldest = partition[0]
+        self._load_history_window(
+            child_id,
+            older_than=(oldest["timestamp"], oldest["id"]),
+        )
+
+    @rx.event
+    def load_newer_history(self):
+        child_id = self.current_child_id_for_details
+        partition = self._history_partitions.get(
+            child_id or ""
+        )
+        if not child_id or not partition:
+            return
+        newest = partition[-1]
+        self._load_history_window(
+            child_id,
+            newer_than=(newest["timestamp"], newest["id"]),
+        )
+
+    @rx.event
+    async def load_initial_data(
+        self, tz_offset: int | None = None
+    ):
+        """Load the family; `tz_offset` is the browser's, in minutes."""
+        self.isLoading = True
+        self._client_offset(tz_offset)
+        broker.join(
+            broker.DEFAULT_FAMILY_ID,
+            self.router.session.client_token,
+        )
+        store.init_store()
+        catalog = await self.get_state(CatalogState)
+        catalog._load_catalog()
+        children = store.load_children()
+        for child in children:
+            # Stored URLs may carry hashes from an older asset build.
+            (
+                child["avatar_image_src"],
+                child["avatar_lottie_src"],
+            ) = avatar_srcs(
+                child["avatar_type"], child["growth_stage"]
+            )
+        self._load_streaks(children)
+        self.children = children
+        self._child_index = index_by_id(self.children)
+        if (
+            not self.current_child_id_for_details
+            and self.children
+        ):
+            self.current_child_id_for_details = (
+                self.children[0]["id"]
+            )
+        self._load_selected_child_data()
+        self.mascot_message = (
+            "Welcome back! Ready to earn some coins?"
+        )
+        self.isLoading = False
+        yield FamilyState.update_time_of_day
+
+    @rx.event
+    def open_world_view(self, child_id: str):
+        self.active_child_for_world_view_id = child_id
+        self.world_view_open = True
+        self.current_view = "world_view"
+
+    @rx.event
+    def close_world_view(self):
+        # The child stays set so the world fades out with its content.
+        self.world_view_open = False
+        self.current_view = "dashboard"
+
+    @rx.event
+    async def add_child(
+        self, name: str, avatar_type: AVATAR_TYPES
+    ):
+        if not name.strip():
+            yield rx.window_alert(
+                "Child name cannot be empty."
+            )
+            return
+        new_id = ids.new_id()
+        image_src, lottie_src = avatar_srcs(avatar_type, 0)
+        new_child = Child(
+            id=new_id,
+            name=name.strip(),
+            avatar_image_src=image_src,
+            avatar_lottie_src=lottie_src,
+            avatar_type=avatar_type,
+            growth_stage=0,
+            coin_balance=0,
+            current_streak_status="New Beginning! ✨",
+            current_goal_progress_percentage=0,
+            version=0,
+        )
+        store.save_child(new_child)
+        self._child_index[new_id] = len(self.children)
+        self.children.append(new_child)
+        if not self.current_child_id_for_details:
+            self._select_child(new_id)
+        await self._publish(children=[new_child])
+        self.form_child_name = ""
+        self.mascot_message = (
+            f"Yay! {name} has joined KindCoins!"
+        )
+        yield rx.toast.success(f"{name} added!")
+
+    @rx.event
+    def handle_add_child_form_submit(self, form_data: dict):
+        name = form_data.get("child_name", "").strip()
+        avatar_type_str = form_data.get(
+            "avatar_type", "tree"
+        )
+        avatar_type: AVATAR_TYPES = (
+            cast(AVATAR_TYPES, avatar_type_str)
+            if avatar_type_str
+            in list(AVATAR_TYPES.__args__)
+            else "tree"
+        )
+        yield FamilyState.add_child(
+            name, avatar_type=avatar_type
+        )
+
+    @rx.event
+    async def handle_add_goal_form_submit(
+        self, form_data: dict
+    ):
+        child_id = self.current_child_id_for_details
+        if not child_id:
+            yield rx.window_alert(
+                "A child must be selected."
+            )
+            return
+        description = form_data.get("goal_desc", "").strip()
+        reward_note_str = form_data.get("reward_note", "")
+        target_coins_str = form_data.get("goal_coins")
+        if not target_coins_str:
+            yield rx.window_alert(
+                "Target coins value is required."
+            )
+            return
+        try:
+            target_coins = int(target_coins_str)
+        except ValueError:
+            yield rx.window_alert(
+                "Invalid target coin value."
+            )
+            return
+        if not description or target_coins <= 0:
+            yield rx.window_alert(
+                "Goal description and positive target coins required."
+            )
+            return
+        new_goal = Goal(
+            id=ids.new_id(),
+            child_id=child_id,
+            description=description,
+            target_coins=target_coins,
+            is_achieved=False,
+            real_world_reward_note=(
+                reward_note_str.strip()
+                if reward_note_str
+                and reward_note_str.strip()
+                else None
+            ),
+        )
+        store.save_goal(new_goal)
+        self._goal_index[new_goal["id"]] = len(self._goals)
+        self._goals.append(new_goal)
+        await self._publish(goals=[new_goal])
+        self.form_goal_description = ""
+        self.form_goal_target_coins = 100
+        self.form_goal_reward_note = ""
+        selected_child = self.selected_child_for_details
+        selected_child_name = (
+            selected_child["name"]
+            if selected_child
+            else "The child"
+        )
+        self.mascot_message = f"A new goal for {selected_child_name}! Exciting!"
+        yield rx.toast.info(
+            f"New goal added for {selected_child_name}!"
+        )
+
+    @rx.event
+    async def complete_goal(self, goal_id: str):
+        goal_idx = self._goal_index.get(goal_id)
+        if goal_idx is not None:
+            if not self._goals[goal_idx][
+                "is_achieved"
+            ] and store.complete_goal(goal_id):
+                updated_goal = self._goals[goal_idx].copy()
+                updated_goal["is_achieved"] = True
+                self._goals[goal_idx] = updated_goal
+                await self._publish(goals=[updated_goal])
+                child_for_goal = self._child_by_id(
+                    updated_goal["child_id"]
+                )
+                child_name = (
+                    child_for_goal["name"]
+                    if child_for_goal
+                    else "Someone"
+                )
+                self.mascot_message = f"Hooray! {child_name} achieved goal: '{updated_goal['description']}'!"
+                yield rx.toast.success(
+                    f"Goal '{updated_goal['description']}' completed!"
+                )
+            else:
+                # Possibly completed from another device just now.
+                self._goals[goal_idx] = {
+                    **self._goals[goal_idx],
+                    "is_achieved": True,
+                }
+                yield rx.toast.info(
+                    f"Goal '{self._goals[goal_idx]['description']}' was already complete."
+                )
+        else:
+            yield rx.window_alert("Goal not found.")
+
+    @rx.event
+    def set_current_child_id_for_details(
+        self, child_id: str | None
+    ):
+        self.current_child_id_for_details = child_id
+        self._load_selected_child_data()
+        selected_child = self.selected_child_for_details
+        if child_id and selected_child:
+            self.mascot_message = f"Viewing details for {selected_child['name']}."
+        elif not child_id:
+            self.mascot_message = (
+                "Select a child to see more."
+            )
+        yield
\ No newline at end of file
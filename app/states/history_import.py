@@ -0,0 +1,462 @@
+import reflex as rx
+import asyncio
+import csv
+import datetime
+import io
+import itertools
+import json
+from typing import Dict, Iterator, List, Set, Tuple
+from app.states import ids, labels, store, streaks
+from app.states.state import (
+    AppState,
+    Activity,
+    Category,
+    Child,
+    HistoryEntry,
+    ImportRowError,
+    Streak,
+)
+from app.states.family import FamilyState, award_coins
+from app.states.stats import StatsState
+
+IMPORT_BATCH_SIZE = 1_000
+MAX_REPORTED_ERRORS = 50
+# Epoch milliseconds outside this range are typos, not history.
+LATEST_TIMESTAMP = streaks.epoch_ms(
+    datetime.datetime(
+        3000, 1, 1, tzinfo=datetime.timezone.utc
+    )
+)
+
+
+def parse_rows(
+    filename: str, text: str
+) -> Iterator[Tuple[int, dict | str]]:
+    """Yield (line, row) pairs, or (line, message) for unreadable lines."""
+    if filename.lower().endswith(".csv"):
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, raw in enumerate(text.splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except json.JSONDecodeError as error:
+            yield line, f"invalid JSON: {error.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line, "expected a JSON object"
+            continue
+        yield line, row
+
+
+def _text(row: dict, field: str) -> str:
+    value = row.get(field)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be text")
+    return value
+
+
+def _whole_number(value, field: str) -> int:
+    """An int from JSON or a CSV cell; bools and fractions are refused."""
+    if isinstance(value, bool) or not isinstance(
+        value, (int, str)
+    ):
+        raise ValueError(f"{field} must be a whole number")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"{field} must be a whole number"
+        ) from None
+
+
+def _entry_time(row: dict) -> Tuple[int, int]:
+    """(timestamp, tz_offset) of a row, from epoch milliseconds as the
+    export writes them or from an ISO timestamp."""
+    value = row.get("timestamp")
+    if value in (None, ""):
+        raise ValueError("timestamp is required")
+    if isinstance(value, str) and not value.isdigit():
+        moment = datetime.datetime.fromisoformat(value)
+        if moment.tzinfo is None:
+            # Naive timestamps are taken as server local time.
+            moment = moment.astimezone()
+        timestamp = streaks.epoch_ms(moment)
+        tz_offset = (
+            int(moment.utcoffset().total_seconds()) // 60
+        )
+    else:
+        timestamp = _whole_number(value, "timestamp")
+        tz_offset = row.get("tz_offset")
+        tz_offset = (
+            None
+            if tz_offset in (None, "")
+            else _whole_number(tz_offset, "tz_offset")
+        )
+    if not 0 <= timestamp < LATEST_TIMESTAMP:
+        raise ValueError("timestamp is out of range")
+    if tz_offset is None:
+        tz_offset = streaks.local_offset(timestamp)
+    if abs(tz_offset) > streaks.MAX_TZ_OFFSET:
+        raise ValueError("tz_offset is out of range")
+    return timestamp, tz_offset
+
+
+class _Catalog:
+    """Lookups every row is checked against, built once per import."""
+
+    def __init__(
+        self,
+        children: List[Child],
+        categories: List[Category],
+        activities: List[Activity],
+    ):
+        self.child_ids = {child["id"] for child in children}
+        self.categories = {
+            category["id"]: category
+            for category in categories
+        }
+        self.categories_by_name = {
+            category["name"]: category
+            for category in categories
+        }
+        self.activities = {
+            activity["id"]: activity
+            for activity in activities
+        }
+
+    def validate(self, row: dict) -> HistoryEntry:
+        """Build an entry from a row or raise ValueError saying why not."""
+        child_id = _text(row, "child_id")
+        if child_id not in self.child_ids:
+            raise ValueError(
+                f"unknown child_id {child_id!r}"
+            )
+        activity = None
+        activity_id = _text(row, "activity_id")
+        if activity_id:
+            activity = self.activities.get(activity_id)
+            if activity is None:
+                raise ValueError(
+                    f"unknown activity_id {activity_id!r}"
+                )
+        category_key = (
+            activity["category_id"]
+            if activity
+            else _text(row, "category_id")
+        )
+        category = self.categories.get(
+            category_key
+        ) or self.categories_by_name.get(
+            _text(row, "category_name")
+        )
+        if category is None:
+            raise ValueError(
+                "a known category_id or category_name is required"
+            )
+        activity_name = (
+            _text(row, "activity_name")
+            or (activity and activity["name"])
+            or ""
+        ).strip()
+        if not activity_name:
+            raise ValueError(
+                "activity_name or activity_id is required"
+            )
+        coins = row.get("coins_earned")
+        if coins in (None, ""):
+            if activity is None:
+                raise ValueError("coins_earned is required")
+            coins = activity["coins"]
+        coins = _whole_number(coins, "coins_earned")
+        if coins < 0:
+            raise ValueError(
+                "coins_earned must not be negative"
+            )
+        timestamp, tz_offset = _entry_time(row)
+        return HistoryEntry(
+            id=_text(row, "id") or ids.new_id(timestamp),
+            child_id=child_id,
+            # Free-form names have no catalog activity to point at.
+            label_id=labels.intern(
+                activity["id"] if activity else "",
+                category["id"],
+                activity_name,
+                category["name"],
+                category["icon"],
+            ),
+            coins_earned=coins,
+            timestamp=timestamp,
+            tz_offset=tz_offset,
+        )
+
+
+def _batches(
+    rows: Iterator[Tuple[int, dict | str]],
+) -> Iterator[List[Tuple[int, dict | str]]]:
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) == IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _store_batch(entries: List[HistoryEntry]):
+    """Write a batch's rows, rollups and coins in one transaction."""
+    coins_by_child: Dict[str, int] = {}
+    for entry in entries:
+        coins_by_child[entry["child_id"]] = (
+            coins_by_child.get(entry["child_id"], 0)
+            + entry["coins_earned"]
+        )
+
+    def change(
+        children: Dict[str, Child],
+        child_streaks: Dict[str, Streak],
+    ) -> List[HistoryEntry]:
+        for child_id, coins in coins_by_child.items():
+            award_coins(children[child_id], coins)
+        return entries
+
+    store.update_children(coins_by_child, change)
+
+
+def _reseed_streaks(
+    child_ids: List[str],
+) -> Tuple[Dict[str, Child], Dict[str, Streak]]:
+    """Rebuild streaks from the ledger; imported rows may be backdated."""
+
+    def change(
+        children: Dict[str, Child],
+        child_streaks: Dict[str, Streak],
+    ) -> List[HistoryEntry]:
+        for child_id, child in children.items():
+            times = store.iter_history_times(child_id)
+            newest = next(times, None)
+            streak = streaks.from_history(
+                child_id,
+                itertools.chain(
+                    [newest] if newest else [], times
+                ),
+            )
+            # Today in the zone the child's newest deed was logged in.
+            today = streaks.local_today(
+                newest[1] if newest else None
+            )
+            if child_id in child_streaks:
+                streak["best"] = max(
+                    streak["best"],
+                    child_streaks[child_id]["best"],
+                )
+            child_streaks[child_id] = streak
+            child["current_streak_status"] = streaks.status(
+                streak,
+                today,
+                child["current_streak_status"],
+            )
+        return []
+
+    children, child_streaks, _ = store.update_children(
+        child_ids, change
+    )
+    return children, child_streaks
+
+
+def _row_error(
+    line: int, error: Exception
+) -> ImportRowError:
+    if isinstance(error, ValueError):
+        return ImportRowError(line=line, message=str(error))
+    return ImportRowError(
+        line=line,
+        message=f"could not read row ({type(error).__name__})",
+    )
+
+
+class HistoryImport:
+    """One file's import, validated and stored a batch per step.
+
+    Bad rows are reported and skipped; the rest of their batch is still
+    written, together with its coins, so ledger and balances never
+    disagree. Blocking, so run step and finish in a worker thread.
+    """
+
+    def __init__(self, filename: str, text: str):
+        self.imported: List[HistoryEntry] = []
+        self.errors: List[ImportRowError] = []
+        self._batches = _batches(parse_rows(filename, text))
+        self._catalog: _Catalog | None = None
+        self._touched: Dict[str, None] = {}
+        self._seen_ids: Set[str] = set()
+
+    def step(self) -> bool:
+        """Import the next batch; False once every row was read."""
+        if self._catalog is None:
+            self._catalog = _Catalog(
+                store.load_children(),
+                store.load_categories(),
+                store.load_activities(),
+            )
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        valid: List[Tuple[int, HistoryEntry]] = []
+        for line, row in batch:
+            if isinstance(row, str):
+                self.errors.append(
+                    ImportRowError(line=line, message=row)
+                )
+                continue
+            try:
+                entry = self._catalog.validate(row)
+            except Exception as error:
+                self.errors.append(_row_error(line, error))
+                continue
+            if entry["id"] in self._seen_ids:
+                self.errors.append(
+                    ImportRowError(
+                        line=line,
+                        message=f"duplicate id {entry['id']!r}",
+                    )
+                )
+                continue
+            self._seen_ids.add(entry["id"])
+            valid.append((line, entry))
+        stored_ids = store.existing_history_ids(
+            entry["id"] for _, entry in valid
+        )
+        entries = []
+        for line, entry in valid:
+            if entry["id"] in stored_ids:
+                self.errors.append(
+                    ImportRowError(
+                        line=line,
+                        message=f"id {entry['id']!r} is already in the history",
+                    )
+                )
+                continue
+            entries.append(entry)
+            self._touched[entry["child_id"]] = None
+        if entries:
+            _store_batch(entries)
+        self.imported.extend(entries)
+        return True
+
+    def finish(
+        self,
+    ) -> Tuple[Dict[str, Child], Dict[str, Streak]]:
+        """Reseed the streaks of the children rows were stored for, also
+        after a failed step; returns them as stored."""
+        self.errors.sort(key=lambda error: error["line"])
+        if not self._touched:
+            return {}, {}
+        return _reseed_streaks(list(self._touched))
+
+
+class HistoryImportState(AppState):
+    import_summary: str = ""
+    import_errors: List[ImportRowError] = []
+    importing: bool = False
+    # The uploaded (filename, text) until the background import takes it.
+    _pending_import: Tuple[str, str] | None = None
+
+    @rx.event
+    async def handle_history_import(
+        self, files: list[rx.UploadFile]
+    ):
+        # Upload handlers cannot run in the background, so this one only
+        # reads the file and hands it to run_history_import.
+        if self.importing:
+            return rx.window_alert(
+                "An import is already running."
+            )
+        if not files:
+            return rx.window_alert(
+                "Choose a CSV or JSONL file first."
+            )
+        upload = files[0]
+        try:
+            text = (await upload.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            return rx.window_alert(
+                "The file must be UTF-8 text."
+            )
+        self._pending_import = (upload.filename or "", text)
+        self.importing = True
+        self.import_summary = "Importing..."
+        self.import_errors = []
+        return HistoryImportState.run_history_import
+
+    @rx.event(background=True)
+    async def run_history_import(self):
+        """Import the uploaded file off the event loop, a batch at a
+        time, taking the state lock only to report progress.
+        """
+        async with self:
+            pending = self._pending_import
+            self._pending_import = None
+        if pending is None:
+            return
+        history_import = HistoryImport(*pending)
+        try:
+            while await asyncio.to_thread(
+                history_import.step
+            ):
+                async with self:
+                    self.import_summary = f"Importing... {len(history_import.imported)} entries so far."
+        except Exception:
+            async with self:
+                self.importing = False
+                self.import_summary = f"The import stopped after {len(history_import.imported)} entries."
+            raise
+        finally:
+            children, child_streaks = (
+                await asyncio.to_thread(
+                    history_import.finish
+                )
+            )
+        imported = history_import.imported
+        errors = history_import.errors
+        async with self:
+            self.importing = False
+            family = await self.get_state(FamilyState)
+            for child_id, child in children.items():
+                position = family._child_index.get(child_id)
+                family._streaks[child_id] = child_streaks[
+                    child_id
+                ]
+                # Other sessions may have stored a newer copy meanwhile.
+                if (
+                    position is not None
+                    and child["version"]
+                    >= family.children[position]["version"]
+                ):
+                    family.children[position] = child
+            if (
+                family.current_child_id_for_details
+                in children
+            ):
+                family._load_history_window(
+                    family.current_child_id_for_details
+                )
+            self.import_summary = f"Imported {len(imported)} entries, skipped {len(errors)}."
+            self.import_errors = errors[
+                :MAX_REPORTED_ERRORS
+            ]
+            if children:
+                await family._publish(
+                    children=list(children.values()),
+                    child_streaks=list(
+                        child_streaks.values()
+                    ),
+                    history_changed=list(children),
+                )
+        return StatsState.load_stats
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Compact, time-sortable ids (ULIDs) for everything the app creates."""
+
+import os
+import threading
+import time
+
+# Crockford's base32: no I, L, O or U, so ids read back unambiguously.
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        chars.append(_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+def new_id(timestamp: int | None = None) -> str:
+    """A ULID for `timestamp` (epoch ms, default now); sorts by time.
+
+    Ids made within one millisecond count up, so they sort in order too.
+    """
+    global _last_ms, _last_random
+    ms = (
+        time.time_ns() // 1_000_000
+        if timestamp is None
+        else timestamp
+    )
+    with _lock:
+        if ms == _last_ms:
+            _last_random = (_last_random + 1) % (
+                1 << _RANDOM_BITS
+            )
+        else:
+            _last_ms = ms
+            _last_random = int.from_bytes(
+                os.urandom(_RANDOM_BITS // 8), "big"
+            )
+        random = _last_random
+    return _encode(ms, 10) + _encode(random, 16)
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Interned labels that history rows point at instead of copying names.
+
+A label is one activity as the catalog showed it when a deed was logged:
+its catalog ids plus the activity name, category name and icon of that
+version. Rows keep only the label's integer id, so renaming an activity
+adds a new label and older history keeps its old names. Labels never
+change once written, so every process caches the ones it has seen.
+"""
+
+import threading
+from typing import Dict, Tuple
+import reflex as rx
+import sqlalchemy
+import sqlmodel
+from app.states.models import HistoryLabelRow
+from app.states.types import HistoryLabel
+
+FIELDS = (
+    "activity_id",
+    "category_id",
+    "activity_name",
+    "category_name",
+    "category_icon",
+)
+LabelKey = Tuple[str, str, str, str, str]
+_by_id: Dict[int, HistoryLabel] = {}
+_by_key: Dict[LabelKey, int] = {}
+_lock = threading.Lock()
+
+
+def _remember(label: HistoryLabel) -> int:
+    with _lock:
+        _by_id[label["id"]] = label
+        _by_key[tuple(label[field] for field in FIELDS)] = (
+            label["id"]
+        )
+    return label["id"]
+
+
+def forget() -> None:
+    """Drop the cache, e.g. after the table was rewritten directly."""
+    with _lock:
+        _by_id.clear()
+        _by_key.clear()
+
+
+def get(label_id: int) -> HistoryLabel:
+    label = _by_id.get(label_id)
+    if label is None:
+        with rx.session() as session:
+            row = session.get(HistoryLabelRow, label_id)
+            if row is None:
+                raise KeyError(
+                    f"No history label {label_id}"
+                )
+            label = HistoryLabel(**row.dict())
+        _remember(label)
+    return label
+
+
+def _find(session, key: LabelKey) -> HistoryLabelRow | None:
+    return session.exec(
+        sqlmodel.select(HistoryLabelRow).where(
+            *(
+                getattr(HistoryLabelRow, field) == value
+                for field, value in zip(FIELDS, key)
+            )
+        )
+    ).first()
+
+
+def intern(
+    activity_id: str,
+    category_id: str,
+    activity_name: str,
+    category_name: str,
+    category_icon: str,
+) -> int:
+    """Id of the label with these values, adding it on first use.
+
+    `activity_id` is empty for imported rows that only carry names.
+    """
+    key = (
+        activity_id,
+        category_id,
+        activity_name,
+        category_name,
+        category_icon,
+    )
+    label_id = _by_key.get(key)
+    if label_id is not None:
+        return label_id
+    with rx.session() as session:
+        row = _find(session, key)
+        if row is None:
+            try:
+                row = HistoryLabelRow(
+                    **dict(zip(FIELDS, key))
+                )
+                session.add(row)
+                session.commit()
+                session.refresh(row)
+            except sqlalchemy.exc.IntegrityError:
+                # Another worker added the same label first.
+                session.rollback()
+                row = _find(session, key)
+        label = HistoryLabel(**row.dict())
+    return _remember(label)
\ No newline at end of file
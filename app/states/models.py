@@ -0,0 +1,122 @@
+import reflex as rx
+import sqlalchemy
+import sqlmodel
+
+
+class ChildRow(rx.Model, table=True):
+    __tablename__ = "child"
+
+    id: str = sqlmodel.Field(primary_key=True)
+    name: str
+    avatar_image_src: str
+    avatar_lottie_src: str
+    avatar_type: str
+    growth_stage: int = 0
+    coin_balance: int = 0
+    current_streak_status: str = ""
+    current_goal_progress_percentage: int = 0
+    # Bumped on every write; see store.update_children.
+    version: int = sqlmodel.Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )
+
+
+class CategoryRow(rx.Model, table=True):
+    __tablename__ = "category"
+
+    id: str = sqlmodel.Field(primary_key=True)
+    name: str
+    icon: str
+    background_class: str
+
+
+class ActivityRow(rx.Model, table=True):
+    __tablename__ = "activity"
+
+    id: str = sqlmodel.Field(primary_key=True)
+    name: str
+    category_id: str = sqlmodel.Field(index=True)
+    icon: str
+    coins: int
+    parent_configurable: bool = True
+
+
+class GoalRow(rx.Model, table=True):
+    __tablename__ = "goal"
+
+    id: str = sqlmodel.Field(primary_key=True)
+    child_id: str = sqlmodel.Field(index=True)
+    description: str
+    target_coins: int
+    is_achieved: bool = False
+    real_world_reward_note: str | None = None
+
+
+class HistoryEntryRow(rx.Model, table=True):
+    __tablename__ = "history_entry"
+    __table_args__ = (
+        sqlalchemy.Index(
+            "ix_history_entry_child_id_timestamp",
+            "child_id",
+            "timestamp",
+        ),
+    )
+
+    id: str = sqlmodel.Field(primary_key=True)
+    child_id: str
+    label_id: int
+    coins_earned: int
+    timestamp: int = sqlmodel.Field(
+        sa_type=sqlalchemy.BigInteger
+    )
+    tz_offset: int = sqlmodel.Field(
+        default=0, sa_column_kwargs={"server_default": "0"}
+    )
+
+
+class HistoryLabelRow(rx.Model, table=True):
+    __tablename__ = "history_label"
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint(
+            "activity_id",
+            "category_id",
+            "activity_name",
+            "category_name",
+            "category_icon",
+            name="uq_history_label",
+        ),
+    )
+
+    id: int | None = sqlmodel.Field(
+        default=None, primary_key=True
+    )
+    activity_id: str = ""
+    category_id: str = ""
+    activity_name: str
+    category_name: str
+    category_icon: str
+
+
+class StreakRow(rx.Model, table=True):
+    __tablename__ = "streak"
+
+    child_id: str = sqlmodel.Field(primary_key=True)
+    days: int = 0
+    last_day: str | None = None
+    best: int = 0
+
+
+class RollupRow(rx.Model, table=True):
+    __tablename__ = "rollup"
+    __table_args__ = (
+        sqlalchemy.Index(
+            "ix_rollup_period_bucket", "period", "bucket"
+        ),
+    )
+
+    child_id: str = sqlmodel.Field(primary_key=True)
+    period: str = sqlmodel.Field(primary_key=True)
+    bucket: str = sqlmodel.Field(primary_key=True)
+    category_name: str = sqlmodel.Field(primary_key=True)
+    coins: int = 0
+    entries: int = 0
\ No newline at end of file
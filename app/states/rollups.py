@@ -0,0 +1,69 @@
+"""Coin totals per child, category and local day or week.
+
+Every history entry adds to exactly one day bucket and one week bucket, so
+the totals are kept up to date as entries are written and read back in
+time proportional to the number of buckets, never the number of entries.
+"""
+
+import datetime
+from typing import Dict, Iterable, List, Tuple
+from app.states import labels
+from app.states.streaks import local_day
+from app.states.types import (
+    HistoryEntry,
+    Rollup,
+    ROLLUP_PERIODS,
+)
+
+RollupKey = Tuple[str, ROLLUP_PERIODS, str, str]
+
+
+def week_start(day: datetime.date) -> datetime.date:
+    """Monday of the week containing `day`."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def bucket_start(
+    period: ROLLUP_PERIODS, day: datetime.date
+) -> datetime.date:
+    return week_start(day) if period == "week" else day
+
+
+def keys_for(entry: HistoryEntry) -> List[RollupKey]:
+    """The day and week buckets an entry counts towards."""
+    day = local_day(entry["timestamp"], entry["tz_offset"])
+    category_name = labels.get(entry["label_id"])[
+        "category_name"
+    ]
+    return [
+        (
+            entry["child_id"],
+            period,
+            bucket_start(period, day).isoformat(),
+            category_name,
+        )
+        for period in ("day", "week")
+    ]
+
+
+def aggregate(
+    entries: Iterable[HistoryEntry],
+) -> Dict[RollupKey, Rollup]:
+    """Fold entries into rollups in memory, one pass."""
+    totals: Dict[RollupKey, Rollup] = {}
+    for entry in entries:
+        for key in keys_for(entry):
+            rollup = totals.get(key)
+            if rollup is None:
+                child_id, period, bucket, category = key
+                rollup = totals[key] = Rollup(
+                    child_id=child_id,
+                    category_name=category,
+                    period=period,
+                    bucket=bucket,
+                    coins=0,
+                    entries=0,
+                )
+            rollup["coins"] += entry["coins_earned"]
+            rollup["entries"] += 1
+    return totals
\ No newline at end of file
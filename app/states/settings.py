@@ -0,0 +1,51 @@
+import reflex as rx
+from app.states.state import (
+    AppState,
+    CURRENCY_SYMBOLS,
+    LOW_POWER_MODES,
+)
+
+# Below this, "auto" treats the device as too slow for the full effects.
+MIN_SMOOTH_FPS = 40
+
+
+class SettingsState(AppState):
+    selected_currency: str = "USD"
+    low_power_mode: str = rx.LocalStorage(
+        "auto", name="kindcoins_low_power_mode"
+    )
+    reduced_motion: bool = False
+    slow_frames: bool = False
+
+    @rx.var
+    def current_currency_symbol(self) -> str:
+        return CURRENCY_SYMBOLS.get(
+            self.selected_currency, "$"
+        )
+
+    @rx.var
+    def low_power(self) -> bool:
+        if self.low_power_mode == "auto":
+            return self.reduced_motion or self.slow_frames
+        return self.low_power_mode == "on"
+
+    @rx.event
+    def change_currency(self, new_currency: str):
+        if new_currency in CURRENCY_SYMBOLS:
+            self.selected_currency = new_currency
+            self.mascot_message = f"Currency changed to {new_currency} ({self.current_currency_symbol})!"
+        yield
+
+    @rx.event
+    def change_low_power_mode(self, mode: str):
+        if mode in LOW_POWER_MODES.__args__:
+            self.low_power_mode = mode
+
+    @rx.event
+    def report_device(
+        self, reduced_motion: bool, fps: float
+    ):
+        """Detection results from the browser; fps is 0 if not measured."""
+        self.reduced_motion = reduced_motion
+        if fps:
+            self.slow_frames = fps < MIN_SMOOTH_FPS
\ No newline at end of file
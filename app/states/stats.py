@@ -0,0 +1,151 @@
+import reflex as rx
+import datetime
+from typing import Dict, List
+from app.states import rollups, store
+from app.states.state import (
+    AppState,
+    CATEGORY_TYPES,
+    HistoryEntry,
+)
+from app.states.family import FamilyState
+
+STATS_DAYS = 14
+CHART_CATEGORIES: List[str] = list(CATEGORY_TYPES.__args__)
+ChartRow = Dict[str, str | int]
+
+
+def _chart_row(
+    label: str, coins_by_category: Dict[str, int]
+) -> ChartRow:
+    row: ChartRow = {"name": label}
+    for category in CHART_CATEGORIES:
+        row[category] = coins_by_category.get(category, 0)
+    return row
+
+
+class StatsState(AppState):
+    """Charts over the rollup tables.
+
+    Loading reads one bucket per child, category and day or week; each
+    logged entry is then added to the buckets already in memory.
+    """
+
+    family_week_chart: List[ChartRow] = []
+    family_week_total: int = 0
+    child_days_chart: List[ChartRow] = []
+    child_days_total: int = 0
+    _week: str = ""
+    _days_since: str = ""
+    _stats_child_id: str | None = None
+    _family_week: Dict[str, Dict[str, int]] = {}
+    _child_days: Dict[str, Dict[str, int]] = {}
+
+    async def _refresh_family_chart(self):
+        family = await self.get_state(FamilyState)
+        self.family_week_chart = [
+            _chart_row(
+                child["name"],
+                self._family_week.get(child["id"], {}),
+            )
+            for child in family.children
+        ]
+        self.family_week_total = sum(
+            sum(coins.values())
+            for coins in self._family_week.values()
+        )
+
+    def _refresh_child_chart(self):
+        first_day = datetime.date.fromisoformat(
+            self._days_since
+        )
+        self.child_days_chart = [
+            _chart_row(
+                day.strftime("%a %d"),
+                self._child_days.get(day.isoformat(), {}),
+            )
+            for day in (
+                first_day + datetime.timedelta(days=offset)
+                for offset in range(STATS_DAYS)
+            )
+        ]
+        self.child_days_total = sum(
+            sum(coins.values())
+            for coins in self._child_days.values()
+        )
+
+    def _load_child_days(self, child_id: str | None):
+        self._stats_child_id = child_id
+        self._child_days = {}
+        if child_id:
+            for rollup in store.load_rollups(
+                "day", self._days_since, child_id=child_id
+            ):
+                self._child_days.setdefault(
+                    rollup["bucket"], {}
+                )[rollup["category_name"]] = rollup["coins"]
+        self._refresh_child_chart()
+
+    async def _record(self, entry: HistoryEntry):
+        """Add a just-written entry to the loaded buckets it falls in."""
+        if not self._week:
+            return
+        for (
+            child_id,
+            period,
+            bucket,
+            category,
+        ) in rollups.keys_for(entry):
+            if period == "week" and bucket == self._week:
+                coins = self._family_week.setdefault(
+                    child_id, {}
+                )
+                coins[category] = (
+                    coins.get(category, 0)
+                    + entry["coins_earned"]
+                )
+                await self._refresh_family_chart()
+            elif (
+                period == "day"
+                and child_id == self._stats_child_id
+                and bucket >= self._days_since
+            ):
+                coins = self._child_days.setdefault(
+                    bucket, {}
+                )
+                coins[category] = (
+                    coins.get(category, 0)
+                    + entry["coins_earned"]
+                )
+                self._refresh_child_chart()
+
+    @rx.event
+    async def load_stats(
+        self, tz_offset: int | None = None
+    ):
+        """Load this week's charts; `tz_offset` is the browser's."""
+        self._client_offset(tz_offset)
+        await self._load()
+
+    async def _load(self):
+        family = await self.get_state(FamilyState)
+        today = self._client_today()
+        self._week = rollups.week_start(today).isoformat()
+        self._days_since = (
+            today - datetime.timedelta(days=STATS_DAYS - 1)
+        ).isoformat()
+        self._family_week = {}
+        for rollup in store.load_rollups(
+            "week", self._week
+        ):
+            self._family_week.setdefault(
+                rollup["child_id"], {}
+            )[rollup["category_name"]] = rollup["coins"]
+        await self._refresh_family_chart()
+        self._load_child_days(
+            family.current_child_id_for_details
+        )
+
+    @rx.event
+    def load_child_stats(self, child_id: str | None):
+        if self._days_since:
+            self._load_child_days(child_id)
\ No newline at end of file
@@ -0,0 +1,834 @@
+import reflex as rx
+import datetime
+import sqlalchemy
+import sqlmodel
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+)
+from app.states.types import (
+    Child,
+    Category,
+    Activity,
+    Goal,
+    HistoryEntry,
+    Rollup,
+    ROLLUP_PERIODS,
+    Streak,
+)
+from app.states.models import (
+    ChildRow,
+    CategoryRow,
+    ActivityRow,
+    GoalRow,
+    HistoryEntryRow,
+    HistoryLabelRow,
+    RollupRow,
+    StreakRow,
+)
+from app.states import labels, rollups, streaks
+
+DEFAULT_CATEGORIES: List[Category] = [
+    Category(
+        id="cat1",
+        name="Kindness",
+        icon="🌟",
+        background_class="bg-yellow-200/50",
+    ),
+    Category(
+        id="cat2",
+        name="Chores",
+        icon="🧹",
+        background_class="bg-blue-200/50",
+    ),
+    Category(
+        id="cat3",
+        name="Learning",
+        icon="📚",
+        background_class="bg-green-200/50",
+    ),
+    Category(
+        id="cat4",
+        name="Health",
+        icon="💪",
+        background_class="bg-red-200/50",
+    ),
+]
+DEFAULT_ACTIVITIES: List[Activity] = [
+    Activity(
+        id="act1",
+        name="Helped a friend",
+        category_id="cat1",
+        icon="🤝",
+        coins=15,
+        parent_configurable=True,
+    ),
+    Activity(
+        id="act2",
+        name="Shared toys",
+        category_id="cat1",
+        icon="🎁",
+        coins=10,
+        parent_configurable=True,
+    ),
+    Activity(
+        id="act3",
+        name="Cleaned room",
+        category_id="cat2",
+        icon="🏠",
+        coins=20,
+        parent_configurable=True,
+    ),
+    Activity(
+        id="act4",
+        name="Set the table",
+        category_id="cat2",
+        icon="🍽️",
+        coins=5,
+        parent_configurable=True,
+    ),
+    Activity(
+        id="act5",
+        name="Read a book for 20 mins",
+        category_id="cat3",
+        icon="📖",
+        coins=15,
+        parent_configurable=False,
+    ),
+    Activity(
+        id="act6",
+        name="Practiced math",
+        category_id="cat3",
+        icon="🧮",
+        coins=10,
+        parent_configurable=False,
+    ),
+    Activity(
+        id="act7",
+        name="Ate all veggies",
+        category_id="cat4",
+        icon="🥦",
+        coins=10,
+        parent_configurable=True,
+    ),
+    Activity(
+        id="act8",
+        name="Played outside for 30 mins",
+        category_id="cat4",
+        icon="⚽",
+        coins=15,
+        parent_configurable=True,
+    ),
+]
+DEFAULT_CHILDREN: List[Child] = [
+    Child(
+        id="child1",
+        name="Alex",
+        avatar_image_src="/avatars/tree/tree_stage_4.svg",
+        avatar_lottie_src="/lottie/avatars/tree/stage_4.json",
+        avatar_type="tree",
+        growth_stage=3,
+        coin_balance=150,
+        current_streak_status="Day 3 Streak 🔥",
+        current_goal_progress_percentage=50,
+        version=0,
+    ),
+    Child(
+        id="child2",
+        name="Bella",
+        avatar_image_src="/avatars/rocket/rocket_stage_8.svg",
+        avatar_lottie_src="/lottie/avatars/rocket/stage_8.json",
+        avatar_type="rocket",
+        growth_stage=7,
+        coin_balance=450,
+        current_streak_status="Growing Strong! 🌱",
+        current_goal_progress_percentage=50,
+        version=0,
+    ),
+]
+DEFAULT_GOALS: List[Goal] = [
+    Goal(
+        id="goal1",
+        child_id="child1",
+        description="Save for a new comic book",
+        target_coins=300,
+        is_achieved=False,
+        real_world_reward_note="Comic book store visit!",
+    ),
+    Goal(
+        id="goal2",
+        child_id="child2",
+        description="Fund a charity donation",
+        target_coins=500,
+        is_achieved=True,
+        real_world_reward_note="Donated!",
+    ),
+]
+
+HistoryCursor = Tuple[str, str]
+ChildChange = Callable[
+    [Dict[str, Child], Dict[str, Streak]],
+    List[HistoryEntry],
+]
+MAX_WRITE_ATTEMPTS = 5
+_INSERTION_ORDER = sqlalchemy.literal_column("rowid")
+# Dialects whose INSERT can add to an existing row in one statement.
+_UPSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+_initialized = False
+
+
+def _default_history() -> List[HistoryEntry]:
+    now = streaks.epoch_ms(
+        datetime.datetime.now(datetime.timezone.utc)
+    )
+    yesterday = now - streaks.MS_PER_DAY
+    return [
+        HistoryEntry(
+            id="hist1",
+            child_id="child1",
+            label_id=labels.intern(
+                "act3",
+                "cat2",
+                "Cleaned room",
+                "Chores",
+                "🧹",
+            ),
+            coins_earned=20,
+            timestamp=now,
+            tz_offset=streaks.local_offset(now),
+        ),
+        HistoryEntry(
+            id="hist2",
+            child_id="child2",
+            label_id=labels.intern(
+                "act2",
+                "cat1",
+                "Shared toys",
+                "Kindness",
+                "🌟",
+            ),
+            coins_earned=10,
+            timestamp=yesterday,
+            tz_offset=streaks.local_offset(yesterday),
+        ),
+    ]
+
+
+def _migrated_history_row(
+    row: dict, label_id: Callable[[dict], int]
+) -> dict:
+    if isinstance(row["timestamp"], str):
+        moment = datetime.datetime.fromisoformat(
+            row["timestamp"]
+        )
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        row["timestamp"] = streaks.epoch_ms(moment)
+        # Days used to be bucketed in server local time; keep them there.
+        row["tz_offset"] = streaks.local_offset(
+            row["timestamp"]
+        )
+    if "label_id" not in row:
+        row["label_id"] = label_id(row)
+    return {
+        column: row[column]
+        for column in HistoryEntryRow.__table__.columns.keys()
+    }
+
+
+def _migrate_history() -> None:
+    """Rebuild a history table written by an older version.
+
+    Older tables hold ISO timestamp strings and copy the activity and
+    category names into every row. Rows are rewritten with epoch
+    milliseconds and a label id, in one pass.
+    """
+    engine = rx.model.get_engine()
+    inspector = sqlalchemy.inspect(engine)
+    if not inspector.has_table("history_entry"):
+        return
+    columns = {
+        column["name"]: column["type"]
+        for column in inspector.get_columns("history_entry")
+    }
+    if "label_id" in columns and isinstance(
+        columns["timestamp"], sqlalchemy.Integer
+    ):
+        return
+    table = HistoryEntryRow.__table__
+    label_table = HistoryLabelRow.__table__
+    with engine.begin() as connection:
+        label_table.create(connection, checkfirst=True)
+        label_ids = {
+            tuple(
+                row[field] for field in labels.FIELDS
+            ): row["id"]
+            for row in connection.execute(
+                sqlalchemy.select(label_table)
+            ).mappings()
+        }
+        activity_ids = {
+            (row.name, row.category_name): row.id
+            for row in connection.execute(
+                sqlalchemy.text(
+                    "SELECT activity.id, activity.name, "
+                    "category.name AS category_name "
+                    "FROM activity JOIN category "
+                    "ON activity.category_id = category.id"
+                )
+            )
+        }
+        category_ids = {
+            row.name: row.id
+            for row in connection.execute(
+                sqlalchemy.text(
+                    "SELECT id, name FROM category"
+                )
+            )
+        }
+
+        def label_id(row: dict) -> int:
+            key = (
+                activity_ids.get(
+                    (
+                        row["activity_name"],
+                        row["category_name"],
+                    ),
+                    "",
+                ),
+                category_ids.get(row["category_name"], ""),
+                row["activity_name"],
+                row["category_name"],
+                row["category_icon"],
+            )
+            if key not in label_ids:
+                label_ids[key] = connection.execute(
+                    sqlalchemy.insert(label_table).values(
+                        dict(zip(labels.FIELDS, key))
+                    )
+                ).inserted_primary_key[0]
+            return label_ids[key]
+
+        connection.execute(
+            sqlalchemy.text(
+                "ALTER TABLE history_entry RENAME TO history_entry_old"
+            )
+        )
+        for index in table.indexes:
+            connection.execute(
+                sqlalchemy.text(
+                    f"DROP INDEX IF EXISTS {index.name}"
+                )
+            )
+        table.create(connection)
+        old_rows = connection.execute(
+            sqlalchemy.text(
+                "SELECT * FROM history_entry_old ORDER BY rowid"
+            )
+        ).mappings()
+        batch = []
+        for row in old_rows:
+            batch.append(
+                _migrated_history_row(dict(row), label_id)
+            )
+            if len(batch) == 5_000:
+                connection.execute(
+                    sqlalchemy.insert(table), batch
+                )
+                batch = []
+        if batch:
+            connection.execute(
+                sqlalchemy.insert(table), batch
+            )
+        connection.execute(
+            sqlalchemy.text("DROP TABLE history_entry_old")
+        )
+
+
+def _add_missing_columns() -> None:
+    """Add columns that came after a table was created to the table.
+
+    create_all never alters an existing table. Only columns with a
+    server default can be added this way, which gives old rows a value.
+    """
+    engine = rx.model.get_engine()
+    inspector = sqlalchemy.inspect(engine)
+    with engine.begin() as connection:
+        for (
+            table
+        ) in sqlmodel.SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {
+                column["name"]
+                for column in inspector.get_columns(
+                    table.name
+                )
+            }
+            for column in table.columns:
+                if (
+                    column.name in existing
+                    or column.server_default is None
+                ):
+                    continue
+                connection.execute(
+                    sqlalchemy.text(
+                        f"ALTER TABLE {table.name} ADD COLUMN "
+                        f"{column.name} "
+                        f"{column.type.compile(engine.dialect)} "
+                        f"NOT NULL DEFAULT {column.server_default.arg}"
+                    )
+                )
+
+
+def _use_wal() -> None:
+    """Let readers carry on while a writer commits (SQLite only)."""
+    engine = rx.model.get_engine()
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            connection.exec_driver_sql(
+                "PRAGMA journal_mode=WAL"
+            )
+
+
+def init_store() -> None:
+    """Create the tables and seed the starter catalog on first run."""
+    global _initialized
+    if _initialized:
+        return
+    _use_wal()
+    _migrate_history()
+    _add_missing_columns()
+    rx.Model.create_all()
+    with rx.session() as session:
+        if (
+            session.exec(
+                sqlmodel.select(CategoryRow).limit(1)
+            ).first()
+            is None
+        ):
+            session.add_all(
+                CategoryRow(**cat)
+                for cat in DEFAULT_CATEGORIES
+            )
+            session.add_all(
+                ActivityRow(**act)
+                for act in DEFAULT_ACTIVITIES
+            )
+        seed_history = (
+            session.exec(
+                sqlmodel.select(ChildRow).limit(1)
+            ).first()
+            is None
+        )
+        if seed_history:
+            session.add_all(
+                ChildRow(**child)
+                for child in DEFAULT_CHILDREN
+            )
+            session.add_all(
+                GoalRow(**goal) for goal in DEFAULT_GOALS
+            )
+        session.commit()
+    if seed_history:
+        # Labels are interned in their own transactions, so after commit.
+        add_history_entries(_default_history())
+    with rx.session() as session:
+        needs_rollups = (
+            session.exec(
+                sqlmodel.select(RollupRow).limit(1)
+            ).first()
+            is None
+            and session.exec(
+                sqlmodel.select(HistoryEntryRow).limit(1)
+            ).first()
+            is not None
+        )
+    if needs_rollups:
+        rebuild_rollups()
+    _initialized = True
+
+
+def load_children() -> List[Child]:
+    with rx.session() as session:
+        rows = session.exec(
+            sqlmodel.select(ChildRow).order_by(
+                _INSERTION_ORDER
+            )
+        ).all()
+        return [Child(**row.dict()) for row in rows]
+
+
+def load_categories() -> List[Category]:
+    with rx.session() as session:
+        rows = session.exec(
+            sqlmodel.select(CategoryRow).order_by(
+                _INSERTION_ORDER
+            )
+        ).all()
+        return [Category(**row.dict()) for row in rows]
+
+
+def load_activities() -> List[Activity]:
+    with rx.session() as session:
+        rows = session.exec(
+            sqlmodel.select(ActivityRow).order_by(
+                _INSERTION_ORDER
+            )
+        ).all()
+        return [Activity(**row.dict()) for row in rows]
+
+
+def load_goals(child_id: str) -> List[Goal]:
+    with rx.session() as session:
+        rows = session.exec(
+            sqlmodel.select(GoalRow)
+            .where(GoalRow.child_id == child_id)
+            .order_by(_INSERTION_ORDER)
+        ).all()
+        return [Goal(**row.dict()) for row in rows]
+
+
+def load_history(
+    child_id: str,
+    limit: int,
+    older_than: HistoryCursor | None = None,
+    newer_than: HistoryCursor | None = None,
+) -> List[HistoryEntry]:
+    """Newest-first page of one child's history.
+
+    Pages are keyed by a (timestamp, id) cursor rather than an offset so
+    every page is a range scan on the (child_id, timestamp) index.
+    """
+    timestamp = HistoryEntryRow.timestamp
+    entry_id = HistoryEntryRow.id
+    query = sqlmodel.select(HistoryEntryRow).where(
+        HistoryEntryRow.child_id == child_id
+    )
+    if newer_than is not None:
+        query = query.where(
+            sqlalchemy.tuple_(timestamp, entry_id)
+            > sqlalchemy.tuple_(*newer_than)
+        ).order_by(timestamp, entry_id)
+    else:
+        if older_than is not None:
+            query = query.where(
+                sqlalchemy.tuple_(timestamp, entry_id)
+                < sqlalchemy.tuple_(*older_than)
+            )
+        query = query.order_by(
+            timestamp.desc(), entry_id.desc()
+        )
+    with rx.session() as session:
+        rows = session.exec(query.limit(limit)).all()
+        entries = [
+            HistoryEntry(**row.dict()) for row in rows
+        ]
+    if newer_than is not None:
+        entries.reverse()
+    return entries
+
+
+def iter_history_times(
+    child_id: str,
+) -> Iterator[Tuple[int, int]]:
+    """One child's (timestamp, tz_offset) pairs, newest first, streamed."""
+    query = (
+        sqlmodel.select(
+            HistoryEntryRow.timestamp,
+            HistoryEntryRow.tz_offset,
+        )
+        .where(HistoryEntryRow.child_id == child_id)
+        .order_by(HistoryEntryRow.timestamp.desc())
+        .execution_options(yield_per=500)
+    )
+    with rx.session() as session:
+        yield from session.exec(query)
+
+
+def iter_history(
+    child_id: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+    category_name: str | None = None,
+    batch_size: int = 1_000,
+) -> Iterator[HistoryEntry]:
+    """Stream the ledger oldest first, `batch_size` rows at a time.
+
+    `since` and `until` are epoch milliseconds; `until` is exclusive.
+    """
+    table = HistoryEntryRow.__table__
+    query = sqlalchemy.select(table).order_by(
+        table.c.timestamp, table.c.id
+    )
+    if child_id is not None:
+        query = query.where(table.c.child_id == child_id)
+    if since is not None:
+        query = query.where(table.c.timestamp >= since)
+    if until is not None:
+        query = query.where(table.c.timestamp < until)
+    if category_name is not None:
+        label_table = HistoryLabelRow.__table__
+        query = query.where(
+            table.c.label_id.in_(
+                sqlalchemy.select(label_table.c.id).where(
+                    label_table.c.category_name
+                    == category_name
+                )
+            )
+        )
+    with rx.session() as session:
+        result = session.execute(
+            query.execution_options(yield_per=batch_size)
+        )
+        for row in result.mappings():
+            yield HistoryEntry(**row)
+
+
+def load_streaks() -> Dict[str, Streak]:
+    with rx.session() as session:
+        rows = session.exec(
+            sqlmodel.select(StreakRow)
+        ).all()
+        return {
+            row.child_id: Streak(**row.dict())
+            for row in rows
+        }
+
+
+def save_streak(streak: Streak) -> None:
+    with rx.session() as session:
+        session.merge(StreakRow(**streak))
+        session.commit()
+
+
+def save_child(child: Child) -> None:
+    with rx.session() as session:
+        session.merge(ChildRow(**child))
+        session.commit()
+
+
+def save_activity(activity: Activity) -> None:
+    with rx.session() as session:
+        session.merge(ActivityRow(**activity))
+        session.commit()
+
+
+def save_goal(goal: Goal) -> None:
+    with rx.session() as session:
+        session.merge(GoalRow(**goal))
+        session.commit()
+
+
+def _add_to_rollups(
+    session, totals: Iterable[Rollup]
+) -> None:
+    """Add totals to the rollups without reading them first, so
+    concurrent writers never lose each other's counts."""
+    totals = list(totals)
+    if not totals:
+        return
+    upsert = _UPSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        table = RollupRow.__table__
+        statement = upsert(table)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(table.primary_key),
+                set_={
+                    "coins": table.c.coins
+                    + statement.excluded.coins,
+                    "entries": table.c.entries
+                    + statement.excluded.entries,
+                },
+            ),
+            totals,
+        )
+        return
+    for rollup in totals:
+        row = session.get(
+            RollupRow,
+            (
+                rollup["child_id"],
+                rollup["period"],
+                rollup["bucket"],
+                rollup["category_name"],
+            ),
+        )
+        if row is None:
+            session.add(RollupRow(**rollup))
+        else:
+            row.coins += rollup["coins"]
+            row.entries += rollup["entries"]
+
+
+class StaleWriteError(Exception):
+    """A child kept changing under update_children past its retries."""
+
+
+def _write_child(session, child: Child) -> bool:
+    """Store the child if nobody wrote it since it was read."""
+    result = session.execute(
+        sqlalchemy.update(ChildRow)
+        .where(
+            ChildRow.id == child["id"],
+            ChildRow.version == child["version"],
+        )
+        .values(
+            **{**child, "version": child["version"] + 1}
+        )
+    )
+    return result.rowcount == 1
+
+
+def update_children(
+    child_ids: Iterable[str],
+    change: ChildChange,
+    attempts: int = MAX_WRITE_ATTEMPTS,
+) -> Tuple[
+    Dict[str, Child], Dict[str, Streak], List[HistoryEntry]
+]:
+    """Read-modify-write children, their streaks and new history.
+
+    `change` gets fresh copies of the children and of whichever streaks
+    they have, edits them in place and returns the history entries to
+    add. Each child is written only if its version is still the one read,
+    so concurrent writers never lose each other's coins; on a conflict
+    everything is re-read and `change` runs again. No lock is held
+    between the read and the write. Safe to run in a worker thread.
+    """
+    child_ids = list(dict.fromkeys(child_ids))
+    for _ in range(attempts):
+        with rx.session() as session:
+            children = {
+                row.id: Child(**row.dict())
+                for row in session.exec(
+                    sqlmodel.select(ChildRow).where(
+                        ChildRow.id.in_(child_ids)
+                    )
+                )
+            }
+            child_streaks = {
+                row.child_id: Streak(**row.dict())
+                for row in session.exec(
+                    sqlmodel.select(StreakRow).where(
+                        StreakRow.child_id.in_(child_ids)
+                    )
+                )
+            }
+            session.rollback()
+            entries = change(children, child_streaks)
+            if not all(
+                _write_child(session, child)
+                for child in children.values()
+            ):
+                session.rollback()
+                continue
+            for streak in child_streaks.values():
+                session.merge(StreakRow(**streak))
+            session.add_all(
+                HistoryEntryRow(**entry)
+                for entry in entries
+            )
+            _add_to_rollups(
+                session, rollups.aggregate(entries).values()
+            )
+            session.commit()
+        for child in children.values():
+            child["version"] += 1
+        return children, child_streaks, entries
+    raise StaleWriteError(
+        f"Children {child_ids} changed {attempts} times in a row."
+    )
+
+
+def add_history_entries(
+    entries: List[HistoryEntry],
+) -> None:
+    """Insert a batch of entries and their rollups in one transaction."""
+    if not entries:
+        return
+    with rx.session() as session:
+        session.execute(
+            sqlalchemy.insert(HistoryEntryRow), entries
+        )
+        _add_to_rollups(
+            session, rollups.aggregate(entries).values()
+        )
+        session.commit()
+
+
+def complete_goal(goal_id: str) -> bool:
+    """Mark a goal achieved; False if it already was or is unknown."""
+    with rx.session() as session:
+        result = session.execute(
+            sqlalchemy.update(GoalRow)
+            .where(
+                GoalRow.id == goal_id,
+                GoalRow.is_achieved == sqlalchemy.false(),
+            )
+            .values(is_achieved=True)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+
+def existing_history_ids(ids: Iterable[str]) -> Set[str]:
+    with rx.session() as session:
+        return set(
+            session.exec(
+                sqlmodel.select(HistoryEntryRow.id).where(
+                    HistoryEntryRow.id.in_(list(ids))
+                )
+            ).all()
+        )
+
+
+def rebuild_rollups() -> None:
+    """Recompute every rollup from the ledger in one streamed pass."""
+    query = sqlmodel.select(
+        HistoryEntryRow
+    ).execution_options(yield_per=5_000)
+    with rx.session() as session:
+        totals = rollups.aggregate(
+            HistoryEntry(**row.dict())
+            for row in session.exec(query)
+        )
+        session.execute(sqlalchemy.delete(RollupRow))
+        if totals:
+            session.execute(
+                sqlalchemy.insert(RollupRow),
+                list(totals.values()),
+            )
+        session.commit()
+
+
+def load_rollups(
+    period: ROLLUP_PERIODS,
+    since: str,
+    until: str | None = None,
+    child_id: str | None = None,
+) -> List[Rollup]:
+    """Rollups of one period whose bucket starts in [since, until]."""
+    query = sqlmodel.select(RollupRow).where(
+        RollupRow.period == period,
+        RollupRow.bucket >= since,
+    )
+    if until is not None:
+        query = query.where(RollupRow.bucket <= until)
+    if child_id is not None:
+        query = query.where(RollupRow.child_id == child_id)
+    with rx.session() as session:
+        return [
+            Rollup(**row.dict())
+            for row in session.exec(query).all()
+        ]
\ No newline at end of file
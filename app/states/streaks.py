@@ -0,0 +1,149 @@
+"""Day streaks, bucketed by local calendar day.
+
+A streak is the run of consecutive local days, ending at its last logged
+day, on which a child logged at least one activity. It is stored per child
+and folded forward one log at a time, so logging never rereads history;
+the ledger is only walked once, newest first, to seed a child that has no
+stored streak yet.
+"""
+
+import datetime
+from typing import Iterable, Tuple
+from app.states.types import Streak
+
+ONE_DAY = datetime.timedelta(days=1)
+MS_PER_MINUTE = 60_000
+MS_PER_DAY = 86_400_000
+# Minutes; no zone is further from UTC than UTC+14.
+MAX_TZ_OFFSET = 14 * 60
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+METEOR_SHOWER = "meteor_shower"
+GROWTH_BURST = "growth_burst"
+METEOR_SHOWER_DAYS = 3
+GROWTH_BURST_DAYS = 7
+
+
+def epoch_ms(moment: datetime.datetime) -> int:
+    """Milliseconds since the Unix epoch of an aware datetime."""
+    return int(moment.timestamp() * 1000)
+
+
+def local_offset(timestamp: int) -> int:
+    """Minutes the server's local time is ahead of UTC at `timestamp`."""
+    offset = (
+        datetime.datetime.fromtimestamp(timestamp / 1000)
+        .astimezone()
+        .utcoffset()
+    )
+    return int(offset.total_seconds()) // 60
+
+
+def local_day(
+    timestamp: int, tz_offset: int
+) -> datetime.date:
+    """Calendar day of an epoch-ms timestamp at its UTC offset."""
+    return datetime.date.fromordinal(
+        _EPOCH_ORDINAL
+        + (timestamp + tz_offset * MS_PER_MINUTE)
+        // MS_PER_DAY
+    )
+
+
+def valid_offset(tz_offset) -> bool:
+    """Whether a client sent a real UTC offset, in minutes."""
+    return (
+        isinstance(tz_offset, int)
+        and not isinstance(tz_offset, bool)
+        and abs(tz_offset) <= MAX_TZ_OFFSET
+    )
+
+
+def local_today(
+    tz_offset: int | None = None,
+) -> datetime.date:
+    """Today at `tz_offset` minutes from UTC, or the server's today."""
+    now = epoch_ms(
+        datetime.datetime.now(datetime.timezone.utc)
+    )
+    if tz_offset is None:
+        tz_offset = local_offset(now)
+    return local_day(now, tz_offset)
+
+
+def new_streak(child_id: str) -> Streak:
+    return Streak(
+        child_id=child_id, days=0, last_day=None, best=0
+    )
+
+
+def milestone(days: int) -> str | None:
+    """Reward for reaching `days`: a meteor shower on day 3, a growth
+    burst every seventh day."""
+    if days == METEOR_SHOWER_DAYS:
+        return METEOR_SHOWER
+    if days and days % GROWTH_BURST_DAYS == 0:
+        return GROWTH_BURST
+    return None
+
+
+def advance(
+    streak: Streak, day: datetime.date
+) -> str | None:
+    """Fold a log on `day` into the streak in place.
+
+    Only the first log of a new day moves the streak, so the milestone it
+    returns fires once per day reached. Logs dated on or before the last
+    counted day leave it unchanged.
+    """
+    last_day = (
+        datetime.date.fromisoformat(streak["last_day"])
+        if streak["last_day"]
+        else None
+    )
+    if last_day is not None and day <= last_day:
+        return None
+    if last_day is not None and day - last_day == ONE_DAY:
+        streak["days"] += 1
+    else:
+        streak["days"] = 1
+    streak["last_day"] = day.isoformat()
+    streak["best"] = max(streak["best"], streak["days"])
+    return milestone(streak["days"])
+
+
+def from_history(
+    child_id: str,
+    times_newest_first: Iterable[Tuple[int, int]],
+) -> Streak:
+    """Seed a streak from the ledger's (timestamp, tz_offset) pairs,
+    stopping at the first missed day."""
+    streak = new_streak(child_id)
+    previous_day = None
+    for timestamp, tz_offset in times_newest_first:
+        day = local_day(timestamp, tz_offset)
+        if previous_day is None:
+            streak["last_day"] = day.isoformat()
+            streak["days"] = 1
+        elif day == previous_day - ONE_DAY:
+            streak["days"] += 1
+        elif day != previous_day:
+            break
+        previous_day = day
+    streak["best"] = streak["days"]
+    return streak
+
+
+def status(
+    streak: Streak | None,
+    today: datetime.date,
+    default: str,
+) -> str:
+    """Badge text: the running streak, or a nap once a day was missed."""
+    if not streak or not streak["last_day"]:
+        return default
+    last_day = datetime.date.fromisoformat(
+        streak["last_day"]
+    )
+    if today - last_day > ONE_DAY:
+        return "Napping 😴"
+    return f"Day {streak['days']} Streak 🔥"
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Applies family changes from the broker to one connected session."""
+
+import reflex as rx
+from reflex.state import _substate_key
+from app.states.state import FamilyChange
+from app.states.family import FamilyState
+from app.states.stats import StatsState
+
+
+async def deliver_change(
+    app: rx.App, client_token: str, change: FamilyChange
+):
+    """Merge the change into the session's state and push the delta."""
+    async with app.modify_state(
+        _substate_key(client_token, FamilyState)
+    ) as root:
+        family = await root.get_state(FamilyState)
+        if family.isLoading:
+            # Nothing loaded yet; the session reads the store itself.
+            return
+        family._apply_change(change)
+        stats = await root.get_state(StatsState)
+        for entry in change["history"]:
+            await stats._record(entry)
+        if change["history_changed"] and stats._week:
+            # Too much changed to patch the loaded charts; reload them.
+            await stats._load()
\ No newline at end of file
@@ -0,0 +1,120 @@
+from typing import TypedDict, Literal, Dict, List
+
+AVATAR_TYPES = Literal["tree", "rocket", "pet", "planet"]
+CATEGORY_TYPES = Literal[
+    "Kindness", "Chores", "Learning", "Health", "Custom"
+]
+CURRENCY_SYMBOLS: Dict[str, str] = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "AUD": "$",
+    "CAD": "$",
+}
+ACTIVITY_LOG_STEP = Literal[
+    "category_select",
+    "activity_select",
+    "confirmation",
+    "custom_create_activity",
+]
+LOW_POWER_MODES = Literal["auto", "on", "off"]
+VIEW_TYPES = Literal[
+    "dashboard",
+    "world_view",
+    "activity_log_overlay",
+    "settings_modal",
+]
+
+
+class Child(TypedDict):
+    id: str
+    name: str
+    avatar_image_src: str
+    avatar_lottie_src: str
+    avatar_type: AVATAR_TYPES
+    growth_stage: int
+    coin_balance: int
+    current_streak_status: str
+    current_goal_progress_percentage: int
+    version: int
+
+
+class Category(TypedDict):
+    id: str
+    name: CATEGORY_TYPES
+    icon: str
+    background_class: str
+
+
+class Activity(TypedDict):
+    id: str
+    name: str
+    category_id: str
+    icon: str
+    coins: int
+    parent_configurable: bool
+
+
+class Goal(TypedDict):
+    id: str
+    child_id: str
+    description: str
+    target_coins: int
+    is_achieved: bool
+    real_world_reward_note: str | None
+
+
+class HistoryLabel(TypedDict):
+    id: int
+    activity_id: str
+    category_id: str
+    activity_name: str
+    category_name: CATEGORY_TYPES
+    category_icon: str
+
+
+class HistoryEntry(TypedDict):
+    id: str
+    child_id: str
+    label_id: int
+    coins_earned: int
+    # Epoch milliseconds, and minutes ahead of UTC where it was logged.
+    timestamp: int
+    tz_offset: int
+
+
+class Streak(TypedDict):
+    child_id: str
+    days: int
+    last_day: str | None
+    best: int
+
+
+ROLLUP_PERIODS = Literal["day", "week"]
+
+
+class Rollup(TypedDict):
+    child_id: str
+    category_name: str
+    period: ROLLUP_PERIODS
+    bucket: str
+    coins: int
+    entries: int
+
+
+class ImportRowError(TypedDict):
+    line: int
+    message: str
+
+
+class FamilyChange(TypedDict):
+    family_id: str
+    origin: str
+    children: List[Child]
+    streaks: List[Streak]
+    goals: List[Goal]
+    history: List[HistoryEntry]
+    # Children whose history changed too much to send, e.g. an import;
+    # sessions showing them reload instead.
+    history_changed: List[str]
\ No newline at end of file
@@ -0,0 +1,98 @@
+/* KindCoins service worker, registered by app/components/offline.py.
+ *
+ * Precaches the app shell and avatar artwork so the app opens without a
+ * network. Deeds logged while offline are not handled here: the page
+ * queues them in IndexedDB and replays them over the websocket.
+ */
+const VERSION = "kindcoins-v1";
+const SHELL = [
+  "/",
+  "/history",
+  "/goals",
+  "/manage",
+  "/manifest.webmanifest",
+  "/favicon.ico",
+  "/icons/icon-192x192.png",
+  "/icons/icon-512x512.png",
+  "/tailwind_colors.css",
+  "/low_power.css",
+];
+const AVATAR_TYPES = ["tree", "rocket", "pet", "planet"];
+const AVATARS = AVATAR_TYPES.flatMap((type) =>
+  [1, 2, 3, 4, 5, 6, 7, 8].map(
+    (stage) => `/avatars/${type}/${type}_stage_${stage}.svg`,
+  ),
+);
+// Content that never changes under the same URL.
+const IMMUTABLE = ["/_next/static/", "/_assets/", "/avatars/", "/lottie/", "/icons/"];
+// Live endpoints that must always hit the network.
+const BYPASS = ["/_event", "/_upload", "/_export", "/ping", "/_health"];
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches.open(VERSION).then((cache) =>
+      // Not every stage has artwork yet, so misses are skipped.
+      Promise.all(
+        [...SHELL, ...AVATARS].map((url) => cache.add(url).catch(() => null)),
+      ),
+    ),
+  );
+  self.skipWaiting();
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((names) =>
+        Promise.all(
+          names
+            .filter((name) => name !== VERSION)
+            .map((name) => caches.delete(name)),
+        ),
+      )
+      .then(() => self.clients.claim()),
+  );
+});
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(VERSION);
+    cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function networkFirst(request) {
+  const cache = await caches.open(VERSION);
+  try {
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  } catch (error) {
+    const cached =
+      (await cache.match(request)) ||
+      (request.mode === "navigate" && (await cache.match("/")));
+    if (cached) return cached;
+    throw error;
+  }
+}
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (
+    request.method !== "GET" ||
+    BYPASS.some((prefix) => url.pathname.startsWith(prefix))
+  ) {
+    return;
+  }
+  if (IMMUTABLE.some((prefix) => url.pathname.startsWith(prefix))) {
+    event.respondWith(cacheFirst(request));
+  } else if (url.origin === self.location.origin) {
+    event.respondWith(networkFirst(request));
+  }
+});
@@ -0,0 +1,375 @@
+"""Benchmark the activity-logging and history hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_state --scenarios small,medium
+    python -m benchmarks.bench_state --baseline benchmarks/results/base.json
+
+Each scenario seeds a private SQLite file with a synthetic family, then
+drives the real event handlers in-process. Results are written as JSON;
+with --baseline every operation's p50 is compared and the run fails when
+one regresses by more than --threshold. The logging_round_* operations log
+one deed for each of several children, first one tab at a time and then
+from all tabs at once; parallel_logging.speedup is their p50 ratio. They
+only run in scenarios with at least PARALLEL_SESSIONS children.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from benchmarks.driver import REPO_ROOT, Session, load_app
+
+SCENARIOS = {
+    "small": dict(children=1, activities=10, history=1_000),
+    "medium": dict(
+        children=50, activities=500, history=50_000
+    ),
+    "large": dict(
+        children=500, activities=5_000, history=1_000_000
+    ),
+}
+# Tabs logging at once for different children in the parallel rounds.
+PARALLEL_SESSIONS = 8
+DEFAULT_OUTPUT = (
+    REPO_ROOT / "benchmarks/results/latest.json"
+)
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(
+            ordered[
+                min(
+                    len(ordered) - 1,
+                    int(len(ordered) * 0.95),
+                )
+            ],
+            3,
+        ),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+async def _time_async(
+    iterations: int, operation: Callable
+) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await operation()
+        samples.append(
+            (time.perf_counter() - started) * 1000
+        )
+    return samples
+
+
+def _time_sync(
+    iterations: int, operation: Callable
+) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        samples.append(
+            (time.perf_counter() - started) * 1000
+        )
+    return samples
+
+
+def _walk(state):
+    yield state
+    for substate in state.substates.values():
+        yield from _walk(substate)
+
+
+async def run_scenario(
+    app, name: str, iterations: int, seed: int
+) -> dict:
+    from reflex.state import _resolve_delta
+    from reflex.utils.format import json_dumps
+    from app.states.activity_log import ActivityLogState
+    from app.states.family import FamilyState
+    from app.states.stats import StatsState
+    from benchmarks import synthetic
+
+    size = SCENARIOS[name]
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    synthetic.populate(**size, seed=seed)
+    populate_seconds = time.perf_counter() - started
+    operations: Dict[str, dict] = {}
+
+    async def fresh_load():
+        session = Session(app)
+        await session.hydrate()
+        started = time.perf_counter()
+        await session.send(FamilyState.load_initial_data)
+        return (time.perf_counter() - started) * 1000
+
+    operations["load_initial_data"] = _summarize(
+        [await fresh_load() for _ in range(iterations)]
+    )
+
+    session = Session(app)
+    await session.hydrate()
+    await session.send(FamilyState.load_initial_data)
+
+    operations["load_stats"] = _summarize(
+        await _time_async(
+            iterations,
+            lambda: session.send(StatsState.load_stats),
+        )
+    )
+
+    def random_child() -> str:
+        return f"child{rng.randrange(size['children'])}"
+
+    operations["perform_activity_logging"] = _summarize(
+        await _time_async(
+            iterations,
+            lambda: session.send(
+                ActivityLogState.perform_activity_logging,
+                child_id=random_child(),
+                activity_id=f"act{rng.randrange(size['activities'])}",
+            ),
+        )
+    )
+    tabs = []
+    if size["children"] < PARALLEL_SESSIONS:
+        parallel_sessions = 0
+    else:
+        parallel_sessions = PARALLEL_SESSIONS
+    for number in range(parallel_sessions):
+        tab = Session(app)
+        await tab.hydrate()
+        await tab.send(FamilyState.load_initial_data)
+        tabs.append((tab, f"child{number}"))
+
+    def log_on(tab: Session, child_id: str):
+        return tab.send(
+            ActivityLogState.perform_activity_logging,
+            child_id=child_id,
+            activity_id=f"act{rng.randrange(size['activities'])}",
+        )
+
+    async def sequential_round():
+        for tab, child_id in tabs:
+            await log_on(tab, child_id)
+
+    async def parallel_round():
+        await asyncio.gather(
+            *(
+                log_on(tab, child_id)
+                for tab, child_id in tabs
+            )
+        )
+
+    # One deed per tab; the same work either one after another or all
+    # at once, so the ratio is the gain from unrelated writes overlapping.
+    if tabs:
+        operations["logging_round_sequential"] = _summarize(
+            await _time_async(iterations, sequential_round)
+        )
+        operations["logging_round_parallel"] = _summarize(
+            await _time_async(iterations, parallel_round)
+        )
+    operations["set_current_child_id_for_details"] = (
+        _summarize(
+            await _time_async(
+                iterations,
+                lambda: session.send(
+                    FamilyState.set_current_child_id_for_details,
+                    child_id=random_child(),
+                ),
+            )
+        )
+    )
+
+    family = await session.get_state(FamilyState)
+    for computed_var in (
+        "history_for_selected_child",
+        "goals_for_selected_child",
+    ):
+        fget = FamilyState.computed_vars[computed_var].fget
+        operations[computed_var] = _summarize(
+            _time_sync(iterations, lambda: fget(family))
+        )
+
+    root = family
+    while root.parent_state is not None:
+        root = root.parent_state
+    states = list(_walk(root))
+
+    async def serialize_json() -> str:
+        return json_dumps(await _resolve_delta(root.dict()))
+
+    def serialize_pickle() -> int:
+        return sum(
+            len(state._serialize()) for state in states
+        )
+
+    operations["serialize_json"] = _summarize(
+        await _time_async(iterations, serialize_json)
+    )
+    operations["serialize_pickle"] = _summarize(
+        _time_sync(iterations, serialize_pickle)
+    )
+    result = {
+        "size": size,
+        "populate_seconds": round(populate_seconds, 3),
+        "state_bytes": {
+            "json": len(await serialize_json()),
+            "pickle": serialize_pickle(),
+        },
+        "operations": operations,
+    }
+    if tabs:
+        result["parallel_logging"] = {
+            "sessions": len(tabs),
+            "speedup": round(
+                operations["logging_round_sequential"][
+                    "p50_ms"
+                ]
+                / operations["logging_round_parallel"][
+                    "p50_ms"
+                ],
+                2,
+            ),
+        }
+    return result
+
+
+def _metadata(iterations: int, seed: int) -> dict:
+    from importlib.metadata import version
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.datetime.now(
+            datetime.timezone.utc
+        ).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "reflex": version("reflex"),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "seed": seed,
+    }
+
+
+def compare(
+    current: dict, baseline: dict, threshold: float
+) -> bool:
+    """Print p50 ratios against the baseline; False if anything regressed."""
+    ok = True
+    print(
+        f"{'scenario':8} {'operation':34} {'base':>9} {'now':>9} {'ratio':>6}"
+    )
+    for scenario, result in current["scenarios"].items():
+        base_ops = (
+            baseline["scenarios"]
+            .get(scenario, {})
+            .get("operations", {})
+        )
+        for operation, stats in result[
+            "operations"
+        ].items():
+            if operation not in base_ops:
+                continue
+            base_p50 = base_ops[operation]["p50_ms"]
+            ratio = stats["p50_ms"] / max(base_p50, 1e-6)
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSED"
+                ok = False
+            print(
+                f"{scenario:8} {operation:34} {base_p50:9.3f} "
+                f"{stats['p50_ms']:9.3f} {ratio:6.2f}{flag}"
+            )
+    return ok
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios",
+        default="small,medium",
+        help=f"comma-separated subset of {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=20
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, default=DEFAULT_OUTPUT
+    )
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="allowed fractional p50 slowdown against the baseline",
+    )
+    args = parser.parse_args(argv)
+    names = [
+        name.strip()
+        for name in args.scenarios.split(",")
+        if name.strip()
+    ]
+    unknown = [
+        name for name in names if name not in SCENARIOS
+    ]
+    if unknown:
+        parser.error(
+            f"unknown scenarios: {', '.join(unknown)}"
+        )
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = load_app(Path(workdir) / "bench.db")
+        results = {
+            "meta": _metadata(args.iterations, args.seed),
+            "scenarios": {},
+        }
+        for name in names:
+            print(f"running {name} {SCENARIOS[name]}")
+            results["scenarios"][name] = asyncio.run(
+                run_scenario(
+                    app, name, args.iterations, args.seed
+                )
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"wrote {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if not compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Run the app's state machinery in-process, without a browser.
+
+Events go through reflex.app.process exactly as they do for a websocket
+client, so middleware, locking and delta computation are all exercised.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Recorder:
+    """Stands in for the socket namespace and keeps emitted updates."""
+
+    def __init__(self):
+        self.updates = []
+
+    async def emit_update(self, update, sid):
+        self.updates.append(update)
+
+    async def emit(self, *args, **kwargs):
+        pass
+
+
+def load_app(db_path: Path):
+    """Import the app against a private database file."""
+    os.environ["DB_URL"] = f"sqlite:///{db_path}"
+    os.chdir(REPO_ROOT)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from reflex import constants
+    from reflex.config import get_config
+    from reflex.utils import prerequisites
+
+    app = prerequisites.get_and_validate_app().app
+    # Keep sessions in memory so runs leave no .states/ pickles behind.
+    get_config().state_manager_mode = (
+        constants.StateManagerMode.MEMORY
+    )
+    app._enable_state()
+    app._event_namespace = _Recorder()
+    return app
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, app):
+        self.app = app
+        self.token = str(uuid.uuid4())
+
+    async def send(self, handler, **payload) -> List:
+        """Process one event and wait for any background task it starts."""
+        from reflex.app import process
+        from reflex.event import Event
+        from reflex.utils import format
+
+        name = (
+            handler
+            if isinstance(handler, str)
+            else format.format_event_handler(handler)
+        )
+        event = Event(
+            token=self.token,
+            name=name,
+            payload=payload,
+            router_data={"pathname": "/", "query": {}},
+        )
+        updates = [
+            update
+            async for update in process(
+                self.app, event, self.token, {}, "127.0.0.1"
+            )
+        ]
+        while self.app._background_tasks:
+            await asyncio.gather(
+                *list(self.app._background_tasks)
+            )
+        return updates
+
+    async def hydrate(self):
+        from reflex.state import State
+
+        return await self.send(
+            f"{State.get_full_name()}.hydrate"
+        )
+
+    async def get_state(self, state_cls):
+        root = await self.app.state_manager.get_state(
+            f"{self.token}_{state_cls.get_full_name()}"
+        )
+        return await root.get_state(state_cls)
\ No newline at end of file
@@ -0,0 +1,426 @@
+"""Simulate many family tablets against a locally running backend.
+
+Start the app first (`reflex run --env prod`, or `--backend-only`), install
+benchmarks/requirements.txt for the Socket.IO client transport, then:
+
+    python -m benchmarks.load_sessions --sessions 50 --flows 5
+
+Every session is a real Socket.IO client on the Reflex websocket. It
+hydrates the dashboard, then repeats the logging flow
+(open_world_view -> open_activity_log_overlay -> select_log_category ->
+select_log_activity -> back out), dispatching chained events the way the
+browser's event queue does. A step's latency runs from sending its event
+until the delta that completes it arrives; enter and exit animations play
+in the browser afterwards and cost the server nothing.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlparse
+import psutil
+import socketio
+from reflex.state import OnLoadInternalState, State
+from reflex.utils import format
+from app.states.state import AppState
+from app.states.activity_log import ActivityLogState
+from app.states.family import FamilyState
+
+EVENT_PATH = "/_event"
+ROUTER_DATA = {"pathname": "/", "query": {}, "asPath": "/"}
+STEP_TIMEOUT = 30.0
+Predicate = Callable[[str, Any], bool]
+
+
+def _handler_name(handler) -> str:
+    return format.format_event_handler(handler)
+
+
+def _percentile(
+    ordered: List[float], fraction: float
+) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(0, int(round(fraction * len(ordered))) - 1)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class SimulatedTab:
+    """One browser tab: a socket, a token and the vars it has been sent."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.token = str(uuid.uuid4())
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on(
+            "event", self._on_update, namespace=EVENT_PATH
+        )
+        self.vars: Dict[str, Any] = {}
+        self.events_sent = 0
+        self.sent_at: Dict[str, float] = {}
+        self._waiters: List[tuple] = []
+
+    async def connect(self):
+        await self.sio.connect(
+            self.url,
+            socketio_path=EVENT_PATH,
+            namespaces=[EVENT_PATH],
+            transports=["websocket"],
+        )
+
+    async def close(self):
+        await self.sio.disconnect()
+
+    async def send(
+        self, name: str, payload: dict | None = None
+    ):
+        self.events_sent += 1
+        self.sent_at[name] = time.perf_counter()
+        await self.sio.emit(
+            "event",
+            {
+                "token": self.token,
+                "name": name,
+                "payload": payload or {},
+                "router_data": ROUTER_DATA,
+            },
+            namespace=EVENT_PATH,
+        )
+
+    async def _on_update(self, data):
+        update = (
+            json.loads(data)
+            if isinstance(data, str)
+            else data
+        )
+        for fields in (update.get("delta") or {}).values():
+            for name, value in fields.items():
+                self.vars[name] = value
+                for waiter in list(self._waiters):
+                    predicate, future = waiter
+                    if predicate(name, value):
+                        self._waiters.remove(waiter)
+                        future.set_result(
+                            time.perf_counter()
+                        )
+        # Like the browser, dispatch backend events the server chained;
+        # names starting with "_" are frontend-only (toasts, scripts).
+        for event in update.get("events") or []:
+            if not event["name"].startswith("_"):
+                await self.send(
+                    event["name"], event.get("payload")
+                )
+
+    async def step(
+        self,
+        name: str,
+        payload: dict | None,
+        done: Predicate,
+    ) -> float:
+        """Send one event and return seconds until `done` matches a delta."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((done, future))
+        started = time.perf_counter()
+        await self.send(name, payload)
+        finished = await asyncio.wait_for(
+            future, STEP_TIMEOUT
+        )
+        return finished - started
+
+
+def _var_equals(var: str, expected: Any) -> Predicate:
+    return lambda name, value: (
+        name == var and value == expected
+    )
+
+
+def _var_startswith(var: str, prefix: str) -> Predicate:
+    return lambda name, value: (
+        name == var
+        and isinstance(value, str)
+        and value.startswith(prefix)
+    )
+
+
+async def _hydrate(tab: SimulatedTab) -> float:
+    # Same as the browser's first paint: hydrate, on_load_internal, then
+    # the dashboard's on_mount handlers. Ready once isLoading drops.
+    started = time.perf_counter()
+    await tab.send(f"{State.get_full_name()}.hydrate")
+    await tab.send(
+        _handler_name(OnLoadInternalState.on_load_internal)
+    )
+    await tab.send(
+        _handler_name(AppState.update_time_of_day)
+    )
+    await tab.step(
+        _handler_name(FamilyState.load_initial_data),
+        None,
+        _var_equals("isLoading", False),
+    )
+    return time.perf_counter() - started
+
+
+async def _flow(
+    tab: SimulatedTab,
+    rng: random.Random,
+    latencies: Dict[str, List[float]],
+):
+    child = rng.choice(tab.vars["children"])
+    category = rng.choice(tab.vars["categories"])
+    steps = [
+        (
+            FamilyState.open_world_view,
+            {"child_id": child["id"]},
+            _var_equals("current_view", "world_view"),
+        ),
+        (
+            ActivityLogState.open_activity_log_overlay,
+            None,
+            _var_equals(
+                "current_view", "activity_log_overlay"
+            ),
+        ),
+        (
+            ActivityLogState.select_log_category,
+            {"category_id": category["id"]},
+            _var_equals(
+                "activity_log_step", "activity_select"
+            ),
+        ),
+    ]
+    for handler, payload, done in steps:
+        latencies[handler.fn.__name__].append(
+            await tab.step(
+                _handler_name(handler), payload, done
+            )
+        )
+
+    activity = rng.choice(
+        tab.vars["activities_for_log_category"]
+    )
+    latencies["select_log_activity"].append(
+        await tab.step(
+            _handler_name(
+                ActivityLogState.select_log_activity
+            ),
+            {"activity_id": activity["id"]},
+            _var_startswith(
+                "activity_logged_success_message",
+                "New Leaf",
+            ),
+        )
+    )
+
+    latencies["return_to_origin_view"].append(
+        await tab.step(
+            _handler_name(
+                ActivityLogState.return_to_origin_view
+            ),
+            None,
+            _var_equals("current_view", "world_view"),
+        )
+    )
+    latencies["close_world_view"].append(
+        await tab.step(
+            _handler_name(FamilyState.close_world_view),
+            None,
+            _var_equals("current_view", "dashboard"),
+        )
+    )
+
+
+def _server_process(url: str, pid: int | None):
+    if pid is not None:
+        return psutil.Process(pid)
+    port = urlparse(url).port or 80
+    try:
+        for connection in psutil.net_connections(
+            kind="tcp"
+        ):
+            if (
+                connection.status == psutil.CONN_LISTEN
+                and connection.laddr.port == port
+                and connection.pid
+            ):
+                return psutil.Process(connection.pid)
+    except psutil.AccessDenied:
+        pass
+    return None
+
+
+async def run(
+    url: str,
+    sessions: int,
+    flows: int,
+    ramp: float,
+    seed: int,
+    server,
+) -> dict:
+    latencies: Dict[str, List[float]] = {"hydrate": []}
+    for name in (
+        "open_world_view",
+        "open_activity_log_overlay",
+        "select_log_category",
+        "select_log_activity",
+        "return_to_origin_view",
+        "close_world_view",
+    ):
+        latencies[name] = []
+    tabs = [SimulatedTab(url) for _ in range(sessions)]
+    rss_before = (
+        server.memory_info().rss if server else None
+    )
+    failures: List[str] = []
+
+    async def connect(position: int, tab: SimulatedTab):
+        await asyncio.sleep(ramp * position / sessions)
+        await tab.connect()
+        latencies["hydrate"].append(await _hydrate(tab))
+
+    await asyncio.gather(
+        *(connect(i, tab) for i, tab in enumerate(tabs))
+    )
+    rss_connected = (
+        server.memory_info().rss if server else None
+    )
+
+    async def drive(position: int, tab: SimulatedTab):
+        rng = random.Random(seed + position)
+        for _ in range(flows):
+            try:
+                await _flow(tab, rng, latencies)
+            except asyncio.TimeoutError:
+                failures.append(tab.token)
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(drive(i, tab) for i, tab in enumerate(tabs))
+    )
+    elapsed = time.perf_counter() - started
+    rss_after = server.memory_info().rss if server else None
+    await asyncio.gather(*(tab.close() for tab in tabs))
+
+    completed = len(latencies["close_world_view"])
+    report = {
+        "sessions": sessions,
+        "flows_per_session": flows,
+        "elapsed_seconds": round(elapsed, 3),
+        "flows_completed": completed,
+        "flows_per_second": round(completed / elapsed, 2),
+        "events_per_second": round(
+            sum(tab.events_sent for tab in tabs) / elapsed,
+            2,
+        ),
+        "failed_sessions": len(failures),
+        "latency_ms": {},
+        "server_memory": None,
+    }
+    for name, samples in latencies.items():
+        ordered = sorted(samples)
+        report["latency_ms"][name] = {
+            "n": len(ordered),
+            "p50": round(
+                _percentile(ordered, 0.50) * 1000, 2
+            ),
+            "p95": round(
+                _percentile(ordered, 0.95) * 1000, 2
+            ),
+            "p99": round(
+                _percentile(ordered, 0.99) * 1000, 2
+            ),
+        }
+    if server:
+        report["server_memory"] = {
+            "rss_before_mb": round(rss_before / 2**20, 1),
+            "rss_after_mb": round(rss_after / 2**20, 1),
+            "per_session_kb": round(
+                (rss_connected - rss_before)
+                / sessions
+                / 1024,
+                1,
+            ),
+        }
+    return report
+
+
+def _print_report(report: dict):
+    print(
+        f"{report['sessions']} sessions, "
+        f"{report['flows_completed']} flows in "
+        f"{report['elapsed_seconds']}s: "
+        f"{report['flows_per_second']} flows/s, "
+        f"{report['events_per_second']} events/s, "
+        f"{report['failed_sessions']} failed sessions"
+    )
+    print(
+        f"{'step':28} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9}"
+    )
+    for name, stats in report["latency_ms"].items():
+        print(
+            f"{name:28} {stats['n']:6} {stats['p50']:9.2f} "
+            f"{stats['p95']:9.2f} {stats['p99']:9.2f}"
+        )
+    memory = report["server_memory"]
+    if memory:
+        print(
+            f"server rss {memory['rss_before_mb']} -> "
+            f"{memory['rss_after_mb']} MB, "
+            f"~{memory['per_session_kb']} KB per session"
+        )
+    else:
+        print(
+            "server memory unavailable (pass --server-pid)"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url", default="http://localhost:8000"
+    )
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--flows", type=int, default=3)
+    parser.add_argument(
+        "--ramp",
+        type=float,
+        default=2.0,
+        help="seconds over which sessions connect",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--server-pid",
+        type=int,
+        help="backend pid for memory sampling (default: whoever listens on the port)",
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+    server = _server_process(args.url, args.server_pid)
+    report = asyncio.run(
+        run(
+            args.url,
+            args.sessions,
+            args.flows,
+            args.ramp,
+            args.seed,
+            server,
+        )
+    )
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(
+            parents=True, exist_ok=True
+        )
+        args.output.write_text(json.dumps(report, indent=2))
+    return 1 if report["failed_sessions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""Deterministic synthetic families written straight into the store."""
+
+import datetime
+import random
+from typing import Iterator, List
+import reflex as rx
+import sqlalchemy
+from app.states import labels, store, streaks
+from app.states.models import (
+    ChildRow,
+    CategoryRow,
+    ActivityRow,
+    GoalRow,
+    HistoryEntryRow,
+    HistoryLabelRow,
+    RollupRow,
+    StreakRow,
+)
+from app.states.types import AVATAR_TYPES
+
+_CHUNK = 50_000
+_GOALS_PER_CHILD = 3
+
+
+def _chunks(rows: Iterator[dict]) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == _CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _children(count: int, rng: random.Random):
+    avatar_types = list(AVATAR_TYPES.__args__)
+    for number in range(count):
+        avatar_type = rng.choice(avatar_types)
+        coins = rng.randint(0, 800)
+        stage = min(7, coins // 100)
+        yield dict(
+            id=f"child{number}",
+            name=f"Child {number}",
+            avatar_image_src=f"/avatars/{avatar_type}/{avatar_type}_stage_{stage + 1}.svg",
+            avatar_lottie_src=f"/lottie/avatars/{avatar_type}/stage_{stage + 1}.json",
+            avatar_type=avatar_type,
+            growth_stage=stage,
+            coin_balance=coins,
+            current_streak_status="Growing Strong! 🌱",
+            current_goal_progress_percentage=coins % 100,
+        )
+
+
+def _category_for(activity: int):
+    categories = store.DEFAULT_CATEGORIES
+    return categories[activity % len(categories)]
+
+
+def _activities(count: int, rng: random.Random):
+    for number in range(count):
+        category = _category_for(number)
+        yield dict(
+            id=f"act{number}",
+            name=f"{category['name']} deed {number}",
+            category_id=category["id"],
+            icon=category["icon"],
+            coins=rng.choice([5, 10, 15, 20]),
+            parent_configurable=True,
+        )
+
+
+def _labels(activities: int):
+    # One label per activity; label ids are activity numbers plus one.
+    for number in range(activities):
+        category = _category_for(number)
+        yield dict(
+            id=number + 1,
+            activity_id=f"act{number}",
+            category_id=category["id"],
+            activity_name=f"{category['name']} deed {number}",
+            category_name=category["name"],
+            category_icon=category["icon"],
+        )
+
+
+def _goals(children: int, rng: random.Random):
+    for child in range(children):
+        for number in range(_GOALS_PER_CHILD):
+            yield dict(
+                id=f"goal{child}-{number}",
+                child_id=f"child{child}",
+                description=f"Goal {number}",
+                target_coins=rng.choice([100, 300, 500]),
+                is_achieved=rng.random() < 0.3,
+                real_world_reward_note=None,
+            )
+
+
+def _history(
+    count: int,
+    children: int,
+    activities: int,
+    rng: random.Random,
+):
+    start = streaks.epoch_ms(
+        datetime.datetime(
+            2024, 1, 1, tzinfo=datetime.timezone.utc
+        )
+    )
+    step = 365 * streaks.MS_PER_DAY // max(count, 1)
+    for number in range(count):
+        activity = rng.randrange(activities)
+        yield dict(
+            id=f"hist{number}",
+            child_id=f"child{rng.randrange(children)}",
+            label_id=activity + 1,
+            coins_earned=rng.choice([5, 10, 15, 20]),
+            timestamp=start + step * number,
+            tz_offset=0,
+        )
+
+
+def populate(
+    children: int,
+    activities: int,
+    history: int,
+    seed: int = 0,
+):
+    """Replace the store contents with a synthetic family of the given size."""
+    rng = random.Random(seed)
+    rx.Model.create_all()
+    tables = [
+        (
+            CategoryRow,
+            iter(store.DEFAULT_CATEGORIES),
+        ),
+        (ChildRow, _children(children, rng)),
+        (ActivityRow, _activities(activities, rng)),
+        (GoalRow, _goals(children, rng)),
+        (HistoryLabelRow, _labels(activities)),
+        (
+            HistoryEntryRow,
+            _history(history, children, activities, rng),
+        ),
+        # Streaks are reseeded from the new ledger on first load.
+        (StreakRow, iter(())),
+        (RollupRow, iter(())),
+    ]
+    with rx.session() as session:
+        for table, _ in tables:
+            session.execute(sqlalchemy.delete(table))
+        for table, rows in tables:
+            for chunk in _chunks(rows):
+                session.execute(
+                    sqlalchemy.insert(table), chunk
+                )
+        session.commit()
+    labels.forget()
+    store.rebuild_rollups()
\ No newline at end of file
@@ -1,3 +1,6 @@
 import reflex as rx
 
-config = rx.Config(app_name="app")
\ No newline at end of file
+config = rx.Config(
+    app_name="app",
+    db_url="sqlite:///kindcoins.db",
+)
\ No newline at end of file